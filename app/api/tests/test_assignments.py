@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import pytest
+
+from trainers.models import Trainer
+from trainings.assignment import STALE_VERSION
+from trainings.models import Training
+
+
+@pytest.fixture
+def post(api_client):
+    def post(path: str, body: dict):
+        return api_client.post(path, body, content_type="application/json")
+
+    return post
+
+
+@pytest.fixture
+def assign(post):
+    def assign(training: Training, trainer: Trainer, version: int):
+        return post(
+            f"/api/trainings/{training.pk}/assign/", {"trainer": trainer.pk, "version": version}
+        )
+
+    return assign
+
+
+def test_assign_answers_with_the_new_version(db, assign, make_training, make_trainer):
+    training = make_training()
+    trainer = make_trainer()
+
+    response = assign(training, trainer, 1)
+
+    assert response.status_code == 200
+    item = response.json()["item"]
+    assert item["version"] == 2
+    assert item["assigned_trainer"]["id"] == trainer.pk
+
+
+def test_assign_with_a_stale_version_is_a_conflict(db, assign, make_training, make_trainer):
+    training = make_training()
+    training.notes = "Edited by someone else."
+    training.save()
+
+    response = assign(training, make_trainer(), 1)
+
+    assert response.status_code == 409
+    body = response.json()
+    assert body["reasons"] == [STALE_VERSION]
+    # The current state comes along, so the planner can pick again.
+    assert body["item"]["version"] == 2
+
+
+def test_bulk_assign_reports_the_refused_items(db, post, make_training, make_trainer):
+    trainer = make_trainer()
+    accepted, refused = make_training(), make_training()
+
+    response = post(
+        "/api/assignments/bulk/",
+        {
+            "assignments": [
+                {"training": accepted.pk, "trainer": trainer.pk, "version": 1},
+                {"training": refused.pk, "trainer": trainer.pk + 1000},
+            ]
+        },
+    )
+
+    assert response.status_code == 409
+    assert response.json()["errors"] == [
+        {
+            "index": 1,
+            "training": refused.pk,
+            "trainer": trainer.pk + 1000,
+            "reasons": ["Unknown trainer."],
+        }
+    ]
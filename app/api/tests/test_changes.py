@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from core import changelog
+from trainers.models import TrainerConstraints
+
+
+def test_changes_of_every_entity_type_keep_to_the_budget(
+    db, api_client, make_training, make_trainer
+):
+    since = api_client.get("/api/changes/").json()["next"]
+    trainer = make_trainer()
+    TrainerConstraints.objects.create(trainer=trainer, max_distance_km=200)
+    training = make_training(assigned_trainer=trainer)
+    deleted = make_training()
+    deleted_id = deleted.pk
+    deleted.delete()
+
+    # Budgets are enforced in tests, so going over one fails the request.
+    response = api_client.get(f"/api/changes/?since={since}")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["next"] == changelog.latest_sequence()
+    assert not body["has_more"]
+    changes = body["changes"]
+    assert set(changes) == {"trainer", "trainer_skill", "trainer_constraints", "training"}
+    assert [item["id"] for item in changes["training"]["upserted"]] == [training.pk]
+    assert changes["training"]["deleted"] == [deleted_id]
+    assert api_client.get(f"/api/changes/?since={body['next']}").json()["changes"] == {}
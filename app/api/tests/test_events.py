@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from django.test import Client
+
+
+def test_events_stream_answers_anonymous_clients_with_401(db):
+    assert Client(HTTP_HOST="localhost").get("/api/events/").status_code == 401
+
+
+def test_events_stream_only_streams_under_asgi(db, api_client):
+    assert api_client.get("/api/events/").status_code == 204
+    assert api_client.post("/api/events/").status_code == 405
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+
+from core.pagination import DEFAULT_PAGE_SIZE
+from trainings.models import TrainingStatus
+
+
+def test_trainer_detail_pages_the_assigned_trainings(db, api_client, make_training, make_trainer):
+    trainer = make_trainer()
+    first = timezone.make_aware(datetime(2031, 3, 4, 9))
+    for day in range(DEFAULT_PAGE_SIZE + 1):
+        make_training(
+            start=first + timedelta(days=day),
+            status=TrainingStatus.ASSIGNED,
+            assigned_trainer=trainer,
+        )
+
+    body = api_client.get(f"/api/trainers/{trainer.pk}/").json()
+
+    assert len(body["assigned_trainings"]) == DEFAULT_PAGE_SIZE
+    assert body["assigned_trainings_next"]
+    rest = api_client.get(
+        f"/api/trainers/{trainer.pk}/",
+        {"include": "assigned_trainings", "cursor": body["assigned_trainings_next"]},
+    ).json()
+    assert len(rest["assigned_trainings"]) == 1
+    assert rest["assigned_trainings_next"] is None
@@ -7,12 +7,26 @@ urlpatterns = [
     path("csrf/", views.csrf_cookie, name="api_csrf"),
     path("login/", views.login_view, name="api_login"),
     path("logout/", views.logout_view, name="api_logout"),
+    path("events/", views.events_stream, name="api_events"),
+    path("changes/", views.changes, name="api_changes"),
     path("meta/", views.meta, name="api_meta"),
     path("trainings/", views.trainings_collection, name="api_trainings"),
+    path("trainings/export/", views.trainings_export, name="api_trainings_export"),
+    path("trainings/import/", views.trainings_import, name="api_trainings_import"),
     path("trainings/<int:pk>/", views.training_detail, name="api_training_detail"),
+    path(
+        "trainings/<int:pk>/assign/", views.training_assign, name="api_training_assign"
+    ),
+    path("assignments/bulk/", views.assignments_bulk, name="api_assignments_bulk"),
     path("trainers/", views.trainers_collection, name="api_trainers"),
     path("trainers/<int:pk>/", views.trainer_detail, name="api_trainer_detail"),
     path("training-types/", views.training_types_collection, name="api_training_types"),
     path("calendar/month/", views.calendar_month, name="api_calendar_month"),
     path("calendar/week/", views.calendar_week, name="api_calendar_week"),
+    path("calendar/overview/", views.calendar_overview, name="api_calendar_overview"),
+    path(
+        "calendar/cache-stats/", views.calendar_cache_stats, name="api_calendar_cache_stats"
+    ),
+    path("reports/utilization/", views.utilization_report, name="api_utilization_report"),
+    path("geocoding/suggest/", views.geocoding_suggest, name="api_geocoding_suggest"),
 ]
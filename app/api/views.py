@@ -1,23 +1,79 @@
 from __future__ import annotations
 
 import calendar
+import codecs
+import csv
+import hashlib
 import json
 from datetime import date, timedelta
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Optional
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth import authenticate, login as auth_login, logout as auth_logout
 from django.contrib.auth.decorators import login_required
-from django.http import HttpRequest, JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, Max, Min, QuerySet
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.views.decorators.http import require_http_methods
 
-from geocoding.services import geocode_address
-from matching.services import LONG_TRIP_THRESHOLD_KM, haversine_km, recommend_trainers
+from core import changelog, events
+from core.decorators import (
+    async_cache_control,
+    async_condition,
+    async_login_required,
+    async_require_http_methods,
+)
+from core.models import ChangeAction, ChangeLog
+from core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursor,
+    akeyset_page,
+    keyset_page,
+)
+from core.querybudget import query_budget
+from core.search import prefix_filter, search_key
+from geocoding.services import ageocode_address, geocode_address, suggest_addresses
+from matching.services import recommend_trainers
 from trainers.forms import TrainerForm
-from trainers.models import Trainer
+from trainers.models import Trainer, TrainerConstraints, TrainerSkill
+from trainers.reports import trainer_utilization
 from trainings.forms import TrainingForm, TrainingTypeForm, TrainingUpdateForm
+from trainings import assignment, calendar_cache, ical, importer
 from trainings.models import Training, TrainingStatus, TrainingType
+from trainings.services import TRAINING_LIST_ORDERING, filter_trainings, month_bounds
+
+from . import serializers
+
+
+OVERVIEW_MAX_DAYS = 731
+TRAINER_DETAIL_SECTIONS = ("item", "assigned_trainings", "stats")
+TRAINER_LIST_ORDERING = ("name", "id")
+CHANGES_PAGE_SIZE = 1000
+EXPORT_FORMATS = ("csv", "ndjson", "ics")
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_COLUMNS = {
+    "id": "id",
+    "training_type": "training_type__name",
+    "customer_name": "customer_name",
+    "address": "address",
+    "lat": "lat",
+    "lng": "lng",
+    "start_datetime": "start_datetime",
+    "end_datetime": "end_datetime",
+    "status": "status",
+    "assigned_trainer_id": "assigned_trainer_id",
+    "assigned_trainer": "assigned_trainer__name",
+    "notes": "notes",
+}
 
 
 def _parse_json(request: HttpRequest) -> dict[str, Any]:
@@ -60,81 +116,40 @@ def _parse_int(value: Optional[str], default: int, min_value: Optional[int] = No
     return parsed
 
 
-def _decimal(value):
-    if value is None:
+def _parse_subset(value: Optional[str], allowed: tuple[str, ...]) -> Optional[list[str]]:
+    """Parse an ``a,b`` list in ``allowed`` order; all when absent, ``None`` if invalid."""
+    if not value:
+        return list(allowed)
+    requested = {item.strip() for item in value.split(",") if item.strip()}
+    if not requested or not requested <= set(allowed):
         return None
-    return float(value)
-
-
-def _training_type_payload(training_type: TrainingType) -> dict[str, Any]:
-    return {"id": training_type.id, "name": training_type.name}
+    return [item for item in allowed if item in requested]
 
 
-def _trainer_summary(trainer: Trainer) -> dict[str, Any]:
-    return {"id": trainer.id, "name": trainer.name}
-
+def _parse_month(value: Optional[str]) -> Optional[tuple[int, int]]:
+    if not value:
+        return None
+    year, _, month = value.partition("-")
+    try:
+        parsed = date(int(year), int(month), 1)
+    except (TypeError, ValueError):
+        return None
+    return parsed.year, parsed.month
 
-def _trainer_payload(trainer: Trainer, detail: bool = False) -> dict[str, Any]:
-    payload = {
-        "id": trainer.id,
-        "name": trainer.name,
-        "email": trainer.email,
-        "phone": trainer.phone,
-        "home_address": trainer.home_address,
-        "home_lat": trainer.home_lat,
-        "home_lng": trainer.home_lng,
-        "hourly_rate": _decimal(trainer.hourly_rate),
-        "travel_rate_km": _decimal(trainer.travel_rate_km),
-        "notes": trainer.notes,
-    }
-    if detail:
-        payload["training_types"] = [
-            _training_type_payload(skill.training_type) for skill in trainer.skills.all()
-        ]
-        payload["rules"] = [
-            {
-                "type": rule.rule_type,
-                "label": rule.get_rule_type_display(),
-                "value": rule.rule_value.get("value"),
-            }
-            for rule in trainer.rules.all()
-        ]
-    return payload
 
+class _Echo:
+    """File-like object whose ``write`` returns the line, for streaming csv.writer output."""
 
-def _training_list_item(training: Training) -> dict[str, Any]:
-    assigned_trainer = (
-        _trainer_summary(training.assigned_trainer) if training.assigned_trainer_id else None
-    )
-    return {
-        "id": training.id,
-        "training_type": _training_type_payload(training.training_type),
-        "customer_name": training.customer_name,
-        "address": training.address,
-        "start_datetime": training.start_datetime.isoformat(),
-        "end_datetime": training.end_datetime.isoformat(),
-        "status": training.status,
-        "status_label": training.get_status_display(),
-        "assigned_trainer": assigned_trainer,
-    }
+    def write(self, value: str) -> str:
+        return value
 
 
-def _training_payload(training: Training) -> dict[str, Any]:
-    payload = _training_list_item(training)
-    payload.update(
-        {
-            "lat": training.lat,
-            "lng": training.lng,
-            "assignment_reason": training.assignment_reason,
-            "notes": training.notes,
-            "google_event_id": training.google_event_id,
-        }
-    )
-    return payload
+def _trainers_with_rules() -> QuerySet:
+    return Trainer.objects.select_related("constraints").prefetch_related("skills__training_type")
 
 
 def _serialize_recommendations(training: Training) -> dict[str, Any]:
-    trainers = Trainer.objects.prefetch_related("skills__training_type", "rules")
+    trainers = _trainers_with_rules()
     existing_trainings = Training.objects.filter(
         assigned_trainer__isnull=False
     ).exclude(status=TrainingStatus.CANCELED)
@@ -143,9 +158,9 @@ def _serialize_recommendations(training: Training) -> dict[str, Any]:
     for match in recommendations.matches:
         matches.append(
             {
-                "trainer": _trainer_summary(match.trainer),
+                "trainer": serializers.trainer_summary(match.trainer),
                 "score": match.score,
-                "estimated_cost": _decimal(match.estimated_cost),
+                "estimated_cost": serializers.decimal_value(match.estimated_cost),
                 "reasons": list(match.reasons),
                 "warnings": list(match.warnings),
             }
@@ -153,6 +168,259 @@ def _serialize_recommendations(training: Training) -> dict[str, Any]:
     return {"matches": matches, "used_compromise": recommendations.used_compromise}
 
 
+def _training_filters(request: HttpRequest) -> QuerySet:
+    return filter_trainings(
+        Training.objects.all(),
+        status=request.GET.get("status"),
+        training_type_id=request.GET.get("training_type"),
+        start_date=_parse_date(request.GET.get("start_date")),
+        end_date=_parse_date(request.GET.get("end_date")),
+        no_trainer=bool(request.GET.get("no_trainer")),
+    )
+
+
+def _page_size(request: HttpRequest) -> int:
+    return _parse_int(
+        request.GET.get("page_size"), DEFAULT_PAGE_SIZE, min_value=1, max_value=MAX_PAGE_SIZE
+    )
+
+
+def _calendar_month_params(request: HttpRequest) -> tuple[date, int, int]:
+    today = date.today()
+    year = _parse_int(request.GET.get("year"), today.year)
+    month = _parse_int(request.GET.get("month"), today.month, min_value=1, max_value=12)
+    return today, year, month
+
+
+def _calendar_week_start(request: HttpRequest) -> date:
+    selected = _parse_date(request.GET.get("date")) or date.today()
+    return selected - timedelta(days=selected.weekday())
+
+
+async def _change_marker(queryset: QuerySet) -> tuple[Any, int]:
+    marker = await queryset.order_by().aaggregate(changed=Max("updated_at"), total=Count("id"))
+    return marker["changed"], marker["total"]
+
+
+def _etag(*parts: Any) -> str:
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+async def _meta_etag(request: HttpRequest) -> str:
+    return _etag(
+        "meta",
+        await _change_marker(TrainingType.objects.all()),
+        await _change_marker(Trainer.objects.all()),
+    )
+
+
+async def _trainings_collection_etag(request: HttpRequest) -> Optional[str]:
+    if request.method != "GET":
+        return None
+    # The page itself (ids, versions and cursors) is the marker: it is the same
+    # index range scan the view runs, without joins or serialization.
+    try:
+        page = await akeyset_page(
+            _training_filters(request).values("id", "start_datetime", "updated_at"),
+            TRAINING_LIST_ORDERING,
+            cursor=request.GET.get("cursor"),
+            page_size=_page_size(request),
+        )
+    except InvalidCursor:
+        return None
+    return _etag(
+        "trainings",
+        [(item["id"], item["updated_at"]) for item in page.items],
+        page.next_cursor,
+        page.prev_cursor,
+        await _change_marker(TrainingType.objects.all()),
+        await _change_marker(Trainer.objects.all()),
+    )
+
+
+async def _calendar_month_etag(request: HttpRequest) -> str:
+    today, year, month = _calendar_month_params(request)
+    return _etag(
+        "calendar_month",
+        today,
+        year,
+        month,
+        await _change_marker(
+            Training.objects.filter(start_date__range=month_bounds(year, month))
+        ),
+        await _change_marker(TrainingType.objects.all()),
+        # Between a commit and the cache invalidation it triggers, the markers
+        # are new while the cached body is old; the version tells them apart.
+        await calendar_cache.aversions(
+            calendar_cache.MONTH, calendar_cache.month_period(year, month)
+        ),
+    )
+
+
+async def _calendar_week_etag(request: HttpRequest) -> str:
+    week_start = _calendar_week_start(request)
+    week_end = week_start + timedelta(days=6)
+    return _etag(
+        "calendar_week",
+        week_start,
+        await _change_marker(
+            Training.objects.filter(start_date__range=[week_start, week_end])
+        ),
+        await _change_marker(TrainingType.objects.all()),
+        await calendar_cache.aversions(calendar_cache.WEEK, calendar_cache.week_period(week_start)),
+    )
+
+
+def _calendar_rows(first: date, last: date) -> QuerySet:
+    return (
+        Training.objects.filter(start_date__range=[first, last])
+        .order_by("start_datetime", "id")
+        .values(*serializers.CALENDAR_ITEM_FIELDS)
+    )
+
+
+def _calendar_items_by_day(rows: list[dict[str, Any]]) -> dict[date, list[dict[str, Any]]]:
+    items_by_day: dict[date, list[dict[str, Any]]] = {}
+    for row in rows:
+        items_by_day.setdefault(row["start_date"], []).append(serializers.calendar_item(row))
+    return items_by_day
+
+
+def _calendar_month_payload(year: int, month: int, rows: list[dict[str, Any]]) -> dict[str, Any]:
+    cal = calendar.Calendar(firstweekday=0)
+    month_days = list(cal.itermonthdates(year, month))
+    trainings_by_day = _calendar_items_by_day(rows)
+    weeks = []
+    for i in range(0, len(month_days), 7):
+        week = []
+        for day in month_days[i : i + 7]:
+            week.append(
+                {
+                    "date": day.isoformat(),
+                    "in_month": day.month == month,
+                    "trainings": trainings_by_day.get(day, []),
+                }
+            )
+        weeks.append(week)
+    prev_month = month - 1
+    prev_year = year
+    next_month = month + 1
+    next_year = year
+    if prev_month < 1:
+        prev_month = 12
+        prev_year -= 1
+    if next_month > 12:
+        next_month = 1
+        next_year += 1
+    return {
+        "month": month,
+        "year": year,
+        "month_name": calendar.month_name[month],
+        "weeks": weeks,
+        "prev_month": prev_month,
+        "prev_year": prev_year,
+        "next_month": next_month,
+        "next_year": next_year,
+    }
+
+
+def _calendar_week_payload(week_start: date, rows: list[dict[str, Any]]) -> dict[str, Any]:
+    days = [week_start + timedelta(days=i) for i in range(7)]
+    trainings_by_day = _calendar_items_by_day(rows)
+    payload_days = []
+    for day in days:
+        payload_days.append(
+            {
+                "date": day.isoformat(),
+                "label": day.strftime("%a %d"),
+                "trainings": trainings_by_day.get(day, []),
+            }
+        )
+    return {
+        "week_start": week_start.isoformat(),
+        "days": payload_days,
+        "prev_date": (week_start - timedelta(days=7)).isoformat(),
+        "next_date": (week_start + timedelta(days=7)).isoformat(),
+    }
+
+
+def _changed_trainings(ids: list[int]) -> dict[int, dict[str, Any]]:
+    rows = serializers.training_rows(Training.objects.filter(id__in=ids))
+    return {row["id"]: serializers.training_list_item(row) for row in rows}
+
+
+def _changed_trainers(ids: list[int]) -> dict[int, dict[str, Any]]:
+    rows = Trainer.objects.filter(id__in=ids).values(*serializers.TRAINER_FIELDS)
+    return {row["id"]: serializers.trainer_row(row, serializers.TRAINER_FIELDS) for row in rows}
+
+
+def _changed_training_types(ids: list[int]) -> dict[int, dict[str, Any]]:
+    return {
+        item.id: serializers.training_type_payload(item)
+        for item in TrainingType.objects.filter(id__in=ids)
+    }
+
+
+def _changed_trainer_constraints(ids: list[int]) -> dict[int, dict[str, Any]]:
+    return {
+        constraints.pk: {
+            "id": constraints.pk,
+            "trainer_id": constraints.trainer_id,
+            "rules": serializers.constraint_rules(constraints),
+        }
+        for constraints in TrainerConstraints.objects.filter(pk__in=ids)
+    }
+
+
+def _changed_trainer_skills(ids: list[int]) -> dict[int, dict[str, Any]]:
+    rows = TrainerSkill.objects.filter(id__in=ids).values("id", "trainer_id", "training_type_id")
+    return {row["id"]: row for row in rows}
+
+
+# One query per entity type with changes in the page.
+_CHANGED_RECORDS: dict[str, Callable[[list[int]], dict[int, dict[str, Any]]]] = {
+    "training": _changed_trainings,
+    "trainer": _changed_trainers,
+    "training_type": _changed_training_types,
+    "trainer_constraints": _changed_trainer_constraints,
+    "trainer_skill": _changed_trainer_skills,
+}
+# Stamping the log, the oldest entry, the page, and the records of each entity type.
+CHANGES_QUERY_BUDGET = changelog.STAMP_QUERIES + 2 + len(_CHANGED_RECORDS)
+
+
+def _changes_payload(since: int) -> dict[str, Any]:
+    entries = list(
+        ChangeLog.objects.filter(sequence__gt=since)
+        .order_by("sequence")
+        .values_list("sequence", "entity", "object_id", "action")[: CHANGES_PAGE_SIZE + 1]
+    )
+    has_more = len(entries) > CHANGES_PAGE_SIZE
+    entries = entries[:CHANGES_PAGE_SIZE]
+    # Sequence numbers are handed out after commit, in order, so nothing can
+    # show up below the last one returned.
+    cursor = entries[-1][0] if entries else since
+    latest: dict[tuple[str, int], str] = {}
+    for _, entity, object_id, action in entries:
+        latest[(entity, object_id)] = action
+    ids_by_entity: dict[str, list[int]] = {}
+    for entity, object_id in latest:
+        ids_by_entity.setdefault(entity, []).append(object_id)
+    changes = {}
+    for entity, ids in ids_by_entity.items():
+        fetch = _CHANGED_RECORDS.get(entity)
+        records = fetch(ids) if fetch else {}
+        upserted, deleted = [], []
+        for object_id in ids:
+            record = records.get(object_id)
+            if latest[(entity, object_id)] == ChangeAction.UPSERT and record is not None:
+                upserted.append(record)
+            else:
+                deleted.append(object_id)
+        changes[entity] = {"upserted": upserted, "deleted": deleted}
+    return {"next": cursor, "has_more": has_more, "changes": changes}
+
+
 @ensure_csrf_cookie
 @require_http_methods(["GET"])
 def csrf_cookie(request: HttpRequest) -> JsonResponse:
@@ -185,15 +453,60 @@ def logout_view(request: HttpRequest) -> JsonResponse:
     return JsonResponse({"ok": True})
 
 
+@async_login_required(redirect=False)
+@async_require_http_methods(["GET"])
+async def events_stream(request: HttpRequest) -> HttpResponse:
+    if not isinstance(request, ASGIRequest):
+        # A WSGI worker would be tied up for the whole stream; 204 tells
+        # EventSource not to reconnect, so the SPA keeps its own refresh.
+        return HttpResponse(status=204)
+    response = StreamingHttpResponse(events.stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache, no-transform"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 @login_required
+@query_budget(CHANGES_QUERY_BUDGET)
 @require_http_methods(["GET"])
-def meta(request: HttpRequest) -> JsonResponse:
-    training_types = TrainingType.objects.all()
-    trainers = Trainer.objects.all()
+def changes(request: HttpRequest) -> HttpResponse:
+    """Records changed since the ``since`` sequence number, for patching local state.
+
+    Without ``since`` only the current sequence number is returned: load the
+    lists, then poll from it. Follow ``next`` while ``has_more`` is set.
+    """
+    changelog.stamp()
+    if "since" not in request.GET:
+        return JsonResponse(
+            {"next": changelog.latest_sequence(), "has_more": False, "changes": {}}
+        )
+    since = _parse_int(request.GET.get("since"), -1, min_value=0)
+    if since < 0:
+        return _json_error("Invalid since.")
+    first = ChangeLog.objects.aggregate(first=Min("sequence"))["first"]
+    if first is not None and since < first - 1:
+        return JsonResponse(
+            {
+                "error": "Changes since this point were pruned; reload everything.",
+                "next": changelog.latest_sequence(),
+            },
+            status=410,
+        )
+    return serializers.ApiJsonResponse(_changes_payload(since))
+
+
+@async_login_required
+@query_budget(4)
+@async_require_http_methods(["GET"])
+@async_cache_control(private=True, no_cache=True)
+@async_condition(etag_func=_meta_etag)
+async def meta(request: HttpRequest) -> JsonResponse:
+    training_types = [row async for row in TrainingType.objects.values("id", "name")]
+    trainers = [row async for row in Trainer.objects.values("id", "name")]
     return JsonResponse(
         {
-            "training_types": [_training_type_payload(ttype) for ttype in training_types],
-            "trainer_choices": [_trainer_summary(trainer) for trainer in trainers],
+            "training_types": training_types,
+            "trainer_choices": trainers,
             "status_choices": [
                 {"value": value, "label": label} for value, label in TrainingStatus.choices
             ],
@@ -201,31 +514,29 @@ def meta(request: HttpRequest) -> JsonResponse:
     )
 
 
-@login_required
-@require_http_methods(["GET", "POST"])
-def trainings_collection(request: HttpRequest) -> JsonResponse:
+@async_login_required
+@query_budget(4, POST=10)
+@async_require_http_methods(["GET", "POST"])
+@async_cache_control(private=True, no_cache=True)
+@async_condition(etag_func=_trainings_collection_etag)
+async def trainings_collection(request: HttpRequest) -> HttpResponse:
     if request.method == "GET":
-        trainings = Training.objects.select_related("training_type", "assigned_trainer")
-        status = request.GET.get("status")
-        training_type_id = request.GET.get("training_type")
-        start_date = _parse_date(request.GET.get("start_date"))
-        end_date = _parse_date(request.GET.get("end_date"))
-        no_trainer = request.GET.get("no_trainer")
-        if status:
-            trainings = trainings.filter(status=status)
-        if training_type_id:
-            trainings = trainings.filter(training_type_id=training_type_id)
-        if start_date:
-            trainings = trainings.filter(start_datetime__date__gte=start_date)
-        if end_date:
-            trainings = trainings.filter(start_datetime__date__lte=end_date)
-        if no_trainer:
-            trainings = trainings.filter(
-                assigned_trainer__isnull=True,
-                status__in=[TrainingStatus.DRAFT, TrainingStatus.WAITING],
+        try:
+            page = await akeyset_page(
+                serializers.training_rows(_training_filters(request)),
+                TRAINING_LIST_ORDERING,
+                cursor=request.GET.get("cursor"),
+                page_size=_page_size(request),
             )
-        trainings = trainings[:100]
-        return JsonResponse({"items": [_training_list_item(item) for item in trainings]})
+        except InvalidCursor as exc:
+            return _json_error(str(exc))
+        return serializers.ApiJsonResponse(
+            {
+                "items": [serializers.training_list_item(row) for row in page.items],
+                "next": page.next_cursor,
+                "prev": page.prev_cursor,
+            }
+        )
 
     try:
         payload = _parse_json(request)
@@ -234,30 +545,144 @@ def trainings_collection(request: HttpRequest) -> JsonResponse:
 
     payload.setdefault("status", TrainingStatus.WAITING)
     form = TrainingForm(payload)
-    if not form.is_valid():
+    # Validation looks up the chosen training type and trainer.
+    if not await sync_to_async(form.is_valid)():
         return _form_errors(form)
 
     training = form.save(commit=False)
     if training.lat is None or training.lng is None:
-        geo = geocode_address(training.address)
+        geo = await ageocode_address(training.address)
         if geo:
             training.lat = geo.lat
             training.lng = geo.lng
-    training.save()
-    return JsonResponse({"item": _training_payload(training)}, status=201)
+    await training.asave()
+    return JsonResponse({"item": serializers.training_payload(training)}, status=201)
+
+
+def _import_format(request: HttpRequest, filename: str) -> Optional[str]:
+    fmt = request.GET.get("format")
+    if fmt:
+        return fmt if fmt in importer.FORMATS else None
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if extension in importer.FORMATS:
+        return extension
+    content_type = request.content_type or ""
+    if "ndjson" in content_type or "jsonl" in content_type:
+        return "ndjson"
+    if "json" in content_type:
+        return "json"
+    if "csv" in content_type:
+        return "csv"
+    return None
+
+
+def _export_row(row: dict[str, Any]) -> dict[str, Any]:
+    item = {column: row[field] for column, field in EXPORT_COLUMNS.items()}
+    item["start_datetime"] = item["start_datetime"].isoformat()
+    item["end_datetime"] = item["end_datetime"].isoformat()
+    return item
+
+
+def _export_lines(
+    rows: Iterable[dict[str, Any]], head: str, line: Callable[[dict[str, Any]], str], tail: str
+) -> Iterator[str]:
+    yield head
+    for row in rows:
+        yield line(row)
+    yield tail
+
+
+async def _aexport_lines(
+    rows: AsyncIterator[dict[str, Any]], head: str, line: Callable[[dict[str, Any]], str], tail: str
+) -> AsyncIterator[str]:
+    yield head
+    async for row in rows:
+        yield line(row)
+    yield tail
+
+
+@login_required
+@require_http_methods(["GET"])
+def trainings_export(request: HttpRequest):
+    fmt = request.GET.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        return _json_error(f"Unknown export format; use one of: {', '.join(EXPORT_FORMATS)}.")
+    fields = ical.EVENT_FIELDS if fmt == "ics" else tuple(EXPORT_COLUMNS.values())
+    rows = _training_filters(request).order_by("start_datetime", "id").values(*fields)
+    if fmt == "ics":
+        head, line, tail = ical.calendar_start(), ical.event, ical.calendar_end()
+        content_type = ical.CONTENT_TYPE
+    elif fmt == "ndjson":
+        head, tail = "", ""
+
+        def line(row: dict[str, Any]) -> str:
+            return json.dumps(_export_row(row)) + "\n"
+
+        content_type = "application/x-ndjson"
+    else:
+        writer = csv.writer(_Echo())
+        head, tail = writer.writerow(EXPORT_COLUMNS), ""
+
+        def line(row: dict[str, Any]) -> str:
+            return writer.writerow(_export_row(row).values())
+
+        content_type = "text/csv; charset=utf-8"
+    # values() + iterator() keeps memory flat: rows are fetched in chunks and never cached.
+    # Under ASGI, Django collects a sync iterator into a list before sending anything,
+    # so the rows come from aiterator() there.
+    if isinstance(request, ASGIRequest):
+        content = _aexport_lines(rows.aiterator(chunk_size=EXPORT_CHUNK_SIZE), head, line, tail)
+    else:
+        content = _export_lines(rows.iterator(chunk_size=EXPORT_CHUNK_SIZE), head, line, tail)
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="trainings.{fmt}"'
+    return response
+
+
+@login_required
+@require_http_methods(["POST"])
+def trainings_import(request: HttpRequest) -> JsonResponse:
+    # Read the upload (or the raw body) as a stream; request.body would buffer it all.
+    if request.content_type == "multipart/form-data":
+        upload = request.FILES.get("file")
+        if upload is None:
+            return _json_error("Missing file upload.")
+        source, filename = upload, upload.name or ""
+    else:
+        source, filename = request, ""
+    fmt = _import_format(request, filename)
+    if fmt is None:
+        return _json_error(f"Unknown import format; use one of: {', '.join(importer.FORMATS)}.")
+    batch_size = _parse_int(
+        request.GET.get("batch_size"), importer.DEFAULT_BATCH_SIZE, min_value=1, max_value=5000
+    )
+    stream = codecs.getreader("utf-8-sig")(source, errors="replace")
+    result = importer.import_trainings(importer.iter_records(stream, fmt), batch_size=batch_size)
+    # Only cached/gazetteer lookups here; unresolved addresses are left for the
+    # import_trainings --geocode-pending pass so the request never waits on Nominatim.
+    geocoding = importer.geocode_pending(result.pending, online=False)
+    return JsonResponse(
+        {
+            "created": result.created,
+            "errors": result.errors,
+            "geocoding": {"resolved": geocoding.resolved, "pending": geocoding.unresolved},
+        },
+        status=201 if result.created else 200,
+    )
 
 
 @login_required
+@query_budget(5, PUT=12, PATCH=12)
 @require_http_methods(["GET", "PUT", "PATCH"])
-def training_detail(request: HttpRequest, pk: int) -> JsonResponse:
+def training_detail(request: HttpRequest, pk: int) -> HttpResponse:
     training = get_object_or_404(
         Training.objects.select_related("training_type", "assigned_trainer"),
         pk=pk,
     )
     if request.method == "GET":
-        return JsonResponse(
+        return serializers.ApiJsonResponse(
             {
-                "item": _training_payload(training),
+                "item": serializers.training_payload(training),
                 "recommendations": _serialize_recommendations(training),
             }
         )
@@ -287,15 +712,136 @@ def training_detail(request: HttpRequest, pk: int) -> JsonResponse:
             training.lat = geo.lat
             training.lng = geo.lng
     training.save()
-    return JsonResponse({"item": _training_payload(training)})
+    return JsonResponse({"item": serializers.training_payload(training)})
 
 
 @login_required
+@query_budget(12)
+@require_http_methods(["POST"])
+def training_assign(request: HttpRequest, pk: int) -> HttpResponse:
+    try:
+        payload = _parse_json(request)
+    except ValueError as exc:
+        return _json_error(str(exc))
+    trainer_id = payload.get("trainer")
+    version = payload.get("version")
+    reason = payload.get("assignment_reason")
+    if type(trainer_id) is not int or type(version) is not int:
+        return _json_error("Both trainer and version must be integers.")
+    if reason is not None and not isinstance(reason, str):
+        return _json_error("assignment_reason must be a string.")
+
+    try:
+        training = assignment.assign_trainer(pk, trainer_id, version, reason)
+    except Training.DoesNotExist:
+        raise Http404("No Training matches the given query.")
+    except Trainer.DoesNotExist:
+        return _json_error("Unknown trainer.")
+    except assignment.AssignmentConflict as exc:
+        # Answer with the current state, so the planner can pick again straight away.
+        training = get_object_or_404(
+            Training.objects.select_related("training_type", "assigned_trainer"), pk=pk
+        )
+        return serializers.ApiJsonResponse(
+            {
+                "error": str(exc),
+                "reasons": exc.reasons,
+                "item": serializers.training_payload(training),
+                "recommendations": _serialize_recommendations(training),
+            },
+            status=409,
+        )
+    return serializers.ApiJsonResponse({"item": serializers.training_payload(training)})
+
+
+def _parse_proposal(item: Any) -> Optional[assignment.ProposedAssignment]:
+    if not isinstance(item, dict):
+        return None
+    training_id, trainer_id = item.get("training"), item.get("trainer")
+    version, reason = item.get("version"), item.get("assignment_reason")
+    if type(training_id) is not int or type(trainer_id) is not int:
+        return None
+    if version is not None and type(version) is not int:
+        return None
+    if reason is not None and not isinstance(reason, str):
+        return None
+    return assignment.ProposedAssignment(training_id, trainer_id, version, reason)
+
+
+@login_required
+@require_http_methods(["POST"])
+def assignments_bulk(request: HttpRequest) -> HttpResponse:
+    try:
+        payload = _parse_json(request)
+    except ValueError as exc:
+        return _json_error(str(exc))
+    items = payload.get("assignments")
+    if not isinstance(items, list) or not items:
+        return _json_error("assignments must be a non-empty list.")
+    if len(items) > assignment.MAX_BULK_ASSIGNMENTS:
+        return _json_error(f"At most {assignment.MAX_BULK_ASSIGNMENTS} assignments at once.")
+    proposals = [_parse_proposal(item) for item in items]
+    invalid = [index for index, proposal in enumerate(proposals) if proposal is None]
+    if invalid:
+        return JsonResponse(
+            {
+                "error": "Each assignment needs integer training and trainer ids.",
+                "invalid": invalid,
+            },
+            status=400,
+        )
+
+    try:
+        trainings = assignment.assign_many(proposals)
+    except assignment.AssignmentConflict as exc:
+        return JsonResponse({"error": str(exc), "errors": exc.errors}, status=409)
+    return JsonResponse(
+        {
+            "updated": len(trainings),
+            "items": [
+                {
+                    "id": training.id,
+                    "assigned_trainer": training.assigned_trainer_id,
+                    "status": training.status,
+                    "version": training.version,
+                }
+                for training in trainings
+            ],
+        }
+    )
+
+
+@login_required
+@query_budget(1, POST=20)
 @require_http_methods(["GET", "POST"])
-def trainers_collection(request: HttpRequest) -> JsonResponse:
+def trainers_collection(request: HttpRequest) -> HttpResponse:
     if request.method == "GET":
+        fields = _parse_subset(request.GET.get("fields"), serializers.TRAINER_FIELDS)
+        if fields is None:
+            allowed = ", ".join(serializers.TRAINER_FIELDS)
+            return _json_error(f"fields must be a comma separated subset of: {allowed}.")
         trainers = Trainer.objects.all()
-        return JsonResponse({"items": [_trainer_payload(trainer) for trainer in trainers]})
+        name_prefix = search_key(request.GET.get("q", ""))
+        if name_prefix:
+            trainers = trainers.filter(prefix_filter("search_name", name_prefix))
+        # Only the requested columns are selected; name and id are the page key.
+        columns = list(dict.fromkeys([*fields, "name", "id"]))
+        try:
+            page = keyset_page(
+                trainers.values(*columns),
+                TRAINER_LIST_ORDERING,
+                cursor=request.GET.get("cursor"),
+                page_size=_page_size(request),
+            )
+        except InvalidCursor as exc:
+            return _json_error(str(exc))
+        return serializers.ApiJsonResponse(
+            {
+                "items": [serializers.trainer_row(row, fields) for row in page.items],
+                "next": page.next_cursor,
+                "prev": page.prev_cursor,
+            }
+        )
 
     try:
         payload = _parse_json(request)
@@ -313,72 +859,90 @@ def trainers_collection(request: HttpRequest) -> JsonResponse:
             trainer.home_lat = geo.lat
             trainer.home_lng = geo.lng
             trainer.save(update_fields=["home_lat", "home_lng"])
-    return JsonResponse({"item": _trainer_payload(trainer, detail=True)}, status=201)
+    return JsonResponse({"item": serializers.trainer_payload(trainer, detail=True)}, status=201)
 
 
-@login_required
-@require_http_methods(["GET", "PUT"])
-def trainer_detail(request: HttpRequest, pk: int) -> JsonResponse:
-    trainer = get_object_or_404(
-        Trainer.objects.prefetch_related("skills__training_type", "rules"),
-        pk=pk,
-    )
+async def _get_trainer(queryset: QuerySet, pk: int) -> Trainer:
+    try:
+        return await queryset.aget(pk=pk)
+    except Trainer.DoesNotExist:
+        raise Http404("No Trainer matches the given query.")
+
+
+@async_login_required
+@query_budget(5, PUT=22)
+@async_require_http_methods(["GET", "PUT"])
+async def trainer_detail(request: HttpRequest, pk: int) -> HttpResponse:
     if request.method == "GET":
-        trainings = Training.objects.filter(assigned_trainer=trainer).order_by("-start_datetime")
-        today = date.today()
-        month_trainings = (
-            Training.objects.filter(
-                assigned_trainer=trainer,
-                start_datetime__year=today.year,
-                start_datetime__month=today.month,
-            )
-            .exclude(status=TrainingStatus.CANCELED)
-            .only("start_datetime", "lat", "lng")
-        )
-        month_long_trips = 0
-        if trainer.home_lat is not None and trainer.home_lng is not None:
-            for item in month_trainings:
-                if item.lat is None or item.lng is None:
-                    continue
-                distance = haversine_km(
-                    item.lat, item.lng, trainer.home_lat, trainer.home_lng
+        sections = _parse_subset(request.GET.get("include"), TRAINER_DETAIL_SECTIONS)
+        if sections is None:
+            allowed = ", ".join(TRAINER_DETAIL_SECTIONS)
+            return _json_error(f"include must be a comma separated subset of: {allowed}.")
+        trainers = _trainers_with_rules() if "item" in sections else Trainer.objects.all()
+        trainer = await _get_trainer(trainers, pk)
+        payload: dict[str, Any] = {}
+        if "item" in sections:
+            payload["item"] = serializers.trainer_payload(trainer, detail=True)
+        if "assigned_trainings" in sections:
+            history = Training.objects.filter(assigned_trainer=trainer)
+            try:
+                page = await akeyset_page(
+                    serializers.training_rows(history),
+                    TRAINING_LIST_ORDERING,
+                    cursor=request.GET.get("cursor"),
+                    page_size=_page_size(request),
                 )
-                if distance > LONG_TRIP_THRESHOLD_KM:
-                    month_long_trips += 1
-        return JsonResponse(
-            {
-                "item": _trainer_payload(trainer, detail=True),
-                "assigned_trainings": [_training_list_item(item) for item in trainings],
-                "month_workload": month_trainings.count(),
-                "month_long_trips": month_long_trips,
-            }
-        )
+            except InvalidCursor as exc:
+                return _json_error(str(exc))
+            payload["assigned_trainings"] = [
+                serializers.training_list_item(row) for row in page.items
+            ]
+            payload["assigned_trainings_next"] = page.next_cursor
+            payload["assigned_trainings_prev"] = page.prev_cursor
+        if "stats" in sections:
+            today = date.today()
+            stats = await sync_to_async(
+                lambda: next(trainer_utilization(today.year, today.month, trainer_ids=[pk]))
+            )()
+            payload["month_workload"] = stats.workload
+            payload["month_long_trips"] = stats.long_trips
+            payload["month_hours"] = stats.hours
+            payload["month_estimated_cost"] = stats.estimated_cost
+        return serializers.ApiJsonResponse(payload)
+
+    trainer = await _get_trainer(_trainers_with_rules(), pk)
 
     try:
         payload = _parse_json(request)
     except ValueError as exc:
         return _json_error(str(exc))
 
-    form = TrainerForm(payload, instance=trainer)
-    if not form.is_valid():
+    # The form reads the loaded skills and constraints and validates against the database.
+    form = await sync_to_async(TrainerForm)(payload, instance=trainer)
+    if not await sync_to_async(form.is_valid)():
         return _form_errors(form)
 
-    trainer = form.save()
+    trainer = await sync_to_async(form.save)()
     if trainer.home_lat is None or trainer.home_lng is None:
-        geo = geocode_address(trainer.home_address)
+        geo = await ageocode_address(trainer.home_address)
         if geo:
             trainer.home_lat = geo.lat
             trainer.home_lng = geo.lng
-            trainer.save(update_fields=["home_lat", "home_lng"])
-    return JsonResponse({"item": _trainer_payload(trainer, detail=True)})
+            await trainer.asave(update_fields=["home_lat", "home_lng"])
+    # Reload: the skills and constraints loaded above are stale after the save.
+    trainer = await _get_trainer(_trainers_with_rules(), pk)
+    return JsonResponse({"item": serializers.trainer_payload(trainer, detail=True)})
 
 
 @login_required
+@query_budget(1, POST=6)
 @require_http_methods(["GET", "POST"])
 def training_types_collection(request: HttpRequest) -> JsonResponse:
     if request.method == "GET":
         training_types = TrainingType.objects.all()
-        return JsonResponse({"items": [_training_type_payload(item) for item in training_types]})
+        return JsonResponse(
+            {"items": [serializers.training_type_payload(item) for item in training_types]}
+        )
 
     try:
         payload = _parse_json(request)
@@ -390,113 +954,148 @@ def training_types_collection(request: HttpRequest) -> JsonResponse:
         return _form_errors(form)
 
     training_type = form.save()
-    return JsonResponse({"item": _training_type_payload(training_type)}, status=201)
+    return JsonResponse({"item": serializers.training_type_payload(training_type)}, status=201)
+
+
+@async_login_required
+@query_budget(3)
+@async_require_http_methods(["GET"])
+@async_cache_control(private=True, no_cache=True)
+@async_condition(etag_func=_calendar_month_etag)
+async def calendar_month(request: HttpRequest) -> HttpResponse:
+    today, year, month = _calendar_month_params(request)
+
+    async def build() -> str:
+        rows = [row async for row in _calendar_rows(*month_bounds(year, month))]
+        return serializers.encode(_calendar_month_payload(year, month, rows))
+
+    body = await calendar_cache.acached_payload(
+        calendar_cache.MONTH, calendar_cache.month_period(year, month), "api-json", build
+    )
+    return serializers.ApiJsonResponse(
+        encoded=serializers.with_member(body, "today", today.isoformat())
+    )
+
+
+@async_login_required
+@query_budget(3)
+@async_require_http_methods(["GET"])
+@async_cache_control(private=True, no_cache=True)
+@async_condition(etag_func=_calendar_week_etag)
+async def calendar_week(request: HttpRequest) -> HttpResponse:
+    week_start = _calendar_week_start(request)
+
+    async def build() -> str:
+        week_end = week_start + timedelta(days=6)
+        rows = [row async for row in _calendar_rows(week_start, week_end)]
+        return serializers.encode(_calendar_week_payload(week_start, rows))
+
+    body = await calendar_cache.acached_payload(
+        calendar_cache.WEEK, calendar_cache.week_period(week_start), "api-json", build
+    )
+    return serializers.ApiJsonResponse(encoded=body)
 
 
 @login_required
+@query_budget(3)
 @require_http_methods(["GET"])
-def calendar_month(request: HttpRequest) -> JsonResponse:
+def calendar_overview(request: HttpRequest) -> JsonResponse:
     today = date.today()
-    year = _parse_int(request.GET.get("year"), today.year)
-    month = _parse_int(request.GET.get("month"), today.month, min_value=1, max_value=12)
-    cal = calendar.Calendar(firstweekday=0)
-    month_days = list(cal.itermonthdates(year, month))
-    trainings = (
-        Training.objects.filter(start_datetime__year=year, start_datetime__month=month)
-        .select_related("training_type", "assigned_trainer")
-        .order_by("start_datetime")
+    start = _parse_date(request.GET.get("from")) or date(today.year, 1, 1)
+    end = _parse_date(request.GET.get("to")) or date(start.year, 12, 31)
+    if end < start:
+        return _json_error("'to' must not be before 'from'.")
+    if (end - start).days >= OVERVIEW_MAX_DAYS:
+        return _json_error(f"Range is limited to {OVERVIEW_MAX_DAYS} days.")
+
+    # Aggregate in SQL over the indexed start_date; no Training rows are loaded.
+    in_range = Training.objects.filter(start_date__range=[start, end]).order_by()
+    days: dict[date, dict[str, Any]] = {}
+    for row in in_range.values("start_date", "status").annotate(count=Count("id")):
+        day = days.setdefault(row["start_date"], {"total": 0, "by_status": {}, "by_type": {}})
+        day["total"] += row["count"]
+        day["by_status"][row["status"]] = row["count"]
+    type_ids = set()
+    for row in in_range.values("start_date", "training_type_id").annotate(count=Count("id")):
+        days[row["start_date"]]["by_type"][str(row["training_type_id"])] = row["count"]
+        type_ids.add(row["training_type_id"])
+    training_types = TrainingType.objects.filter(id__in=type_ids).values("id", "name")
+    return JsonResponse(
+        {
+            "from": start.isoformat(),
+            "to": end.isoformat(),
+            "training_types": list(training_types),
+            "days": [
+                {"date": day.isoformat(), **counts} for day, counts in sorted(days.items())
+            ],
+        }
     )
-    trainings_by_day: dict[date, list[Training]] = {}
-    for training in trainings:
-        trainings_by_day.setdefault(training.start_datetime.date(), []).append(training)
-    weeks = []
-    for i in range(0, len(month_days), 7):
-        week = []
-        for day in month_days[i : i + 7]:
-            week.append(
-                {
-                    "date": day.isoformat(),
-                    "in_month": day.month == month,
-                    "trainings": [
-                        {
-                            "id": item.id,
-                            "label": item.training_type.name,
-                            "customer_name": item.customer_name,
-                            "status": item.status,
-                            "status_label": item.get_status_display(),
-                            "start_time": item.start_datetime.strftime("%H:%M"),
-                            "address": item.address,
-                        }
-                        for item in trainings_by_day.get(day, [])
-                    ],
-                }
-            )
-        weeks.append(week)
-    prev_month = month - 1
-    prev_year = year
-    next_month = month + 1
-    next_year = year
-    if prev_month < 1:
-        prev_month = 12
-        prev_year -= 1
-    if next_month > 12:
-        next_month = 1
-        next_year += 1
+
+
+@login_required
+@require_http_methods(["GET"])
+def calendar_cache_stats(request: HttpRequest) -> JsonResponse:
+    return JsonResponse({"stats": calendar_cache.cache_stats()})
+
+
+@login_required
+@require_http_methods(["GET"])
+def geocoding_suggest(request: HttpRequest) -> JsonResponse:
+    query = request.GET.get("q", "")
+    limit = _parse_int(request.GET.get("limit"), 10, min_value=1, max_value=20)
+    suggestions = suggest_addresses(query, limit=limit)
     return JsonResponse(
         {
-            "month": month,
-            "year": year,
-            "month_name": calendar.month_name[month],
-            "weeks": weeks,
-            "prev_month": prev_month,
-            "prev_year": prev_year,
-            "next_month": next_month,
-            "next_year": next_year,
-            "today": today.isoformat(),
+            "items": [
+                {
+                    "address": item.address,
+                    "lat": item.lat,
+                    "lng": item.lng,
+                    "provider": item.provider,
+                }
+                for item in suggestions
+            ]
         }
     )
 
 
+UTILIZATION_COLUMNS = [
+    "trainer_id",
+    "name",
+    "workload",
+    "long_trips",
+    "hours",
+    "distance_km",
+    "estimated_cost",
+]
+
+
 @login_required
+@query_budget(1)
 @require_http_methods(["GET"])
-def calendar_week(request: HttpRequest) -> JsonResponse:
+def utilization_report(request: HttpRequest):
     today = date.today()
-    selected = _parse_date(request.GET.get("date")) or today
-    week_start = selected - timedelta(days=selected.weekday())
-    days = [week_start + timedelta(days=i) for i in range(7)]
-    trainings = (
-        Training.objects.filter(start_datetime__date__range=[days[0], days[-1]])
-        .select_related("training_type", "assigned_trainer")
-        .order_by("start_datetime")
-    )
-    trainings_by_day: dict[date, list[Training]] = {}
-    for training in trainings:
-        trainings_by_day.setdefault(training.start_datetime.date(), []).append(training)
-    payload_days = []
-    for day in days:
-        payload_days.append(
-            {
-                "date": day.isoformat(),
-                "label": day.strftime("%a %d"),
-                "trainings": [
-                    {
-                        "id": item.id,
-                        "label": item.training_type.name,
-                        "customer_name": item.customer_name,
-                        "status": item.status,
-                        "status_label": item.get_status_display(),
-                        "start_time": item.start_datetime.strftime("%H:%M"),
-                        "address": item.address,
-                    }
-                    for item in trainings_by_day.get(day, [])
-                ],
-            }
+    year, month = _parse_month(request.GET.get("month")) or (today.year, today.month)
+    rows = trainer_utilization(year, month)
+    if request.GET.get("format") == "csv":
+        # One line per trainer: small enough to send whole, and the query runs
+        # inside the view's budget rather than while the body is sent.
+        writer = csv.writer(_Echo())
+        lines = [writer.writerow(UTILIZATION_COLUMNS)]
+        lines.extend(
+            writer.writerow([getattr(row, column) for column in UTILIZATION_COLUMNS])
+            for row in rows
         )
+        response = HttpResponse("".join(lines), content_type="text/csv; charset=utf-8")
+        response["Content-Disposition"] = (
+            f'attachment; filename="utilization-{year:04d}-{month:02d}.csv"'
+        )
+        return response
     return JsonResponse(
         {
-            "week_start": week_start.isoformat(),
-            "days": payload_days,
-            "prev_date": (week_start - timedelta(days=7)).isoformat(),
-            "next_date": (week_start + timedelta(days=7)).isoformat(),
+            "month": f"{year:04d}-{month:02d}",
+            "items": [
+                {column: getattr(row, column) for column in UTILIZATION_COLUMNS} for row in rows
+            ],
         }
     )
@@ -0,0 +1,14 @@
+from django.contrib import admin
+
+from .models import CalendarSyncState, PendingEventChange
+
+
+@admin.register(PendingEventChange)
+class PendingEventChangeAdmin(admin.ModelAdmin):
+    list_display = ["training_id", "operation", "queued_at", "attempts"]
+    list_filter = ["operation"]
+
+
+@admin.register(CalendarSyncState)
+class CalendarSyncStateAdmin(admin.ModelAdmin):
+    list_display = ["calendar_id", "last_pushed_at", "last_pulled_at"]
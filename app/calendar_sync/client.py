@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import json
+import re
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+from django.conf import settings
+
+
+# Google Calendar accepts at most 50 calls per batch request.
+MAX_BATCH_SIZE = 50
+PAGE_SIZE = 250
+
+_BOUNDARY_RE = re.compile(r'boundary="?([^";]+)"?')
+
+
+class CalendarApiError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(f"Google Calendar API error {status}: {message}")
+        self.status = status
+
+
+class SyncTokenExpired(CalendarApiError):
+    """The sync token is no longer valid; the caller must run a full sync."""
+
+
+@dataclass(frozen=True)
+class BatchOperation:
+    method: str
+    path: str
+    body: Optional[dict[str, Any]] = None
+
+
+@dataclass(frozen=True)
+class BatchResponse:
+    status: int
+    body: Optional[dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class EventPage:
+    items: list[dict[str, Any]]
+    next_page_token: str
+    next_sync_token: str
+
+
+def split_http_message(message: str) -> tuple[str, dict[str, str], str]:
+    """Split an embedded HTTP request/response into start line, headers and body."""
+    message = message.replace("\r\n", "\n").lstrip("\n")
+    head, _, body = message.partition("\n\n")
+    lines = head.split("\n")
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return lines[0].strip(), headers, body.strip()
+
+
+def encode_multipart(parts: Iterable[tuple[dict[str, str], str]], boundary: str) -> bytes:
+    """Encode ``(headers, embedded HTTP message)`` parts as a multipart/mixed body."""
+    chunks = []
+    for headers, message in parts:
+        header_lines = "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        chunks.append(f"--{boundary}\r\n{header_lines}\r\n{message}\r\n")
+    chunks.append(f"--{boundary}--\r\n")
+    return "".join(chunks).encode("utf-8")
+
+
+def parse_multipart(body: bytes, content_type: str) -> list[tuple[dict[str, str], str]]:
+    """Parse a multipart/mixed body into ``(part headers, embedded HTTP message)`` pairs."""
+    match = _BOUNDARY_RE.search(content_type)
+    if not match:
+        raise ValueError("Missing multipart boundary.")
+    delimiter = f"--{match.group(1)}"
+    parts = []
+    for chunk in body.decode("utf-8").split(delimiter)[1:]:
+        if chunk.startswith("--"):
+            break
+        chunk = chunk.replace("\r\n", "\n").strip("\n")
+        head, _, message = chunk.partition("\n\n")
+        headers = {}
+        for line in head.split("\n"):
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        parts.append((headers, message))
+    return parts
+
+
+def http_message(start_line: str, body: Optional[dict[str, Any]]) -> str:
+    if body is None:
+        return f"{start_line}\r\n\r\n"
+    payload = json.dumps(body)
+    return f"{start_line}\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n{payload}"
+
+
+class GoogleCalendarClient:
+    """Minimal Google Calendar v3 client: batched event writes and incremental listing."""
+
+    def __init__(
+        self,
+        calendar_id: str,
+        api_url: str,
+        token_url: str,
+        client_id: str = "",
+        client_secret: str = "",
+        refresh_token: str = "",
+        timeout: float = 30,
+    ) -> None:
+        self.calendar_id = calendar_id
+        self.api_url = api_url.rstrip("/")
+        self.token_url = token_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.refresh_token = refresh_token
+        self.timeout = timeout
+        self._access_token = ""
+        self._access_token_expires = 0.0
+
+    @classmethod
+    def from_settings(cls) -> "GoogleCalendarClient":
+        return cls(
+            calendar_id=settings.GOOGLE_CALENDAR_ID,
+            api_url=settings.GOOGLE_CALENDAR_API_URL,
+            token_url=settings.GOOGLE_CALENDAR_TOKEN_URL,
+            client_id=settings.GOOGLE_CALENDAR_CLIENT_ID,
+            client_secret=settings.GOOGLE_CALENDAR_CLIENT_SECRET,
+            refresh_token=settings.GOOGLE_CALENDAR_REFRESH_TOKEN,
+        )
+
+    def events_path(self, event_id: Optional[str] = None) -> str:
+        path = f"/calendar/v3/calendars/{urllib.parse.quote(self.calendar_id, safe='')}/events"
+        if event_id:
+            path = f"{path}/{urllib.parse.quote(event_id, safe='')}"
+        return path
+
+    def batch(self, operations: list[BatchOperation]) -> list[BatchResponse]:
+        """Send up to ``MAX_BATCH_SIZE`` event calls in one HTTP request."""
+        if len(operations) > MAX_BATCH_SIZE:
+            raise ValueError(f"At most {MAX_BATCH_SIZE} operations per batch.")
+        if not operations:
+            return []
+        boundary = f"batch_{uuid.uuid4().hex}"
+        body = encode_multipart(
+            (
+                (
+                    {"Content-Type": "application/http", "Content-ID": f"<item{index}>"},
+                    http_message(f"{operation.method} {operation.path} HTTP/1.1", operation.body),
+                )
+                for index, operation in enumerate(operations)
+            ),
+            boundary,
+        )
+        status, headers, payload = self._request(
+            "POST",
+            f"{self.api_url}/batch/calendar/v3",
+            body,
+            {"Content-Type": f"multipart/mixed; boundary={boundary}"},
+        )
+        if status != 200:
+            raise CalendarApiError(status, payload.decode("utf-8", "replace"))
+        responses: list[Optional[BatchResponse]] = [None] * len(operations)
+        for part_headers, message in parse_multipart(payload, headers.get("content-type", "")):
+            index = int(part_headers.get("content-id", "").strip("<>").rpartition("item")[2])
+            status_line, _, part_body = split_http_message(message)
+            responses[index] = BatchResponse(
+                status=int(status_line.split()[1]),
+                body=json.loads(part_body) if part_body else None,
+            )
+        missing = [index for index, response in enumerate(responses) if response is None]
+        if missing:
+            raise CalendarApiError(502, f"Batch response is missing items {missing}.")
+        return responses  # type: ignore[return-value]
+
+    def list_events(
+        self, sync_token: Optional[str] = None, page_token: Optional[str] = None
+    ) -> EventPage:
+        """List events changed since ``sync_token`` (everything when it is empty)."""
+        params = {"maxResults": PAGE_SIZE, "showDeleted": "true"}
+        if page_token:
+            params["pageToken"] = page_token
+        elif sync_token:
+            params["syncToken"] = sync_token
+        url = f"{self.api_url}{self.events_path()}?{urllib.parse.urlencode(params)}"
+        status, _, payload = self._request("GET", url)
+        if status == 410:
+            raise SyncTokenExpired(status, "Sync token expired.")
+        if status != 200:
+            raise CalendarApiError(status, payload.decode("utf-8", "replace"))
+        data = json.loads(payload)
+        return EventPage(
+            items=data.get("items", []),
+            next_page_token=data.get("nextPageToken", ""),
+            next_sync_token=data.get("nextSyncToken", ""),
+        )
+
+    def _token(self) -> str:
+        if self._access_token and time.monotonic() < self._access_token_expires:
+            return self._access_token
+        form = urllib.parse.urlencode(
+            {
+                "grant_type": "refresh_token",
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "refresh_token": self.refresh_token,
+            }
+        ).encode("ascii")
+        status, _, payload = self._send(
+            "POST",
+            self.token_url,
+            form,
+            {"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        if status != 200:
+            raise CalendarApiError(status, "Could not refresh the access token.")
+        data = json.loads(payload)
+        self._access_token = data["access_token"]
+        # Refresh a minute early so a token never expires mid-batch.
+        self._access_token_expires = time.monotonic() + int(data.get("expires_in", 3600)) - 60
+        return self._access_token
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> tuple[int, dict[str, str], bytes]:
+        request_headers = {**(headers or {}), "Authorization": f"Bearer {self._token()}"}
+        response = self._send(method, url, body, request_headers)
+        if response[0] == 401:
+            # The token was revoked or expired early; refresh once and retry.
+            self._access_token = ""
+            request_headers["Authorization"] = f"Bearer {self._token()}"
+            response = self._send(method, url, body, request_headers)
+        return response
+
+    def _send(
+        self, method: str, url: str, body: Optional[bytes], headers: dict[str, str]
+    ) -> tuple[int, dict[str, str], bytes]:
+        request = urllib.request.Request(url, data=body, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, _lower_headers(response.headers), response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, _lower_headers(exc.headers), exc.read()
+        except (urllib.error.URLError, TimeoutError) as exc:
+            raise CalendarApiError(0, str(exc)) from exc
+
+
+def _lower_headers(headers) -> dict[str, str]:
+    return {name.lower(): value for name, value in headers.items()}
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import json
+import threading
+import urllib.parse
+import uuid
+from datetime import datetime, timezone as dt_timezone
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+from .client import encode_multipart, http_message, parse_multipart, split_http_message
+
+
+ACCESS_TOKEN = "fake-access-token"
+
+
+class FakeCalendarServer:
+    """In-memory stand-in for the Google Calendar v3 API, for tests and local runs.
+
+    Supports event insert/update/delete (directly or in batch requests),
+    incremental listing with sync and page tokens, and the OAuth token
+    endpoint. ``edit_event`` simulates changes made by someone in Google
+    Calendar; ``expire_sync_tokens`` forces the client back to a full sync;
+    ``fail_event`` makes calls for one event fail.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, page_size: int = 250) -> None:
+        self.page_size = page_size
+        self.events: dict[str, dict[str, dict[str, Any]]] = {}
+        self.requests: list[tuple[str, str]] = []
+        self._sequence = 0
+        # Sync tokens are "<epoch>:<sequence>"; bumping the epoch expires all of them.
+        self._token_epoch = 0
+        self._failures: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeCalendarServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeCalendarServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def edit_event(self, calendar_id: str, event_id: str, **fields: Any) -> None:
+        with self._lock:
+            event = self.events[calendar_id][event_id]
+            event.update(fields)
+            self._touch(event)
+
+    def fail_event(self, event_id: str, status: int = 503, times: int = 1) -> None:
+        """Answer the next ``times`` calls for ``event_id`` with ``status``."""
+        with self._lock:
+            self._failures[event_id] = [status] * times
+
+    def expire_sync_tokens(self) -> None:
+        with self._lock:
+            self._token_epoch += 1
+
+    def _touch(self, event: dict[str, Any]) -> None:
+        self._sequence += 1
+        event["_sequence"] = self._sequence
+        event["updated"] = datetime.now(dt_timezone.utc).isoformat()
+
+    def handle(
+        self, method: str, path: str, body: Optional[dict[str, Any]]
+    ) -> tuple[int, Optional[dict[str, Any]]]:
+        parsed = urllib.parse.urlsplit(path)
+        segments = [urllib.parse.unquote(part) for part in parsed.path.strip("/").split("/")]
+        if segments[:3] != ["calendar", "v3", "calendars"] or len(segments) < 5:
+            return 404, {"error": {"code": 404, "message": "Not found"}}
+        calendar_id = segments[3]
+        event_id = segments[5] if len(segments) > 5 else None
+        query = dict(urllib.parse.parse_qsl(parsed.query))
+        with self._lock:
+            failures = self._failures.get(event_id or (body or {}).get("id", ""))
+            if failures:
+                status = failures.pop(0)
+                return status, {"error": {"code": status, "message": "Injected failure"}}
+            events = self.events.setdefault(calendar_id, {})
+            if method == "GET" and event_id is None:
+                return self._list(events, query)
+            if method == "POST" and event_id is None:
+                event_id = (body or {}).get("id") or uuid.uuid4().hex
+                if event_id in events:
+                    return 409, {"error": {"code": 409, "message": "Duplicate"}}
+                events[event_id] = {"status": "confirmed", **(body or {}), "id": event_id}
+                self._touch(events[event_id])
+                return 200, _public(events[event_id])
+            event = events.get(event_id or "")
+            if event is None:
+                return 404, {"error": {"code": 404, "message": "Not found"}}
+            if event["status"] == "cancelled":
+                return 410, {"error": {"code": 410, "message": "Deleted"}}
+            if method == "GET":
+                return 200, _public(event)
+            if method == "PUT":
+                event.clear()
+                event.update({"status": "confirmed", **(body or {}), "id": event_id})
+                self._touch(event)
+                return 200, _public(event)
+            if method == "DELETE":
+                event["status"] = "cancelled"
+                self._touch(event)
+                return 204, None
+        return 400, {"error": {"code": 400, "message": f"Unsupported {method}"}}
+
+    def _list(
+        self, events: dict[str, dict[str, Any]], query: dict[str, str]
+    ) -> tuple[int, Optional[dict[str, Any]]]:
+        if "pageToken" in query:
+            since, _, offset = query["pageToken"].partition(":")
+            since_sequence, start = int(since), int(offset)
+        else:
+            since_sequence, start = 0, 0
+            if "syncToken" in query:
+                epoch, _, sequence = query["syncToken"].partition(":")
+                if epoch != str(self._token_epoch):
+                    return 410, {"error": {"code": 410, "message": "Sync token is no longer valid"}}
+                since_sequence = int(sequence)
+        changed = sorted(
+            (
+                event
+                for event in events.values()
+                if event["_sequence"] > since_sequence
+                and (since_sequence or event["status"] != "cancelled")
+            ),
+            key=lambda event: event["_sequence"],
+        )
+        page = changed[start : start + self.page_size]
+        payload: dict[str, Any] = {"items": [_public(event) for event in page]}
+        if start + self.page_size < len(changed):
+            payload["nextPageToken"] = f"{since_sequence}:{start + self.page_size}"
+        else:
+            payload["nextSyncToken"] = f"{self._token_epoch}:{self._sequence}"
+        return 200, payload
+
+
+def _public(event: dict[str, Any]) -> dict[str, Any]:
+    if event["status"] == "cancelled":
+        return {"id": event["id"], "status": "cancelled"}
+    return {key: value for key, value in event.items() if not key.startswith("_")}
+
+
+def _handler_for(server: FakeCalendarServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def _body(self) -> bytes:
+            return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        def _reply(self, status: int, payload: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _json(self, status: int, body: Optional[dict[str, Any]]) -> None:
+            payload = json.dumps(body).encode("utf-8") if body is not None else b""
+            self._reply(status, payload, "application/json; charset=UTF-8")
+
+        def _dispatch(self) -> None:
+            server.requests.append((self.command, self.path))
+            if self.path == "/token":
+                self._body()
+                self._json(200, {"access_token": ACCESS_TOKEN, "expires_in": 3600})
+                return
+            if self.headers.get("Authorization") != f"Bearer {ACCESS_TOKEN}":
+                self._json(401, {"error": {"code": 401, "message": "Invalid credentials"}})
+                return
+            raw = self._body()
+            if self.path.startswith("/batch/"):
+                self._batch(raw)
+                return
+            status, body = server.handle(self.command, self.path, json.loads(raw) if raw else None)
+            self._json(status, body)
+
+        def _batch(self, raw: bytes) -> None:
+            parts = []
+            for headers, message in parse_multipart(raw, self.headers.get("Content-Type", "")):
+                request_line, _, body = split_http_message(message)
+                method, path = request_line.split()[:2]
+                status, payload = server.handle(method, path, json.loads(body) if body else None)
+                parts.append(
+                    (
+                        {
+                            "Content-Type": "application/http",
+                            "Content-ID": f"<response-{headers.get('content-id', '').strip('<>')}>",
+                        },
+                        http_message(f"HTTP/1.1 {status} {HTTPStatus(status).phrase}", payload),
+                    )
+                )
+            boundary = f"batch_{uuid.uuid4().hex}"
+            self._reply(
+                200, encode_multipart(parts, boundary), f"multipart/mixed; boundary={boundary}"
+            )
+
+        do_GET = do_POST = do_PUT = do_DELETE = _dispatch
+
+    return Handler
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from calendar_sync.fake_server import FakeCalendarServer
+
+
+class Command(BaseCommand):
+    help = "Run an in-memory fake Google Calendar API for local sync testing."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+
+    def handle(self, *args, **options) -> None:
+        server = FakeCalendarServer(host=options["host"], port=options["port"])
+        self.stdout.write(
+            f"Fake Google Calendar API on {server.url}; point the sync at it with\n"
+            f"  GOOGLE_CALENDAR_API_URL={server.url} "
+            f"GOOGLE_CALENDAR_TOKEN_URL={server.url}/token GOOGLE_CALENDAR_ID=<any>"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.stop()
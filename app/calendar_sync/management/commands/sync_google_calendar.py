@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from calendar_sync.client import MAX_BATCH_SIZE, CalendarApiError, GoogleCalendarClient
+from calendar_sync.sync import sync_once
+
+
+class Command(BaseCommand):
+    help = (
+        "Push queued training changes to Google Calendar in batch requests and pull "
+        "changes made there. Progress is stored, so an interrupted run resumes."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep syncing every --interval seconds."
+        )
+        parser.add_argument("--interval", type=int, default=60)
+        parser.add_argument("--batch-size", type=int, default=MAX_BATCH_SIZE)
+
+    def handle(self, *args, **options) -> None:
+        if not settings.GOOGLE_CALENDAR_ID:
+            raise CommandError("Set GOOGLE_CALENDAR_ID to enable Google Calendar sync.")
+        if not 1 <= options["batch_size"] <= MAX_BATCH_SIZE:
+            raise CommandError(f"--batch-size must be between 1 and {MAX_BATCH_SIZE}.")
+        client = GoogleCalendarClient.from_settings()
+        while True:
+            try:
+                pushed, pulled = sync_once(client, batch_size=options["batch_size"])
+            except CalendarApiError as exc:
+                if not options["loop"]:
+                    raise CommandError(str(exc)) from exc
+                self.stderr.write(str(exc))
+            else:
+                self.stdout.write(
+                    f"pushed: {pushed.created} created, {pushed.updated} updated, "
+                    f"{pushed.deleted} deleted, {pushed.failed} failed; "
+                    f"pulled: {pulled.changed} changed, {pulled.unlinked} unlinked"
+                    f"{' (full sync)' if pulled.full_sync else ''}"
+                )
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CalendarSyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('calendar_id', models.CharField(max_length=255, unique=True)),
+                ('sync_token', models.TextField(blank=True)),
+                ('page_token', models.TextField(blank=True)),
+                ('last_pushed_at', models.DateTimeField(blank=True, null=True)),
+                ('last_pulled_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='PendingEventChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('training_id', models.BigIntegerField(unique=True)),
+                ('operation', models.CharField(choices=[('upsert', 'Create or update'), ('delete', 'Delete')], max_length=10)),
+                ('google_event_id', models.CharField(blank=True, max_length=255)),
+                ('queued_at', models.DateTimeField(auto_now=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['queued_at', 'id'], name='calendar_sy_queued__b5cf4e_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import models
+
+from core.models import TimeStampedModel
+
+
+class EventOperation(models.TextChoices):
+    UPSERT = "upsert", "Create or update"
+    DELETE = "delete", "Delete"
+
+
+class PendingEventChange(models.Model):
+    """A training whose Google Calendar event is out of date (the sync outbox)."""
+
+    # Not a foreign key: deletes must outlive the training they remove.
+    training_id = models.BigIntegerField(unique=True)
+    operation = models.CharField(max_length=10, choices=EventOperation.choices)
+    google_event_id = models.CharField(max_length=255, blank=True)
+    queued_at = models.DateTimeField(auto_now=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["queued_at", "id"])]
+
+    def __str__(self) -> str:
+        return f"{self.operation} training {self.training_id}"
+
+
+class CalendarSyncState(TimeStampedModel):
+    """Pull progress for one calendar, so an interrupted sync resumes where it stopped."""
+
+    calendar_id = models.CharField(max_length=255, unique=True)
+    sync_token = models.TextField(blank=True)
+    # Set while a (full or incremental) listing spans several pages.
+    page_token = models.TextField(blank=True)
+    last_pushed_at = models.DateTimeField(null=True, blank=True)
+    last_pulled_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return self.calendar_id
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from trainings.models import Training
+
+from . import tracking
+from .tracking import SYNCED_STATUSES
+
+
+@receiver(post_save, sender=Training)
+def queue_saved_training(sender, instance: Training, **kwargs) -> None:
+    # Changes pulled from Google Calendar must not be pushed straight back.
+    if getattr(instance, "_from_calendar_sync", False):
+        return
+    was_synced = getattr(instance, "_previous_status", None) in SYNCED_STATUSES
+    if instance.status in SYNCED_STATUSES or was_synced or instance.google_event_id:
+        tracking.mark_dirty([instance.pk])
+
+
+@receiver(post_delete, sender=Training)
+def queue_deleted_training(sender, instance: Training, **kwargs) -> None:
+    tracking.mark_deleted(instance)
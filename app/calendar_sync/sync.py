@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from trainings.models import Training, TrainingStatus
+
+from .client import (
+    MAX_BATCH_SIZE,
+    BatchOperation,
+    BatchResponse,
+    GoogleCalendarClient,
+    SyncTokenExpired,
+)
+from .models import CalendarSyncState, EventOperation, PendingEventChange
+from .tracking import SYNCED_STATUSES, event_id_for
+
+
+MAX_ATTEMPTS = 10
+
+
+@dataclass(frozen=True)
+class PushResult:
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    failed: int = 0
+
+
+@dataclass(frozen=True)
+class PullResult:
+    changed: int = 0
+    unlinked: int = 0
+    full_sync: bool = False
+
+
+@dataclass(frozen=True)
+class _Planned:
+    change: PendingEventChange
+    training: Optional[Training]
+    kind: str
+    event_id: str
+    operation: BatchOperation
+
+
+def event_body(training: Training) -> dict[str, Any]:
+    summary = training.training_type.name
+    if training.customer_name:
+        summary = f"{summary} – {training.customer_name}"
+    description = []
+    if training.assigned_trainer_id:
+        description.append(f"Trainer: {training.assigned_trainer.name}")
+    if training.notes:
+        description.append(training.notes)
+    return {
+        "summary": summary,
+        "location": training.address,
+        "description": "\n".join(description),
+        "start": {
+            "dateTime": timezone.localtime(training.start_datetime).isoformat(),
+            "timeZone": settings.TIME_ZONE,
+        },
+        "end": {
+            "dateTime": timezone.localtime(training.end_datetime).isoformat(),
+            "timeZone": settings.TIME_ZONE,
+        },
+        "status": "confirmed" if training.status == TrainingStatus.CONFIRMED else "tentative",
+        "extendedProperties": {"private": {"training_id": str(training.pk)}},
+    }
+
+
+def _plan(
+    client: GoogleCalendarClient, change: PendingEventChange, training: Optional[Training]
+) -> Optional[_Planned]:
+    if (
+        change.operation == EventOperation.UPSERT
+        and training is not None
+        and training.status in SYNCED_STATUSES
+    ):
+        if training.google_event_id:
+            event_id = training.google_event_id
+            operation = BatchOperation("PUT", client.events_path(event_id), event_body(training))
+            return _Planned(change, training, "updated", event_id, operation)
+        event_id = event_id_for(training)
+        body = {"id": event_id, **event_body(training)}
+        operation = BatchOperation("POST", client.events_path(), body)
+        return _Planned(change, training, "created", event_id, operation)
+    event_id = change.google_event_id
+    if training is not None:
+        # The id is deterministic, so a lost link still finds the event.
+        event_id = training.google_event_id or event_id_for(training)
+    if not event_id:
+        return None
+    operation = BatchOperation("DELETE", client.events_path(event_id))
+    return _Planned(change, training, "deleted", event_id, operation)
+
+
+def _finish(change: PendingEventChange) -> None:
+    # A training edited while its batch was in flight keeps its (re-queued) row.
+    PendingEventChange.objects.filter(pk=change.pk, queued_at=change.queued_at).delete()
+
+
+def _link(training: Optional[Training], event_id: str) -> None:
+    # Plain update(): linking is sync bookkeeping and must not re-queue the training.
+    if training is not None:
+        Training.objects.filter(pk=training.pk).update(google_event_id=event_id)
+
+
+def _apply(planned: _Planned, response: BatchResponse, counts: Counter) -> bool:
+    """Record one batch item's outcome; return False when it should be retried later."""
+    status = response.status
+    if 200 <= status < 300 or (planned.kind == "deleted" and status in (404, 410)):
+        if planned.kind == "created":
+            _link(planned.training, planned.event_id)
+        elif planned.kind == "deleted" and planned.training is not None:
+            Training.objects.filter(
+                pk=planned.training.pk, google_event_id=planned.event_id
+            ).update(google_event_id="")
+        _finish(planned.change)
+        counts[planned.kind] += 1
+        return True
+    if planned.kind == "created" and status == 409:
+        # Created by an earlier run that stopped before recording the id; update it next.
+        _link(planned.training, planned.event_id)
+        PendingEventChange.objects.filter(pk=planned.change.pk).update(
+            attempts=F("attempts") + 1
+        )
+        return True
+    if planned.kind == "updated" and status in (404, 410):
+        # Deleted in Google Calendar: leave the training unlinked.
+        _link(planned.training, "")
+        _finish(planned.change)
+        return True
+    PendingEventChange.objects.filter(pk=planned.change.pk).update(
+        attempts=F("attempts") + 1, last_error=f"{status}: {response.body}"[:2000]
+    )
+    counts["failed"] += 1
+    return False
+
+
+def push(client: GoogleCalendarClient, batch_size: int = MAX_BATCH_SIZE) -> PushResult:
+    """Send queued creates, updates and deletes to Google Calendar in batch requests.
+
+    Each batch's outcome is committed before the next one is sent, so a run
+    that is interrupted resumes with the changes that were not yet confirmed.
+    """
+    counts: Counter = Counter()
+    retry_later: set[int] = set()
+    while True:
+        changes = list(
+            PendingEventChange.objects.filter(attempts__lt=MAX_ATTEMPTS)
+            .exclude(pk__in=retry_later)
+            .order_by("queued_at", "id")[:batch_size]
+        )
+        if not changes:
+            break
+        trainings = Training.objects.select_related("training_type", "assigned_trainer").in_bulk(
+            [change.training_id for change in changes]
+        )
+        planned = []
+        for change in changes:
+            item = _plan(client, change, trainings.get(change.training_id))
+            if item is None:
+                _finish(change)
+            else:
+                planned.append(item)
+        responses = client.batch([item.operation for item in planned])
+        with transaction.atomic():
+            for item, response in zip(planned, responses):
+                if not _apply(item, response, counts):
+                    retry_later.add(item.change.pk)
+    return PushResult(
+        created=counts["created"],
+        updated=counts["updated"],
+        deleted=counts["deleted"],
+        failed=counts["failed"],
+    )
+
+
+def _event_time(value: Optional[dict[str, Any]]) -> Optional[datetime]:
+    # All-day events carry only a "date"; trainings always have a time.
+    if not value or "dateTime" not in value:
+        return None
+    return parse_datetime(value["dateTime"])
+
+
+def _training_id(item: dict[str, Any]) -> Optional[int]:
+    value = item.get("extendedProperties", {}).get("private", {}).get("training_id", "")
+    return int(value) if value.isdigit() else None
+
+
+def _apply_remote_changes(items: list[dict[str, Any]]) -> tuple[int, int]:
+    event_ids = [item["id"] for item in items]
+    training_ids = [training_id for training_id in map(_training_id, items) if training_id]
+    trainings = {
+        training.google_event_id or event_id_for(training): training
+        for training in Training.objects.filter(
+            Q(google_event_id__in=event_ids) | Q(pk__in=training_ids)
+        )
+    }
+    # Local edits that are not pushed yet win over the older remote version.
+    pending = set(
+        PendingEventChange.objects.filter(
+            training_id__in=[training.pk for training in trainings.values()]
+        ).values_list("training_id", flat=True)
+    )
+    changed = unlinked = 0
+    for item in items:
+        training = trainings.get(item["id"])
+        if training is None or training.pk in pending:
+            continue
+        if item.get("status") == "cancelled":
+            _link(training, "")
+            unlinked += 1
+            continue
+        start, end = _event_time(item.get("start")), _event_time(item.get("end"))
+        if start is None or end is None or end <= start:
+            continue
+        if (start, end) == (training.start_datetime, training.end_datetime):
+            continue
+        training.start_datetime, training.end_datetime = start, end
+        training._from_calendar_sync = True
+        training.save(update_fields=["start_datetime", "end_datetime", "updated_at"])
+        changed += 1
+    return changed, unlinked
+
+
+def pull(client: GoogleCalendarClient, state: CalendarSyncState) -> PullResult:
+    """Apply events changed in Google Calendar since the stored sync token.
+
+    The page token is saved after every page, so an interrupted listing
+    continues from the last page instead of starting over.
+    """
+    changed = unlinked = 0
+    full_sync = not state.sync_token
+    while True:
+        try:
+            page = client.list_events(sync_token=state.sync_token, page_token=state.page_token)
+        except SyncTokenExpired:
+            if full_sync:
+                raise
+            state.sync_token = state.page_token = ""
+            state.save(update_fields=["sync_token", "page_token", "updated_at"])
+            full_sync = True
+            continue
+        with transaction.atomic():
+            page_changed, page_unlinked = _apply_remote_changes(page.items)
+            changed += page_changed
+            unlinked += page_unlinked
+            if page.next_page_token:
+                state.page_token = page.next_page_token
+                state.save(update_fields=["page_token", "updated_at"])
+                continue
+            state.sync_token = page.next_sync_token
+            state.page_token = ""
+            state.last_pulled_at = timezone.now()
+            state.save(update_fields=["sync_token", "page_token", "last_pulled_at", "updated_at"])
+        return PullResult(changed=changed, unlinked=unlinked, full_sync=full_sync)
+
+
+def sync_once(
+    client: Optional[GoogleCalendarClient] = None, batch_size: int = MAX_BATCH_SIZE
+) -> tuple[PushResult, PullResult]:
+    """Push local changes, then pull remote ones, for the configured calendar."""
+    client = client or GoogleCalendarClient.from_settings()
+    state, _ = CalendarSyncState.objects.get_or_create(calendar_id=client.calendar_id)
+    pushed = push(client, batch_size=batch_size)
+    state.last_pushed_at = timezone.now()
+    state.save(update_fields=["last_pushed_at", "updated_at"])
+    return pushed, pull(client, state)
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from calendar_sync.client import GoogleCalendarClient
+from calendar_sync.fake_server import FakeCalendarServer
+from calendar_sync.models import CalendarSyncState, PendingEventChange
+from calendar_sync.sync import PullResult, PushResult, push, sync_once
+from calendar_sync.tracking import event_id_for
+from trainings.models import Training, TrainingStatus
+
+CALENDAR_ID = "planner@example.com"
+
+
+@pytest.fixture
+def server():
+    with FakeCalendarServer() as server:
+        yield server
+
+
+@pytest.fixture
+def client(server, settings) -> GoogleCalendarClient:
+    settings.GOOGLE_CALENDAR_ID = CALENDAR_ID
+    return GoogleCalendarClient(
+        calendar_id=CALENDAR_ID, api_url=server.url, token_url=f"{server.url}/token"
+    )
+
+
+def _event(server: FakeCalendarServer, training: Training) -> dict:
+    return server.events[CALENDAR_ID][event_id_for(training)]
+
+
+def test_push_creates_updates_and_deletes_events(db, server, client, make_training, make_trainer):
+    training = make_training(status=TrainingStatus.ASSIGNED, assigned_trainer=make_trainer())
+    make_training(status=TrainingStatus.WAITING)
+    assert PendingEventChange.objects.count() == 1
+
+    pushed, _ = sync_once(client)
+
+    assert pushed == PushResult(created=1)
+    training.refresh_from_db()
+    assert training.google_event_id == event_id_for(training)
+    assert _event(server, training)["description"] == "Trainer: Jana Nováková"
+    assert not PendingEventChange.objects.exists()
+
+    training.notes = "Bring the dummies."
+    training.save()
+    pushed, _ = sync_once(client)
+
+    assert pushed == PushResult(updated=1)
+    assert _event(server, training)["description"] == "Trainer: Jana Nováková\nBring the dummies."
+    assert not PendingEventChange.objects.exists()
+
+    event_id = training.google_event_id
+    training.delete()
+    pushed, _ = sync_once(client)
+
+    assert pushed == PushResult(deleted=1)
+    assert server.events[CALENDAR_ID][event_id]["status"] == "cancelled"
+    assert not PendingEventChange.objects.exists()
+
+
+def test_push_removes_the_event_of_a_canceled_training(db, server, client, make_training):
+    training = make_training(status=TrainingStatus.CONFIRMED)
+    sync_once(client)
+
+    training.status = TrainingStatus.CANCELED
+    training.save()
+    pushed, _ = sync_once(client)
+
+    assert pushed == PushResult(deleted=1)
+    training.refresh_from_db()
+    assert training.google_event_id == ""
+    assert _event(server, training)["status"] == "cancelled"
+
+
+def test_push_retries_the_items_a_batch_failed(db, server, client, make_training):
+    failing = make_training(status=TrainingStatus.CONFIRMED)
+    passing = make_training(status=TrainingStatus.CONFIRMED)
+    server.fail_event(event_id_for(failing), status=503)
+
+    assert push(client) == PushResult(created=1, failed=1)
+
+    passing.refresh_from_db()
+    failing.refresh_from_db()
+    assert passing.google_event_id == event_id_for(passing)
+    assert failing.google_event_id == ""
+    change = PendingEventChange.objects.get()
+    assert change.training_id == failing.pk
+    assert change.attempts == 1
+    assert change.last_error.startswith("503: ")
+
+    assert push(client) == PushResult(created=1)
+
+    failing.refresh_from_db()
+    assert failing.google_event_id == event_id_for(failing)
+    assert not PendingEventChange.objects.exists()
+
+
+def test_push_links_an_event_an_interrupted_run_already_created(
+    db, server, client, make_training
+):
+    training = make_training(status=TrainingStatus.CONFIRMED)
+    sync_once(client)
+    # The run stopped after the create but before recording the event id.
+    Training.objects.filter(pk=training.pk).update(google_event_id="")
+    training.refresh_from_db()
+    training.notes = "Moved to room 2."
+    training.save()
+
+    # The create answers 409; the same run links the event and updates it.
+    assert push(client) == PushResult(updated=1)
+    training.refresh_from_db()
+    assert training.google_event_id == event_id_for(training)
+    assert len(server.events[CALENDAR_ID]) == 1
+    assert "Moved to room 2." in _event(server, training)["description"]
+    assert not PendingEventChange.objects.exists()
+
+
+def test_pull_applies_remote_moves_and_cancellations(db, server, client, make_training):
+    training = make_training(status=TrainingStatus.CONFIRMED)
+    _, pulled = sync_once(client)
+    assert pulled.full_sync
+
+    start = timezone.localtime(training.start_datetime) + timedelta(days=1)
+    server.edit_event(
+        CALENDAR_ID,
+        event_id_for(training),
+        start={"dateTime": start.isoformat()},
+        end={"dateTime": (start + timedelta(hours=3)).isoformat()},
+    )
+    _, pulled = sync_once(client)
+
+    assert pulled == PullResult(changed=1)
+    training.refresh_from_db()
+    assert training.start_datetime == start
+    assert training.end_datetime == start + timedelta(hours=3)
+    # Pulled changes are not queued to be pushed back.
+    assert not PendingEventChange.objects.exists()
+
+    server.edit_event(CALENDAR_ID, event_id_for(training), status="cancelled")
+    _, pulled = sync_once(client)
+
+    assert pulled == PullResult(unlinked=1)
+    training.refresh_from_db()
+    assert training.google_event_id == ""
+
+
+def test_pull_runs_a_full_sync_when_the_token_expired(db, server, client, make_training):
+    make_training(status=TrainingStatus.CONFIRMED)
+    sync_once(client)
+    server.expire_sync_tokens()
+
+    _, pulled = sync_once(client)
+
+    assert pulled.full_sync
+    state = CalendarSyncState.objects.get(calendar_id=CALENDAR_ID)
+    assert state.sync_token
+    assert state.page_token == ""
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.conf import settings
+from django.utils import timezone
+
+from trainings.models import Training, TrainingStatus
+
+from .models import EventOperation, PendingEventChange
+
+
+# Trainings with these statuses have an event; any other status removes it.
+SYNCED_STATUSES = (TrainingStatus.ASSIGNED, TrainingStatus.CONFIRMED)
+
+
+def enabled() -> bool:
+    return bool(settings.GOOGLE_CALENDAR_ID)
+
+
+def event_id_for(training: Training) -> str:
+    """Deterministic Google event id, so a create retried after a crash cannot duplicate.
+
+    Event ids may only use base32hex characters (a-v, 0-9); the creation time
+    keeps ids unique even if a database reuses a deleted training's key.
+    """
+    return f"tp{training.pk}c{int(training.created_at.timestamp())}"
+
+
+def mark_dirty(training_ids: Iterable[int]) -> None:
+    """Queue trainings for an event create/update; the worker re-reads their current state."""
+    ids = set(training_ids)
+    if not ids or not enabled():
+        return
+    now = timezone.now()
+    PendingEventChange.objects.bulk_create(
+        [
+            PendingEventChange(
+                training_id=training_id, operation=EventOperation.UPSERT, queued_at=now
+            )
+            for training_id in ids
+        ],
+        update_conflicts=True,
+        unique_fields=["training_id"],
+        update_fields=["operation", "queued_at", "attempts", "last_error"],
+    )
+
+
+def mark_deleted(training: Training) -> None:
+    """Queue removal of a deleted training's event, if it has (or may soon have) one."""
+    if not enabled():
+        return
+    pending = PendingEventChange.objects.filter(training_id=training.pk)
+    if not training.google_event_id and not pending.exists():
+        return
+    PendingEventChange.objects.update_or_create(
+        training_id=training.pk,
+        defaults={
+            "operation": EventOperation.DELETE,
+            "google_event_id": training.google_event_id or event_id_for(training),
+            "attempts": 0,
+            "last_error": "",
+        },
+    )
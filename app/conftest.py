@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.utils import timezone
+
+from core.querybudget import RAISE
+from trainers.models import Trainer, TrainerSkill
+from trainings.models import Training, TrainingStatus, TrainingType
+
+
+@pytest.fixture(autouse=True)
+def _enforce_query_budgets(settings):
+    settings.QUERY_BUDGET = RAISE
+
+
+@pytest.fixture
+def api_client(db) -> Client:
+    user = get_user_model().objects.create_user(username="planner", password="planner")
+    client = Client(HTTP_HOST="localhost")
+    client.force_login(user)
+    return client
+
+
+@pytest.fixture
+def training_type(db) -> TrainingType:
+    return TrainingType.objects.create(name="First aid")
+
+
+@pytest.fixture
+def make_trainer(training_type):
+    def make(name: str = "Jana Nováková", **fields) -> Trainer:
+        fields.setdefault("home_address", "Brno")
+        fields.setdefault("home_lat", 49.19)
+        fields.setdefault("home_lng", 16.61)
+        trainer = Trainer.objects.create(name=name, **fields)
+        TrainerSkill.objects.create(trainer=trainer, training_type=training_type)
+        return trainer
+
+    return make
+
+
+@pytest.fixture
+def make_training(training_type):
+    def make(start: Optional[datetime] = None, hours: int = 2, **fields) -> Training:
+        start = start or timezone.make_aware(datetime(2031, 3, 4, 9))
+        fields.setdefault("address", "Brno")
+        fields.setdefault("lat", 49.19)
+        fields.setdefault("lng", 16.61)
+        fields.setdefault("status", TrainingStatus.WAITING)
+        return Training.objects.create(
+            training_type=training_type,
+            start_datetime=start,
+            end_datetime=start + timedelta(hours=hours),
+            **fields,
+        )
+
+    return make
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+from typing import Iterable, Iterator, Optional
+
+from django.db import connection, transaction
+from django.db.models import Case, F, Max, Value, When
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .models import ChangeAction, ChangeLog
+
+
+# Entries older than this are pruned; clients behind that point reload everything.
+RETENTION_DAYS = 30
+# Entries numbered per stamp; the rest wait for the next one.
+STAMP_BATCH = 5000
+# Most queries a stamp makes: the lock, the pending ids, the last number, the update.
+STAMP_QUERIES = 4
+# Key of the Postgres advisory lock that lets one stamp run at a time.
+_STAMP_LOCK = 0x6368616E6765
+
+_batch: ContextVar[Optional[dict[tuple[str, int], str]]] = ContextVar(
+    "changelog_batch", default=None
+)
+
+
+def record(entity: str, object_ids: Iterable[int], action: str = ChangeAction.UPSERT) -> None:
+    """Log changed records; call inside the transaction that changes them."""
+    pending = _batch.get()
+    entries = {
+        (entity, object_id): action for object_id in object_ids if object_id is not None
+    }
+    if pending is not None:
+        # The last action per record wins; re-inserting keeps the log in order.
+        for key, value in entries.items():
+            pending.pop(key, None)
+            pending[key] = value
+        return
+    _insert(entries)
+
+
+def _insert(entries: dict[tuple[str, int], str]) -> None:
+    ChangeLog.objects.bulk_create(
+        [
+            ChangeLog(entity=entity, object_id=object_id, action=action)
+            for (entity, object_id), action in entries.items()
+        ]
+    )
+
+
+@contextmanager
+def batch() -> Iterator[None]:
+    """Collect what is recorded inside the block, signals included, into one insert.
+
+    Use inside the transaction, around many saves or deletes. Nested blocks
+    join the outer one.
+    """
+    if _batch.get() is not None:
+        yield
+        return
+    pending: dict[tuple[str, int], str] = {}
+    token = _batch.set(pending)
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+    _insert(pending)
+
+
+def register(model, entity: str) -> None:
+    """Log every save and delete of ``model`` instances under ``entity``."""
+
+    def saved(sender, instance, raw: bool = False, **kwargs) -> None:
+        if not raw:
+            record(entity, [instance.pk])
+
+    def deleted(sender, instance, **kwargs) -> None:
+        record(entity, [instance.pk], ChangeAction.DELETE)
+
+    post_save.connect(saved, sender=model, weak=False, dispatch_uid=f"changelog_save_{entity}")
+    post_delete.connect(
+        deleted, sender=model, weak=False, dispatch_uid=f"changelog_delete_{entity}"
+    )
+
+
+def stamp() -> None:
+    """Give committed entries their sequence numbers, in id order.
+
+    Ids are taken at insert but become visible at commit, so on Postgres an id
+    can show up after a higher one was read. Numbers are handed out only to
+    committed entries, one stamp at a time, so they grow in the order entries
+    become visible and a client's cursor never skips one.
+    """
+    pending = ChangeLog.objects.filter(sequence=None)
+    if connection.vendor != "postgresql":
+        # SQLite has a single writer: ids already become visible in order.
+        pending.update(sequence=F("id"))
+        return
+    with transaction.atomic(savepoint=False):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [_STAMP_LOCK])
+        ids = list(pending.order_by("id").values_list("id", flat=True)[:STAMP_BATCH])
+        if not ids:
+            return
+        last = latest_sequence()
+        pending.filter(id__in=ids).update(
+            sequence=Case(
+                *(When(id=id_, then=Value(last + number)) for number, id_ in enumerate(ids, 1))
+            )
+        )
+
+
+def latest_sequence() -> int:
+    """Highest sequence number handed out; ``stamp`` first to include recent entries."""
+    return ChangeLog.objects.aggregate(latest=Max("sequence"))["latest"] or 0
+
+
+def prune(days: int = RETENTION_DAYS) -> int:
+    stamp()
+    cutoff = timezone.now() - timedelta(days=days)
+    # The newest entry is always kept: it marks where the retained history starts.
+    # Unstamped entries have no sequence and are never pruned before a client saw them.
+    deleted, _ = ChangeLog.objects.filter(
+        created_at__lt=cutoff, sequence__lt=latest_sequence()
+    ).delete()
+    return deleted
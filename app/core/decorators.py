@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import inspect
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+# Django 4.2's view decorators only wrap synchronous views; these are their
+# equivalents for ``async def`` views (Django 5.0 makes the originals async-aware).
+
+
+def async_login_required(view: Optional[Callable] = None, *, redirect: bool = True) -> Callable:
+    """``login_required`` for async views.
+
+    With ``redirect=False`` anonymous requests get a 401 instead of the login
+    page, for clients that can't follow it, such as EventSource.
+    """
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        async def wrapper(request: HttpRequest, *args, **kwargs):
+            # Loading the session user queries the database.
+            if not await sync_to_async(lambda: request.user.is_authenticated)():
+                if not redirect:
+                    return HttpResponse(status=401)
+                return redirect_to_login(request.get_full_path())
+            return await view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator(view) if view is not None else decorator
+
+
+def async_require_http_methods(methods: list[str]) -> Callable[[Callable], Callable]:
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        async def wrapper(request: HttpRequest, *args, **kwargs):
+            if request.method not in methods:
+                return HttpResponseNotAllowed(methods)
+            return await view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def async_cache_control(**options: Any) -> Callable[[Callable], Callable]:
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        async def wrapper(request: HttpRequest, *args, **kwargs):
+            response = await view(request, *args, **kwargs)
+            patch_cache_control(response, **options)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def async_condition(etag_func: Callable) -> Callable[[Callable], Callable]:
+    """ETag handling of ``django.views.decorators.http.condition``; ``etag_func`` may be async."""
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        async def wrapper(request: HttpRequest, *args, **kwargs):
+            etag: Optional[str] = etag_func(request, *args, **kwargs)
+            if inspect.isawaitable(etag):
+                etag = await etag
+            etag = quote_etag(etag) if etag is not None else None
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            if request.method in ("GET", "HEAD") and etag:
+                response.headers.setdefault("ETag", etag)
+            return response
+
+        return wrapper
+
+    return decorator
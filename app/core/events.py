@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, AsyncIterator, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_SECONDS = 25
+# Streams are closed after this long; EventSource reconnects after RETRY_MS.
+MAX_STREAM_SECONDS = 10 * 60
+RETRY_MS = 3000
+QUEUE_SIZE = 100
+
+
+@dataclass(frozen=True)
+class Event:
+    name: str
+    data: dict[str, Any]
+
+    def encode(self) -> str:
+        return f"event: {self.name}\ndata: {json.dumps(self.data)}\n\n"
+
+
+PING = Event("ping", {}).encode()
+# Replaces the backlog of a client that fell behind: it refetches everything.
+OVERFLOW = Event("invalidate", {"entity": "all"}).encode()
+
+
+class _Subscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.queue: asyncio.Queue[str] = asyncio.Queue(QUEUE_SIZE)
+
+    def offer(self, message: str) -> None:
+        # Runs on the subscriber's loop. A slow client never blocks publishers
+        # or other clients: its backlog collapses into a single full invalidation.
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+
+
+class Broker:
+    """In-process fan-out of encoded events to every connected stream."""
+
+    def __init__(self) -> None:
+        self._subscribers: set[_Subscriber] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> _Subscriber:
+        subscriber = _Subscriber(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: _Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def deliver(self, message: str) -> None:
+        """Queue an encoded event for every subscriber; safe to call from any thread."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.offer, message)
+            except RuntimeError:
+                # The subscriber's event loop is gone.
+                self.unsubscribe(subscriber)
+
+
+broker = Broker()
+
+
+class LocalBackend:
+    """Deliver events to streams served by this process only (a single ASGI worker)."""
+
+    def publish(self, event: Event) -> None:
+        broker.deliver(event.encode())
+
+    def start(self) -> None:
+        pass
+
+
+class CacheBackend:
+    """Deliver events across processes through the shared Django cache (e.g. Redis).
+
+    Publishers append events to a numbered log in the cache; every process
+    that serves streams polls the log and relays new entries to its broker.
+    """
+
+    POLL_SECONDS = 0.5
+    EVENT_TIMEOUT = 60
+    _SEQUENCE_KEY = "events:sequence"
+
+    def __init__(self) -> None:
+        self.origin = uuid.uuid4().hex
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def publish(self, event: Event) -> None:
+        broker.deliver(event.encode())
+        try:
+            sequence = cache.incr(self._SEQUENCE_KEY)
+        except ValueError:
+            cache.add(self._SEQUENCE_KEY, 0, timeout=None)
+            sequence = cache.incr(self._SEQUENCE_KEY)
+        cache.set(
+            f"events:{sequence}", (self.origin, event.name, event.data), self.EVENT_TIMEOUT
+        )
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._poll, daemon=True)
+                self._thread.start()
+
+    def _poll(self) -> None:
+        last = cache.get(self._SEQUENCE_KEY, 0)
+        retry: list[int] = []
+        while True:
+            time.sleep(self.POLL_SECONDS)
+            try:
+                current = cache.get(self._SEQUENCE_KEY, 0)
+                if current < last:
+                    last = current  # the cache was flushed
+                wanted = retry + list(range(last + 1, current + 1))
+                values = cache.get_many([f"events:{number}" for number in wanted])
+                # An entry may be numbered before it is written; look once more next time.
+                retry = [
+                    number
+                    for number in wanted
+                    if f"events:{number}" not in values and number > last
+                ]
+                for number in wanted:
+                    entry = values.get(f"events:{number}")
+                    if entry and entry[0] != self.origin:
+                        broker.deliver(Event(entry[1], entry[2]).encode())
+                last = current
+            except Exception:
+                logger.exception("Polling the event log failed.")
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    return import_string(settings.REALTIME_BACKEND)()
+
+
+def publish(name: str, data: dict[str, Any]) -> None:
+    """Publish an event to every connected client; never fails the caller."""
+    try:
+        get_backend().publish(Event(name, data))
+    except Exception:
+        logger.exception("Publishing the %s event failed.", name)
+
+
+async def stream() -> AsyncIterator[str]:
+    """Yield the SSE stream of one client: events as they come, pings while idle."""
+    get_backend().start()
+    subscriber = broker.subscribe()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + MAX_STREAM_SECONDS
+    try:
+        yield f"retry: {RETRY_MS}\n" + Event("ready", {"ok": True}).encode()
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                message = await asyncio.wait_for(
+                    subscriber.queue.get(), timeout=min(HEARTBEAT_SECONDS, remaining)
+                )
+            except asyncio.TimeoutError:
+                yield PING
+                continue
+            # Send whatever else is already queued in the same write.
+            messages = [message]
+            while not subscriber.queue.empty():
+                messages.append(subscriber.queue.get_nowait())
+            yield "".join(messages)
+    finally:
+        broker.unsubscribe(subscriber)
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from core import changelog
+
+
+class Command(BaseCommand):
+    help = "Delete change-log entries older than the retention period."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--days", type=int, default=changelog.RETENTION_DAYS)
+
+    def handle(self, *args, **options) -> None:
+        deleted = changelog.prune(days=options["days"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} change-log entries."))
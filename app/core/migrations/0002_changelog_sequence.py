@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:10
+
+from django.db import migrations, models
+
+
+def stamp_existing(apps, schema_editor):
+    # Clients synced from ids so far; the same numbers keep their cursors valid.
+    ChangeLog = apps.get_model('core', 'ChangeLog')
+    ChangeLog.objects.update(sequence=models.F('id'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='changelog',
+            name='sequence',
+            field=models.BigIntegerField(editable=False, null=True, unique=True),
+        ),
+        migrations.RunPython(stamp_existing, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, router, transaction
 
 
 class TimeStampedModel(models.Model):
@@ -7,3 +7,37 @@ class TimeStampedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class ChangeLoggedModel(models.Model):
+    """Saves in a transaction, so the change-log entry written on post_save commits with it."""
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
+
+class ChangeAction(models.TextChoices):
+    UPSERT = "upsert", "Created or updated"
+    DELETE = "delete", "Deleted"
+
+
+class ChangeLog(models.Model):
+    """Outbox of changed records; ``sequence`` is the number clients sync from.
+
+    The sequence is stamped after the entry commits (see ``changelog.stamp``), so
+    it grows in the order entries become visible, which ids don't on Postgres.
+    """
+
+    entity = models.CharField(max_length=30)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ChangeAction.choices)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    sequence = models.BigIntegerField(null=True, unique=True, editable=False)
+
+    def __str__(self) -> str:
+        return f"#{self.pk} {self.action} {self.entity} {self.object_id}"
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Optional, Sequence
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Page:
+    items: list[Any]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(direction: str, values: Sequence[Any]) -> str:
+    raw = json.dumps({"d": direction, "v": [_encode_value(value) for value in values]})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, list[Any]]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        direction = data["d"]
+        values = data["v"]
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursor("Invalid cursor.") from exc
+    if direction not in {"next", "prev"} or not isinstance(values, list):
+        raise InvalidCursor("Invalid cursor.")
+    return direction, values
+
+
+def _item_value(item: Any, name: str) -> Any:
+    if isinstance(item, dict):
+        return item[name]
+    return getattr(item, name)
+
+
+def _after(ordering: Sequence[str], values: Sequence[Any], reverse: bool) -> Q:
+    """Build ``(a, b, ...) > (va, vb, ...)`` in ``ordering`` direction as OR-ed ANDs."""
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, values):
+        descending = field.startswith("-")
+        name = field.lstrip("-")
+        lookup = "lt" if descending != reverse else "gt"
+        condition |= equal & Q(**{f"{name}__{lookup}": value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+def _page_query(
+    queryset: QuerySet, ordering: Sequence[str], cursor: Optional[str], page_size: int
+) -> tuple[QuerySet, str]:
+    names = [field.lstrip("-") for field in ordering]
+    direction = "next"
+    if cursor:
+        direction, raw_values = decode_cursor(cursor)
+        if len(raw_values) != len(names):
+            raise InvalidCursor("Invalid cursor.")
+        try:
+            values = [
+                queryset.model._meta.get_field(name).to_python(value)
+                for name, value in zip(names, raw_values)
+            ]
+        except ValidationError as exc:
+            raise InvalidCursor("Invalid cursor.") from exc
+        queryset = queryset.filter(_after(ordering, values, reverse=direction == "prev"))
+    if direction == "prev":
+        ordering = [
+            field.lstrip("-") if field.startswith("-") else f"-{field}" for field in ordering
+        ]
+    return queryset.order_by(*ordering)[: page_size + 1], direction
+
+
+def _page(
+    rows: list[Any],
+    ordering: Sequence[str],
+    cursor: Optional[str],
+    page_size: int,
+    direction: str,
+) -> Page:
+    has_more = len(rows) > page_size
+    if direction == "prev":
+        items = list(reversed(rows[:page_size]))
+        has_prev, has_next = has_more, bool(items)
+    else:
+        items = rows[:page_size]
+        has_prev, has_next = bool(cursor) and bool(items), has_more
+
+    names = [field.lstrip("-") for field in ordering]
+
+    def key(item: Any) -> list[Any]:
+        return [_item_value(item, name) for name in names]
+
+    return Page(
+        items=items,
+        next_cursor=encode_cursor("next", key(items[-1])) if has_next else None,
+        prev_cursor=encode_cursor("prev", key(items[0])) if has_prev else None,
+    )
+
+
+def keyset_page(
+    queryset: QuerySet,
+    ordering: Sequence[str],
+    cursor: Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Page:
+    """Return one page of ``queryset`` using keyset (seek) pagination.
+
+    ``ordering`` must be unique (end with the primary key) so every row has a
+    stable position. Each page is a single index range scan no matter how deep
+    the client has paged, unlike OFFSET pagination.
+    """
+    query, direction = _page_query(queryset, ordering, cursor, page_size)
+    return _page(list(query), ordering, cursor, page_size, direction)
+
+
+async def akeyset_page(
+    queryset: QuerySet,
+    ordering: Sequence[str],
+    cursor: Optional[str] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Page:
+    """Async version of ``keyset_page``."""
+    query, direction = _page_query(queryset, ordering, cursor, page_size)
+    return _page([row async for row in query], ordering, cursor, page_size, direction)
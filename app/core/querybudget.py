@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import contextvars
+import inspect
+import logging
+import os
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator, Optional
+
+from django.conf import settings
+
+from .timing import wrap_queries
+
+logger = logging.getLogger(__name__)
+
+RAISE = "raise"
+LOG = "log"
+OFF = "off"
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class Budget:
+    """Queries counted against a limit; the ones over it keep their call site."""
+
+    def __init__(self, name: str, limit: int) -> None:
+        self.name = name
+        self.limit = limit
+        self.count = 0
+        self.over: list[tuple[str, str]] = []
+
+    def report(self) -> str:
+        lines = [
+            f"{self.name} made {self.count} queries, over its budget of {self.limit}. "
+            "Queries over the budget:"
+        ]
+        for (site, sql), times in Counter(self.over).most_common():
+            lines.append(f"  {times}x {site}: {sql[:300]}")
+        return "\n".join(lines)
+
+
+_active: contextvars.ContextVar[tuple[Budget, ...]] = contextvars.ContextVar(
+    "query_budgets", default=()
+)
+_THIS_FILE = os.path.normcase(__file__)
+
+
+def _call_site(depth: int = 3) -> str:
+    """The innermost frames of the project's code outside this module, callers last."""
+    root = os.path.normcase(str(settings.BASE_DIR)) + os.sep
+    sites: list[str] = []
+    frame = sys._getframe(2)
+    while frame is not None and len(sites) < depth:
+        filename = os.path.normcase(frame.f_code.co_filename)
+        if (
+            filename.startswith(root)
+            and filename != _THIS_FILE
+            and "site-packages" not in filename
+        ):
+            path = os.path.relpath(filename, root)
+            sites.append(f"{path}:{frame.f_lineno} in {frame.f_code.co_name}")
+        frame = frame.f_back
+    return " < ".join(sites) or "unknown call site"
+
+
+def _count_query(execute: Callable, sql: str, params: Any, many: bool, context: Any) -> Any:
+    site: Optional[str] = None
+    for budget in _active.get():
+        budget.count += 1
+        if budget.count > budget.limit:
+            # Only queries over a budget pay for the stack walk.
+            site = site or _call_site()
+            budget.over.append((site, sql))
+    return execute(sql, params, many, context)
+
+
+def install() -> None:
+    """Count queries for budgets on every connection; called when the app is ready.
+
+    Outside budgeted blocks this costs one context variable lookup per query.
+    """
+    wrap_queries(_count_query, "core_querybudget")
+
+
+def _mode() -> str:
+    return getattr(settings, "QUERY_BUDGET", LOG)
+
+
+@contextmanager
+def limit_queries(limit: int, name: str) -> Iterator[Budget]:
+    """Count the block's queries against ``limit``.
+
+    Over the limit, it raises ``QueryBudgetExceeded`` or logs a warning, as the
+    ``QUERY_BUDGET`` setting says; the report names the code that made each
+    query over the budget. Blocks can nest; every open block counts a query.
+    """
+    budget = Budget(name, limit)
+    mode = _mode()
+    if mode == OFF:
+        yield budget
+        return
+    token = _active.set((*_active.get(), budget))
+    try:
+        yield budget
+    finally:
+        _active.reset(token)
+    if budget.count <= limit:
+        return
+    if mode == RAISE:
+        raise QueryBudgetExceeded(budget.report())
+    logger.warning(budget.report())
+
+
+def query_budget(limit: int, **per_method: int) -> Callable[[Callable], Callable]:
+    """Declare the most queries a view may make, however much data it shows.
+
+    ``per_method`` sets other limits for some methods, e.g. ``PUT=20``. Put it
+    right below the login decorator: the session and user lookups are not
+    counted. Works for ``async def`` views too.
+    """
+
+    def decorator(view: Callable) -> Callable:
+        name = f"{view.__module__}.{view.__qualname__}"
+
+        def _limit(request) -> int:
+            return per_method.get(request.method, limit)
+
+        if inspect.iscoroutinefunction(view):
+
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                with limit_queries(_limit(request), name):
+                    return await view(request, *args, **kwargs)
+
+            async_wrapper.query_budget = {"*": limit, **per_method}
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            with limit_queries(_limit(request), name):
+                return view(request, *args, **kwargs)
+
+        wrapper.query_budget = {"*": limit, **per_method}
+        return wrapper
+
+    return decorator
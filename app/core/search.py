@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import unicodedata
+
+from django.db import connection
+from django.db.models import Q
+
+# Sorts after any character a search key can hold, closing a prefix range.
+PREFIX_SENTINEL = "\U0010ffff"
+
+
+def search_key(text: str) -> str:
+    """Return the prefix search form of ``text``: no diacritics, lowercase, single spaces."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def prefix_filter(field: str, prefix: str) -> Q:
+    """Match rows whose ``field`` starts with ``prefix``, through an index on ``field``.
+
+    ``field`` must hold lowercase search keys and have ``db_index=True``.
+    """
+    if connection.vendor == "postgresql":
+        # Postgres compares text by locale (in cs_CZ "ch" sorts after "h"), so a
+        # range is no prefix match. LIKE 'prefix%' uses the varchar_pattern_ops
+        # index Django adds to indexed CharFields.
+        return Q(**{f"{field}__startswith": prefix})
+    # SQLite compares bytes, and its LIKE is case-insensitive, so only the range
+    # can use the index.
+    return Q(**{f"{field}__gte": prefix, f"{field}__lt": prefix + PREFIX_SENTINEL})
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import contextvars
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+
+logger = logging.getLogger(__name__)
+
+# Phases other code reports with ``timed()``, in header order.
+SERIALIZE = "serialize"
+GEOCODE = "geocode"
+
+
+class RequestTimings:
+    """What one request spent its time on, in seconds."""
+
+    def __init__(self, capture_queries: bool = False) -> None:
+        self.started = time.perf_counter()
+        self.view_started: Optional[float] = None
+        self.queries = 0
+        self.db = 0.0
+        self.phases: dict[str, float] = {}
+        # (sql, seconds) of every query, kept only for sampled requests.
+        self.captured: Optional[list[tuple[str, float]]] = [] if capture_queries else None
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def add_query(self, sql: str, seconds: float) -> None:
+        self.queries += 1
+        self.db += seconds
+        if self.captured is not None:
+            self.captured.append((sql, seconds))
+
+
+_current: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+def current() -> Optional[RequestTimings]:
+    """The timings of the request being served, if the middleware is on."""
+    return _current.get()
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Add the block's duration to ``phase`` of the current request, if timed."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started)
+
+
+def _record_query(execute: Callable, sql: str, params: Any, many: bool, context: Any) -> Any:
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add_query(sql, time.perf_counter() - started)
+
+
+def wrap_queries(wrapper: Callable, uid: str) -> None:
+    """Add ``wrapper`` to the execute wrappers of every connection, now and to come."""
+
+    def install(connection, **kwargs) -> None:
+        if wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(wrapper)
+
+    connection_created.connect(install, weak=False, dispatch_uid=uid)
+    for connection in connections.all(initialized_only=True):
+        install(connection)
+
+
+def _view_started() -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.view_started = time.perf_counter()
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+def server_timing_header(timings: RequestTimings, total: float, view: Optional[float]) -> str:
+    metrics = [f'db;dur={_ms(timings.db)};desc="{timings.queries} queries"']
+    if view is not None:
+        metrics.append(f"view;dur={_ms(view)}")
+    metrics.extend(f"{phase};dur={_ms(seconds)}" for phase, seconds in timings.phases.items())
+    metrics.append(f"total;dur={_ms(total)}")
+    return ", ".join(metrics)
+
+
+class ServerTimingMiddleware:
+    """Report the query count, DB, view, serialization and geocoding time of requests.
+
+    Each response gets a ``Server-Timing`` header and one JSON log line on the
+    ``core.timing`` logger. A share of the requests (``SERVER_TIMING_SAMPLE_RATE``)
+    keeps its SQL, which is logged when the request took longer than
+    ``SERVER_TIMING_SLOW_MS``. Off unless ``SERVER_TIMING`` is set; put it first
+    in ``MIDDLEWARE`` so the total covers the other middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        if not getattr(settings, "SERVER_TIMING", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow = getattr(settings, "SERVER_TIMING_SLOW_MS", 500) / 1000
+        self.sample_rate = getattr(settings, "SERVER_TIMING_SAMPLE_RATE", 0.0)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            # The handler would run a sync hook in a thread on every request.
+            self.process_view = self._aprocess_view
+        wrap_queries(_record_query, "core_timing")
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.is_async:
+            return self.__acall__(request)
+        timings = self._start()
+        token = _current.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._finish(request, response, timings)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        timings = self._start()
+        token = _current.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._finish(request, response, timings)
+        return response
+
+    def process_view(self, request: HttpRequest, view_func, view_args, view_kwargs) -> None:
+        _view_started()
+
+    async def _aprocess_view(
+        self, request: HttpRequest, view_func, view_args, view_kwargs
+    ) -> None:
+        _view_started()
+
+    def _start(self) -> RequestTimings:
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        return RequestTimings(capture_queries=sampled)
+
+    def _finish(
+        self, request: HttpRequest, response: HttpResponse, timings: RequestTimings
+    ) -> None:
+        finished = time.perf_counter()
+        total = finished - timings.started
+        # Includes the response handling of the later middleware, which is short.
+        view = finished - timings.view_started if timings.view_started is not None else None
+        response["Server-Timing"] = server_timing_header(timings, total, view)
+
+        record: dict[str, Any] = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": _ms(total),
+            "queries": timings.queries,
+            "db_ms": _ms(timings.db),
+        }
+        if view is not None:
+            record["view_ms"] = _ms(view)
+        record.update((f"{phase}_ms", _ms(seconds)) for phase, seconds in timings.phases.items())
+        logger.info(json.dumps(record), extra={"timing": record})
+        if timings.captured is not None and total >= self.slow:
+            slow = {
+                **record,
+                "sql": [{"ms": _ms(seconds), "sql": sql} for sql, seconds in timings.captured],
+            }
+            logger.warning(json.dumps(slow), extra={"timing": slow})
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import csv
+import math
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, TextIO
+
+from django.conf import settings
+
+from core.search import PREFIX_SENTINEL
+
+
+_BATCH_SIZE = 5000
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_POSTCODE = re.compile(r"\b(\d{3}) (\d{2})\b")
+
+_SCHEMA = """
+CREATE TABLE address (
+    id INTEGER PRIMARY KEY,
+    address TEXT NOT NULL,
+    lat REAL NOT NULL,
+    lng REAL NOT NULL
+);
+CREATE TABLE address_key (
+    key TEXT NOT NULL,
+    address_id INTEGER NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class GazetteerEntry:
+    address: str
+    lat: float
+    lng: float
+    keys: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class GazetteerMatch:
+    address: str
+    lat: float
+    lng: float
+
+
+def normalize_address(address: str) -> str:
+    """Return the lookup key for an address: no diacritics, lowercase, single spaces."""
+    decomposed = unicodedata.normalize("NFKD", address)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    collapsed = _NON_ALNUM.sub(" ", stripped.casefold()).strip()
+    return _POSTCODE.sub(r"\1\2", collapsed)
+
+
+def gazetteer_path() -> Optional[Path]:
+    configured = getattr(settings, "GEOCODING_GAZETTEER_PATH", "")
+    if not configured:
+        return None
+    return Path(configured)
+
+
+_local = threading.local()
+
+
+def _connection() -> Optional[sqlite3.Connection]:
+    """Return a read-only, memory-mapped connection for the current thread.
+
+    The connection is reopened when the index file is replaced by a new import.
+    """
+    path = gazetteer_path()
+    if path is None:
+        return None
+    try:
+        stamp = (str(path), path.stat().st_mtime_ns)
+    except OSError:
+        return None
+    cached = getattr(_local, "connection", None)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    if cached is not None:
+        cached[1].close()
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    connection.execute("PRAGMA mmap_size = 268435456")
+    connection.execute("PRAGMA query_only = 1")
+    _local.connection = (stamp, connection)
+    return connection
+
+
+def lookup(address: str) -> Optional[GazetteerMatch]:
+    """Resolve an address by exact key; ambiguous keys are treated as a miss."""
+    connection = _connection()
+    if connection is None:
+        return None
+    key = normalize_address(address)
+    if not key:
+        return None
+    rows = connection.execute(
+        "SELECT a.address, a.lat, a.lng FROM address_key k "
+        "JOIN address a ON a.id = k.address_id WHERE k.key = ? LIMIT 2",
+        (key,),
+    ).fetchall()
+    if len(rows) != 1:
+        return None
+    address_text, lat, lng = rows[0]
+    return GazetteerMatch(address=address_text, lat=lat, lng=lng)
+
+
+def suggest(prefix: str, limit: int) -> list[GazetteerMatch]:
+    """Return up to ``limit`` distinct addresses whose keys start with ``prefix``."""
+    connection = _connection()
+    if connection is None:
+        return []
+    key = normalize_address(prefix)
+    if not key:
+        return []
+    # Each address is stored under several keys, so over-fetch and dedupe here
+    # instead of grouping in SQL, which would scan every key matching the prefix.
+    rows = connection.execute(
+        "SELECT k.address_id, a.address, a.lat, a.lng FROM address_key k "
+        "JOIN address a ON a.id = k.address_id "
+        "WHERE k.key >= ? AND k.key < ? ORDER BY k.key LIMIT ?",
+        (key, key + PREFIX_SENTINEL, limit * 4),
+    ).fetchall()
+    seen: set[int] = set()
+    matches: list[GazetteerMatch] = []
+    for address_id, address_text, lat, lng in rows:
+        if address_id in seen:
+            continue
+        seen.add(address_id)
+        matches.append(GazetteerMatch(address=address_text, lat=lat, lng=lng))
+        if len(matches) >= limit:
+            break
+    return matches
+
+
+def build_index(path: Path, entries: Iterable[GazetteerEntry]) -> int:
+    """Write a fresh index to ``path`` and atomically replace any previous one."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    connection = sqlite3.connect(tmp_path)
+    try:
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.executescript(_SCHEMA)
+        count = 0
+        addresses: list[tuple[int, str, float, float]] = []
+        keys: list[tuple[str, int]] = []
+        for entry in entries:
+            count += 1
+            addresses.append((count, entry.address, entry.lat, entry.lng))
+            keys.extend((key, count) for key in entry.keys)
+            if len(addresses) >= _BATCH_SIZE:
+                _flush(connection, addresses, keys)
+        _flush(connection, addresses, keys)
+        connection.execute("CREATE INDEX address_key_lookup ON address_key (key, address_id)")
+        connection.execute("ANALYZE")
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(tmp_path, path)
+    return count
+
+
+def _flush(
+    connection: sqlite3.Connection,
+    addresses: list[tuple[int, str, float, float]],
+    keys: list[tuple[str, int]],
+) -> None:
+    connection.executemany("INSERT INTO address VALUES (?, ?, ?, ?)", addresses)
+    connection.executemany("INSERT INTO address_key VALUES (?, ?)", keys)
+    addresses.clear()
+    keys.clear()
+
+
+def _entry(address: str, lat: float, lng: float, variants: Iterable[str]) -> GazetteerEntry:
+    keys = {normalize_address(address)}
+    keys.update(normalize_address(variant) for variant in variants)
+    keys.discard("")
+    return GazetteerEntry(address=address, lat=lat, lng=lng, keys=tuple(sorted(keys)))
+
+
+def read_simple_csv(stream: TextIO) -> Iterator[GazetteerEntry]:
+    """Read a CSV with ``address``, ``lat`` and ``lng`` columns."""
+    for row in csv.DictReader(stream):
+        try:
+            lat = float(row["lat"])
+            lng = float(row["lng"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        address = (row.get("address") or "").strip()
+        if address:
+            yield _entry(address, lat, lng, [])
+
+
+def read_ruian_csv(stream: TextIO) -> Iterator[GazetteerEntry]:
+    """Read a RÚIAN address point export (semicolon separated, S-JTSK coordinates).
+
+    Besides the canonical ``Street 12/3, 602 00 City`` form, each point is indexed
+    under the variants planners commonly type: orientation or house number only,
+    without the postcode, and with the Prague/Brno district name instead of the city.
+    """
+    for row in csv.DictReader(stream, delimiter=";"):
+        try:
+            y = float(row["Souřadnice Y"])
+            x = float(row["Souřadnice X"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        lat, lng = sjtsk_to_wgs84(x, y)
+        city = (row.get("Název obce") or "").strip()
+        street = (row.get("Název ulice") or "").strip()
+        street = street or (row.get("Název části obce") or "").strip()
+        house = (row.get("Číslo domovní") or "").strip()
+        orientation = (row.get("Číslo orientační") or "").strip()
+        orientation += (row.get("Znak čísla orientačního") or "").strip()
+        if not city or not house:
+            continue
+        if (row.get("Typ SO") or "").strip() == "č.ev.":
+            house = f"č.ev. {house}"
+        number = f"{house}/{orientation}" if orientation else house
+        postcode = (row.get("PSČ") or "").strip()
+        postcode = f"{postcode[:3]} {postcode[3:]}" if len(postcode) == 5 else postcode
+        place = f"{postcode} {city}" if postcode else city
+        address = f"{street} {number}, {place}"
+        numbers = {number, house, orientation} - {""}
+        cities = {city, (row.get("Název MOMC") or "").strip()} - {""}
+        variants = [f"{street} {num} {name}" for num in numbers for name in cities]
+        if postcode:
+            variants.extend(f"{street} {num} {postcode} {city}" for num in numbers)
+        yield _entry(address, lat, lng, variants)
+
+
+def sjtsk_to_wgs84(x: float, y: float, height: float = 245.0) -> tuple[float, float]:
+    """Convert S-JTSK (Krovak, positive X/Y as exported by RÚIAN) to WGS84 lat/lng."""
+    x, y = abs(x), abs(y)
+    # Inverse Krovak projection to Bessel ellipsoid geodetic coordinates.
+    e = 0.081696831215303
+    n = 0.97992470462083
+    rho0 = 12310230.12797036
+    sin_uq, cos_uq = 0.863499969506341, 0.504348889819882
+    sin_vq, cos_vq = 0.420215144586493, 0.907424504992097
+    alpha = 1.000597498371542
+    k = 1.003419163966575
+    rho = math.sqrt(x * x + y * y)
+    epsilon = 2 * math.atan(y / (rho + x))
+    d = epsilon / n
+    s = 2 * math.atan(math.exp(1 / n * math.log(rho0 / rho))) - math.pi / 2
+    sin_s, cos_s = math.sin(s), math.cos(s)
+    sin_u = sin_uq * sin_s - cos_uq * cos_s * math.cos(d)
+    cos_u = math.sqrt(1 - sin_u * sin_u)
+    sin_dv = math.sin(d) * cos_s / cos_u
+    cos_dv = math.sqrt(1 - sin_dv * sin_dv)
+    sin_v = sin_vq * cos_dv - cos_vq * sin_dv
+    cos_v = cos_vq * cos_dv + sin_vq * sin_dv
+    lng_bessel = 2 * math.atan(sin_v / (1 + cos_v)) / alpha
+    t = math.exp(2 / alpha * math.log((1 + sin_u) / cos_u / k))
+    estimate = (t - 1) / (t + 1)
+    while True:
+        sin_b = estimate
+        estimate = t * math.exp(e * math.log((1 + e * sin_b) / (1 - e * sin_b)))
+        estimate = (estimate - 1) / (estimate + 1)
+        if abs(estimate - sin_b) <= 1e-15:
+            break
+    lat_bessel = math.atan(estimate / math.sqrt(1 - estimate * estimate))
+
+    # Bessel geodetic -> cartesian.
+    a = 6377397.15508
+    f_inv = 299.152812853
+    e2 = 1 - (1 - 1 / f_inv) ** 2
+    radius = a / math.sqrt(1 - e2 * math.sin(lat_bessel) ** 2)
+    cx = (radius + height) * math.cos(lat_bessel) * math.cos(lng_bessel)
+    cy = (radius + height) * math.cos(lat_bessel) * math.sin(lng_bessel)
+    cz = ((1 - e2) * radius + height) * math.sin(lat_bessel)
+
+    # Seven-parameter Helmert transformation to WGS84.
+    dx, dy, dz = 570.69, 85.69, 462.84
+    wx = -4.99821 / 3600 * math.pi / 180
+    wy = -1.58676 / 3600 * math.pi / 180
+    wz = -5.2611 / 3600 * math.pi / 180
+    m = 3.543e-6
+    xn = dx + (1 + m) * (cx + wz * cy - wy * cz)
+    yn = dy + (1 + m) * (-wz * cx + cy + wx * cz)
+    zn = dz + (1 + m) * (wy * cx - wx * cy + cz)
+
+    # WGS84 cartesian -> geodetic.
+    a = 6378137.0
+    f_inv = 298.257223563
+    a_b = f_inv / (f_inv - 1)
+    e2 = 1 - (1 - 1 / f_inv) ** 2
+    p = math.sqrt(xn * xn + yn * yn)
+    theta = math.atan(zn * a_b / p)
+    sin_t, cos_t = math.sin(theta), math.cos(theta)
+    t = (zn + e2 * a_b * a * sin_t**3) / (p - e2 * a * cos_t**3)
+    lat = math.degrees(math.atan(t))
+    lng = math.degrees(2 * math.atan(yn / (p + xn)))
+    return lat, lng
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator
+
+from django.core.management.base import BaseCommand, CommandError
+
+from geocoding import gazetteer
+
+
+READERS = {
+    "ruian": gazetteer.read_ruian_csv,
+    "simple": gazetteer.read_simple_csv,
+}
+DEFAULT_ENCODINGS = {"ruian": "cp1250", "simple": "utf-8"}
+
+
+class Command(BaseCommand):
+    help = "Build the offline geocoding gazetteer from address register CSV exports."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("files", nargs="+", help="CSV files to import (one or more).")
+        parser.add_argument("--format", choices=sorted(READERS), default="ruian")
+        parser.add_argument("--encoding", help="File encoding (defaults per format).")
+        parser.add_argument(
+            "--output",
+            help="Index path (defaults to the GEOCODING_GAZETTEER_PATH setting).",
+        )
+
+    def handle(self, *args, **options) -> None:
+        output = options["output"] or gazetteer.gazetteer_path()
+        if not output:
+            raise CommandError("Set GEOCODING_GAZETTEER_PATH or pass --output.")
+        paths = [Path(name) for name in options["files"]]
+        missing = [str(path) for path in paths if not path.exists()]
+        if missing:
+            raise CommandError(f"Files not found: {', '.join(missing)}")
+        reader = READERS[options["format"]]
+        encoding = options["encoding"] or DEFAULT_ENCODINGS[options["format"]]
+
+        def entries() -> Iterator[gazetteer.GazetteerEntry]:
+            for path in paths:
+                with path.open(encoding=encoding, newline="") as stream:
+                    yield from reader(stream)
+
+        count = gazetteer.build_index(Path(output), entries())
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} addresses into {output}."))
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:06
+
+from django.db import migrations, models
+
+from geocoding.gazetteer import normalize_address
+
+
+def fill_search_keys(apps, schema_editor):
+    GeocodingCache = apps.get_model('geocoding', 'GeocodingCache')
+    entries = list(GeocodingCache.objects.only('id', 'address'))
+    for entry in entries:
+        entry.search_key = normalize_address(entry.address)
+    GeocodingCache.objects.bulk_update(entries, ['search_key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('geocoding', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='geocodingcache',
+            name='search_key',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(fill_search_keys, migrations.RunPython.noop),
+    ]
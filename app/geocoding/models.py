@@ -2,12 +2,19 @@ from django.db import models
 
 from core.models import TimeStampedModel
 
+from .gazetteer import normalize_address
+
 
 class GeocodingCache(TimeStampedModel):
     address = models.CharField(max_length=255, unique=True)
     lat = models.FloatField()
     lng = models.FloatField()
     provider = models.CharField(max_length=50, default="nominatim")
+    search_key = models.CharField(max_length=255, db_index=True, editable=False, default="")
+
+    def save(self, *args, **kwargs) -> None:
+        self.search_key = normalize_address(self.address)
+        super().save(*args, **kwargs)
 
     def __str__(self) -> str:
         return f"{self.address} ({self.provider})"
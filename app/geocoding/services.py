@@ -7,6 +7,14 @@ import urllib.request
 from dataclasses import dataclass
 from typing import Optional
 
+import httpx
+from django.db import connection
+
+from core import timing
+from core.search import prefix_filter
+
+from . import gazetteer
+
 
 @dataclass(frozen=True)
 class GeocodingResult:
@@ -15,28 +23,40 @@ class GeocodingResult:
     provider: str
 
 
-def geocode_address(address: str) -> Optional[GeocodingResult]:
-    """Geocode a free-text address using Nominatim with a local DB cache."""
-    normalized = address.strip()
-    if not normalized:
-        return None
+@dataclass(frozen=True)
+class AddressSuggestion:
+    address: str
+    lat: float
+    lng: float
+    provider: str
+
+
+SUGGEST_MIN_LENGTH = 3
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+REQUEST_TIMEOUT = 6
+
+
+def _offline_location(normalized: str) -> Optional[GeocodingResult]:
+    offline = gazetteer.lookup(normalized)
+    if offline:
+        return GeocodingResult(lat=offline.lat, lng=offline.lng, provider="gazetteer")
+    return None
 
-    from .models import GeocodingCache
 
-    cached = GeocodingCache.objects.filter(address__iexact=normalized).first()
+def _cached_location(cached) -> Optional[GeocodingResult]:
     if cached:
         return GeocodingResult(lat=cached.lat, lng=cached.lng, provider=cached.provider)
+    return None
 
+
+def _search_request(normalized: str) -> tuple[str, dict[str, str]]:
     query = urllib.parse.urlencode({"q": normalized, "format": "json", "limit": 1})
-    url = f"https://nominatim.openstreetmap.org/search?{query}"
+    url = f"{os.environ.get('GEOCODING_URL') or NOMINATIM_URL}?{query}"
     user_agent = os.environ.get("GEOCODING_USER_AGENT", "training-planner-mvp")
-    request = urllib.request.Request(url, headers={"User-Agent": user_agent})
-    try:
-        with urllib.request.urlopen(request, timeout=6) as response:
-            payload = response.read().decode("utf-8")
-    except Exception:
-        return None
+    return url, {"User-Agent": user_agent}
+
 
+def _parse_search(payload: str) -> Optional[tuple[float, float]]:
     try:
         data = json.loads(payload)
     except json.JSONDecodeError:
@@ -46,12 +66,115 @@ def geocode_address(address: str) -> Optional[GeocodingResult]:
         return None
 
     try:
-        lat = float(data[0]["lat"])
-        lng = float(data[0]["lon"])
+        return float(data[0]["lat"]), float(data[0]["lon"])
     except (KeyError, TypeError, ValueError):
         return None
 
+
+def geocode_address(address: str, online: bool = True) -> Optional[GeocodingResult]:
+    """Geocode a free-text address.
+
+    The offline gazetteer is consulted first, then the local DB cache, and
+    Nominatim is only queried when both miss and ``online`` is set.
+    """
+    normalized = address.strip()
+    if not normalized:
+        return None
+
+    from .models import GeocodingCache
+
+    known = _offline_location(normalized) or _cached_location(
+        GeocodingCache.objects.filter(address__iexact=normalized).first()
+    )
+    if known or not online:
+        return known
+
+    url, headers = _search_request(normalized)
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with timing.timed(timing.GEOCODE), urllib.request.urlopen(
+            request, timeout=REQUEST_TIMEOUT
+        ) as response:
+            payload = response.read().decode("utf-8")
+    except Exception:
+        return None
+
+    location = _parse_search(payload)
+    if location is None:
+        return None
     cache = GeocodingCache.objects.create(
-        address=normalized, lat=lat, lng=lng, provider="nominatim"
+        address=normalized, lat=location[0], lng=location[1], provider="nominatim"
+    )
+    return GeocodingResult(lat=cache.lat, lng=cache.lng, provider=cache.provider)
+
+
+async def ageocode_address(address: str, online: bool = True) -> Optional[GeocodingResult]:
+    """Async version of ``geocode_address``; no thread waits on the geocoding service."""
+    normalized = address.strip()
+    if not normalized:
+        return None
+
+    from .models import GeocodingCache
+
+    known = _offline_location(normalized) or _cached_location(
+        await GeocodingCache.objects.filter(address__iexact=normalized).afirst()
+    )
+    if known or not online:
+        return known
+
+    url, headers = _search_request(normalized)
+    try:
+        with timing.timed(timing.GEOCODE):
+            async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
+                response = await client.get(url, headers=headers)
+                response.raise_for_status()
+    except Exception:
+        return None
+
+    location = _parse_search(response.text)
+    if location is None:
+        return None
+    cache = await GeocodingCache.objects.acreate(
+        address=normalized, lat=location[0], lng=location[1], provider="nominatim"
     )
     return GeocodingResult(lat=cache.lat, lng=cache.lng, provider=cache.provider)
+
+
+def suggest_addresses(query: str, limit: int = 10) -> list[AddressSuggestion]:
+    """Return known addresses starting with ``query`` for autocomplete.
+
+    Both sources are searched through an index on the normalized key, so the
+    cost depends on ``limit`` rather than on the size of the cache.
+    """
+    key = gazetteer.normalize_address(query)
+    if len(key) < SUGGEST_MIN_LENGTH:
+        return []
+
+    from .models import GeocodingCache
+
+    cached = GeocodingCache.objects.filter(prefix_filter("search_key", key))
+    if connection.vendor != "postgresql":
+        # SQLite's range scan reads the index in key order: sorting is free.
+        cached = cached.order_by("search_key")
+    # Postgres would sort by the locale, which the varchar_pattern_ops index behind
+    # the LIKE can't supply, so it would sort every match before the LIMIT. There
+    # the first matches the index yields are taken and only those are sorted.
+    rows = sorted(cached.values_list("search_key", "address", "lat", "lng", "provider")[:limit])
+    suggestions = [
+        AddressSuggestion(address=address, lat=lat, lng=lng, provider=provider)
+        for _, address, lat, lng, provider in rows
+    ]
+    seen = {gazetteer.normalize_address(item.address) for item in suggestions}
+    for match in gazetteer.suggest(key, limit):
+        if len(suggestions) >= limit:
+            break
+        match_key = gazetteer.normalize_address(match.address)
+        if match_key in seen:
+            continue
+        seen.add(match_key)
+        suggestions.append(
+            AddressSuggestion(
+                address=match.address, lat=match.lat, lng=match.lng, provider="gazetteer"
+            )
+        )
+    return suggestions
@@ -5,8 +5,11 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Iterable, Optional, Sequence
 
+from django.db.models import F, FloatField, Func, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
 from trainings.models import Training
-from trainers.models import Trainer, TrainerRuleType
+from trainers.models import Trainer, constraints_for
 
 
 LONG_TRIP_THRESHOLD_KM = 150.0
@@ -46,11 +49,14 @@ def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
     return radius_km * c
 
 
-def _rule_value(trainer: Trainer, rule_type: str):
-    for rule in trainer.rules.all():
-        if rule.rule_type == rule_type:
-            return rule.rule_value.get("value")
-    return None
+def haversine_km_expression(lat1: str, lng1: str, lat2: str, lng2: str) -> Func:
+    """SQL counterpart of ``haversine_km`` over four field references."""
+    phi1 = Radians(F(lat1))
+    phi2 = Radians(F(lat2))
+    half_delta_phi = Radians(F(lat2) - F(lat1)) / 2
+    half_delta_lambda = Radians(F(lng2) - F(lng1)) / 2
+    a = Power(Sin(half_delta_phi), 2) + Cos(phi1) * Cos(phi2) * Power(Sin(half_delta_lambda), 2)
+    return Value(2 * 6371.0, output_field=FloatField()) * ASin(Sqrt(a))
 
 
 def _has_conflict(training: Training, existing: Sequence[Training]) -> bool:
@@ -104,6 +110,79 @@ def _long_trip_count(
     return trips
 
 
+def _evaluate(
+    training: Training, trainer: Trainer, assigned_trainings: Sequence[Training]
+) -> tuple[TrainerMatch, list[str]]:
+    """Score one trainer with a home location; also return the rules the trainer breaks."""
+    distance = haversine_km(training.lat, training.lng, trainer.home_lat, trainer.home_lng)
+    constraints = constraints_for(trainer)
+    rule_failures: list[str] = []
+    soft_warnings: list[str] = []
+    skill_ids = {skill.training_type_id for skill in trainer.skills.all()}
+    if training.training_type_id not in skill_ids:
+        rule_failures.append("Does not teach this training type")
+    max_distance = constraints.max_distance_km
+    if max_distance and distance > max_distance:
+        rule_failures.append(f"Over max distance ({max_distance} km)")
+    if constraints.weekend_allowed is False and is_weekend(training.start_datetime):
+        rule_failures.append("No weekend availability")
+    if _has_conflict(training, assigned_trainings):
+        rule_failures.append("Time conflict")
+
+    max_long_trips = constraints.max_long_trips_per_month
+    long_trips = _long_trip_count(trainer, training, assigned_trainings, LONG_TRIP_THRESHOLD_KM)
+    if max_long_trips is not None and distance > LONG_TRIP_THRESHOLD_KM:
+        if long_trips >= max_long_trips:
+            rule_failures.append("Long trip limit reached")
+
+    monthly_workload = len(_trainings_in_month(training, assigned_trainings))
+    total_workload = monthly_workload + long_trips
+    estimated_cost = _estimated_cost(trainer, distance, training)
+    score = max(0.0, 800.0 - distance * 4.0)
+    score += max(0.0, 20 - monthly_workload) * 6.0
+    if estimated_cost is not None:
+        score += max(0.0, 4000.0 - estimated_cost) * 0.04
+    score -= long_trips * 3.0
+
+    if constraints.preferred_weekdays:
+        weekday = training.start_datetime.weekday()
+        if weekday not in constraints.preferred_weekdays:
+            score -= 15.0
+            soft_warnings.append("Outside preferred weekdays")
+
+    reasons = [
+        f"Distance {distance:.1f} km",
+        f"Workload {total_workload} (trainings {monthly_workload}, long trips {long_trips})",
+    ]
+    if estimated_cost is not None:
+        reasons.append(f"Estimated cost {estimated_cost:.0f} CZK")
+
+    match = TrainerMatch(
+        trainer=trainer,
+        score=score,
+        estimated_cost=estimated_cost,
+        reasons=reasons,
+        warnings=[*rule_failures, *soft_warnings],
+    )
+    return match, rule_failures
+
+
+def assignment_failures(
+    training: Training, trainer: Trainer, assigned_trainings: Sequence[Training]
+) -> list[str]:
+    """Rules ``trainer`` would break by taking ``training``.
+
+    ``assigned_trainings`` are the trainer's other active trainings; those
+    overlapping the training and those in its month are enough.
+    """
+    if training.lat is None or training.lng is None:
+        return ["Training has no coordinates"]
+    if trainer.home_lat is None or trainer.home_lng is None:
+        return ["Trainer has no home location"]
+    _, rule_failures = _evaluate(training, trainer, assigned_trainings)
+    return rule_failures
+
+
 def recommend_trainers(
     training: Training,
     trainers: Iterable[Trainer],
@@ -124,61 +203,8 @@ def recommend_trainers(
     for trainer in trainers:
         if trainer.home_lat is None or trainer.home_lng is None:
             continue
-        distance = haversine_km(
-            training.lat, training.lng, trainer.home_lat, trainer.home_lng
-        )
-        rule_failures: list[str] = []
-        soft_warnings: list[str] = []
-        skill_ids = {skill.training_type_id for skill in trainer.skills.all()}
-        if training.training_type_id not in skill_ids:
-            rule_failures.append("Does not teach this training type")
-        max_distance = _rule_value(trainer, TrainerRuleType.MAX_DISTANCE_KM)
-        if max_distance and distance > max_distance:
-            rule_failures.append(f"Over max distance ({max_distance} km)")
-        weekend_allowed = _rule_value(trainer, TrainerRuleType.WEEKEND_ALLOWED)
-        if weekend_allowed is False and is_weekend(training.start_datetime):
-            rule_failures.append("No weekend availability")
-        assigned_trainings = trainings_by_trainer.get(trainer.id, [])
-        if _has_conflict(training, assigned_trainings):
-            rule_failures.append("Time conflict")
-
-        max_long_trips = _rule_value(trainer, TrainerRuleType.MAX_LONG_TRIPS_PER_MONTH)
-        long_trips = _long_trip_count(
-            trainer, training, assigned_trainings, LONG_TRIP_THRESHOLD_KM
-        )
-        if max_long_trips is not None and distance > LONG_TRIP_THRESHOLD_KM:
-            if long_trips >= max_long_trips:
-                rule_failures.append("Long trip limit reached")
-
-        monthly_workload = len(_trainings_in_month(training, assigned_trainings))
-        total_workload = monthly_workload + long_trips
-        estimated_cost = _estimated_cost(trainer, distance, training)
-        score = max(0.0, 800.0 - distance * 4.0)
-        score += max(0.0, 20 - monthly_workload) * 6.0
-        if estimated_cost is not None:
-            score += max(0.0, 4000.0 - estimated_cost) * 0.04
-        score -= long_trips * 3.0
-
-        preferred_weekdays = _rule_value(trainer, TrainerRuleType.PREFERRED_WEEKDAYS) or []
-        if preferred_weekdays:
-            weekday = training.start_datetime.weekday()
-            if weekday not in preferred_weekdays:
-                score -= 15.0
-                soft_warnings.append("Outside preferred weekdays")
-
-        reasons = [
-            f"Distance {distance:.1f} km",
-            f"Workload {total_workload} (trainings {monthly_workload}, long trips {long_trips})",
-        ]
-        if estimated_cost is not None:
-            reasons.append(f"Estimated cost {estimated_cost:.0f} CZK")
-
-        match = TrainerMatch(
-            trainer=trainer,
-            score=score,
-            estimated_cost=estimated_cost,
-            reasons=reasons,
-            warnings=[*rule_failures, *soft_warnings],
+        match, rule_failures = _evaluate(
+            training, trainer, trainings_by_trainer.get(trainer.id, [])
         )
         if not rule_failures:
             matches.append(match)
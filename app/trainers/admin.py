@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Trainer, TrainerRule, TrainerSkill
+from .models import Trainer, TrainerConstraints, TrainerSkill
 
 
 @admin.register(Trainer)
@@ -15,7 +15,14 @@ class TrainerSkillAdmin(admin.ModelAdmin):
     list_filter = ["training_type"]
 
 
-@admin.register(TrainerRule)
-class TrainerRuleAdmin(admin.ModelAdmin):
-    list_display = ["trainer", "rule_type"]
-    list_filter = ["rule_type"]
+@admin.register(TrainerConstraints)
+class TrainerConstraintsAdmin(admin.ModelAdmin):
+    list_display = [
+        "trainer",
+        "max_distance_km",
+        "weekend_allowed",
+        "max_long_trips_per_month",
+        "preferred_weekdays",
+    ]
+    list_filter = ["weekend_allowed"]
+    list_select_related = ["trainer"]
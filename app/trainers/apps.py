@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class TrainersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "trainers"
+
+    def ready(self) -> None:
+        from core import changelog
+
+        from .models import Trainer, TrainerConstraints, TrainerSkill
+
+        changelog.register(Trainer, "trainer")
+        changelog.register(TrainerSkill, "trainer_skill")
+        changelog.register(TrainerConstraints, "trainer_constraints")
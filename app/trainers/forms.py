@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from django import forms
+from django.db import transaction
 
+from core import changelog
 from trainings.models import TrainingType
 
-from .models import Trainer, TrainerRule, TrainerRuleType, TrainerSkill
+from .models import Trainer, TrainerConstraints, TrainerSkill, constraints_for
 
 
 WEEKDAY_CHOICES = [
@@ -49,62 +51,60 @@ class TrainerForm(forms.ModelForm):
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         if self.instance.pk:
-            self.fields["training_types"].initial = self.instance.skills.values_list(
-                "training_type_id", flat=True
-            )
-            self.fields["max_distance_km"].initial = _rule_value(
-                self.instance, TrainerRuleType.MAX_DISTANCE_KM
-            )
-            weekend_allowed = _rule_value(self.instance, TrainerRuleType.WEEKEND_ALLOWED)
-            self.fields["weekend_allowed"].initial = True if weekend_allowed is None else weekend_allowed
-            self.fields["max_long_trips_per_month"].initial = _rule_value(
-                self.instance, TrainerRuleType.MAX_LONG_TRIPS_PER_MONTH
-            )
-            weekdays = _rule_value(self.instance, TrainerRuleType.PREFERRED_WEEKDAYS) or []
-            self.fields["preferred_weekdays"].initial = [str(day) for day in weekdays]
+            # Uses the instance's prefetched skills and joined constraints when loaded.
+            constraints = constraints_for(self.instance)
+            self.fields["training_types"].initial = [
+                skill.training_type_id for skill in self.instance.skills.all()
+            ]
+            self.fields["max_distance_km"].initial = constraints.max_distance_km
+            self.fields["weekend_allowed"].initial = constraints.weekend_allowed is not False
+            self.fields["max_long_trips_per_month"].initial = constraints.max_long_trips_per_month
+            self.fields["preferred_weekdays"].initial = [
+                str(day) for day in constraints.preferred_weekdays
+            ]
         else:
             self.fields["weekend_allowed"].initial = True
 
     def save(self, commit: bool = True) -> Trainer:
-        trainer = super().save(commit=commit)
-        if commit:
+        if not commit:
+            return super().save(commit=False)
+        # Skills are diffed against the stored ones and written in bulk.
+        with transaction.atomic(), changelog.batch():
+            trainer = super().save()
             self._save_training_types(trainer)
-            self._save_rules(trainer)
+            self._save_constraints(trainer)
         return trainer
 
     def _save_training_types(self, trainer: Trainer) -> None:
-        TrainerSkill.objects.filter(trainer=trainer).delete()
-        for training_type in self.cleaned_data.get("training_types", []):
-            TrainerSkill.objects.create(trainer=trainer, training_type=training_type)
-
-    def _save_rules(self, trainer: Trainer) -> None:
-        _set_rule(trainer, TrainerRuleType.MAX_DISTANCE_KM, self.cleaned_data.get("max_distance_km"))
-        _set_rule(trainer, TrainerRuleType.WEEKEND_ALLOWED, self.cleaned_data.get("weekend_allowed"))
-        _set_rule(
-            trainer,
-            TrainerRuleType.MAX_LONG_TRIPS_PER_MONTH,
-            self.cleaned_data.get("max_long_trips_per_month"),
+        wanted = {training_type.pk for training_type in self.cleaned_data.get("training_types", [])}
+        current = dict(
+            TrainerSkill.objects.filter(trainer=trainer).values_list("training_type_id", "id")
         )
-        preferred_weekdays = self.cleaned_data.get("preferred_weekdays") or []
-        _set_rule(trainer, TrainerRuleType.PREFERRED_WEEKDAYS, [int(day) for day in preferred_weekdays])
-
-
-def _rule_value(trainer: Trainer, rule_type: str):
-    rule = TrainerRule.objects.filter(trainer=trainer, rule_type=rule_type).first()
-    if not rule:
-        return None
-    return rule.rule_value.get("value")
-
-
-def _set_rule(trainer: Trainer, rule_type: str, value) -> None:
-    rule = TrainerRule.objects.filter(trainer=trainer, rule_type=rule_type).first()
-    if value in (None, "", []):
-        if rule:
-            rule.delete()
-        return
-    payload = {"value": value}
-    if rule:
-        rule.rule_value = payload
-        rule.save(update_fields=["rule_value"])
-    else:
-        TrainerRule.objects.create(trainer=trainer, rule_type=rule_type, rule_value=payload)
+        removed = [skill_id for type_id, skill_id in current.items() if type_id not in wanted]
+        if removed:
+            TrainerSkill.objects.filter(id__in=removed).delete()
+        created = TrainerSkill.objects.bulk_create(
+            [
+                TrainerSkill(trainer=trainer, training_type_id=type_id)
+                for type_id in sorted(wanted - current.keys())
+            ]
+        )
+        changelog.record("trainer_skill", [skill.pk for skill in created])
+
+    def _save_constraints(self, trainer: Trainer) -> None:
+        values = {
+            "max_distance_km": self.cleaned_data.get("max_distance_km"),
+            "weekend_allowed": self.cleaned_data.get("weekend_allowed"),
+            "max_long_trips_per_month": self.cleaned_data.get("max_long_trips_per_month"),
+            "preferred_weekdays": sorted(
+                {int(day) for day in self.cleaned_data.get("preferred_weekdays") or []}
+            ),
+        }
+        constraints = TrainerConstraints.objects.filter(trainer=trainer).first()
+        if constraints is None:
+            constraints = TrainerConstraints(trainer=trainer)
+        elif all(getattr(constraints, name) == value for name, value in values.items()):
+            return
+        for name, value in values.items():
+            setattr(constraints, name, value)
+        constraints.save()
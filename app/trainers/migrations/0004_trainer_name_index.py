@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainers', '0003_remove_trainer_base_price_trainer_hourly_rate_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trainer',
+            index=models.Index(fields=['name', 'id'], name='trainers_tr_name_49dbfd_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:30
+
+import secrets
+
+from django.db import migrations, models
+import trainers.models
+
+
+def fill_feed_tokens(apps, schema_editor):
+    Trainer = apps.get_model('trainers', 'Trainer')
+    for trainer in Trainer.objects.filter(feed_token__isnull=True).only('id'):
+        trainer.feed_token = secrets.token_urlsafe(24)
+        trainer.save(update_fields=['feed_token'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainers', '0004_trainer_name_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainer',
+            name='feed_token',
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.RunPython(fill_feed_tokens, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='trainer',
+            name='feed_token',
+            field=models.CharField(default=trainers.models.new_feed_token, editable=False, max_length=64, unique=True),
+        ),
+    ]
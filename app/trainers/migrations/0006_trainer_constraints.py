@@ -0,0 +1,111 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+import trainers.models
+
+
+def _as_int(value):
+    if isinstance(value, bool):
+        return None
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number >= 0 else None
+
+
+def _as_weekdays(value):
+    if not isinstance(value, list):
+        return []
+    days = {_as_int(day) for day in value}
+    return sorted(day for day in days if day is not None and day <= 6)
+
+
+def copy_rules(apps, schema_editor):
+    TrainerRule = apps.get_model('trainers', 'TrainerRule')
+    TrainerConstraints = apps.get_model('trainers', 'TrainerConstraints')
+    ChangeLog = apps.get_model('core', 'ChangeLog')
+    values = {}
+    rule_ids = []
+    # As before, the first rule of a type is the one that counts.
+    for rule in TrainerRule.objects.order_by('id'):
+        rule_ids.append(rule.id)
+        value = (rule.rule_value or {}).get('value') if isinstance(rule.rule_value, dict) else None
+        values.setdefault(rule.trainer_id, {}).setdefault(rule.rule_type, value)
+    rows = []
+    for trainer_id, rules in values.items():
+        weekend_allowed = rules.get('weekend_allowed')
+        row = TrainerConstraints(
+            trainer_id=trainer_id,
+            max_distance_km=_as_int(rules.get('max_distance_km')) or None,
+            weekend_allowed=weekend_allowed if isinstance(weekend_allowed, bool) else None,
+            max_long_trips_per_month=_as_int(rules.get('max_long_trips_per_month')),
+            preferred_weekdays=_as_weekdays(rules.get('preferred_weekdays')),
+        )
+        # Rules that had no effect leave nothing to store.
+        if row.max_distance_km or row.max_long_trips_per_month is not None or (
+            row.weekend_allowed is not None or row.preferred_weekdays
+        ):
+            rows.append(row)
+    TrainerConstraints.objects.bulk_create(rows, batch_size=500)
+    # Let API clients that sync through /api/changes/ drop the old records.
+    ChangeLog.objects.bulk_create(
+        [ChangeLog(entity='trainer_rule', object_id=pk, action='delete') for pk in rule_ids]
+        + [
+            ChangeLog(entity='trainer_constraints', object_id=row.trainer_id, action='upsert')
+            for row in rows
+        ],
+        batch_size=500,
+    )
+
+
+def restore_rules(apps, schema_editor):
+    TrainerRule = apps.get_model('trainers', 'TrainerRule')
+    TrainerConstraints = apps.get_model('trainers', 'TrainerConstraints')
+    rules = []
+    for constraints in TrainerConstraints.objects.order_by('trainer_id'):
+        values = {
+            'max_distance_km': constraints.max_distance_km,
+            'weekend_allowed': constraints.weekend_allowed,
+            'max_long_trips_per_month': constraints.max_long_trips_per_month,
+            'preferred_weekdays': constraints.preferred_weekdays,
+        }
+        rules.extend(
+            TrainerRule(
+                trainer_id=constraints.trainer_id,
+                rule_type=rule_type,
+                rule_value={'value': value},
+            )
+            for rule_type, value in values.items()
+            if value not in (None, [])
+        )
+    TrainerRule.objects.bulk_create(rules, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('trainers', '0005_trainer_feed_token'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainerConstraints',
+            fields=[
+                ('trainer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='constraints', serialize=False, to='trainers.trainer')),
+                ('max_distance_km', models.PositiveIntegerField(blank=True, null=True)),
+                ('weekend_allowed', models.BooleanField(blank=True, null=True)),
+                ('max_long_trips_per_month', models.PositiveIntegerField(blank=True, null=True)),
+                ('preferred_weekdays', models.JSONField(blank=True, default=list, validators=[trainers.models.validate_weekdays])),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(copy_rules, restore_rules),
+        migrations.DeleteModel(
+            name='TrainerRule',
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:40
+
+from django.db import migrations, models
+
+from core.search import search_key
+
+
+def fill_search_names(apps, schema_editor):
+    Trainer = apps.get_model('trainers', 'Trainer')
+    trainers = list(Trainer.objects.only('id', 'name'))
+    for trainer in trainers:
+        trainer.search_name = search_key(trainer.name)
+    Trainer.objects.bulk_update(trainers, ['search_name'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainers', '0006_trainer_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainer',
+            name='search_name',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=200),
+        ),
+        migrations.RunPython(fill_search_names, migrations.RunPython.noop),
+    ]
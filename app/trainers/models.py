@@ -1,6 +1,15 @@
+import secrets
+from typing import Any
+
+from django.core.exceptions import ValidationError
 from django.db import models
 
-from core.models import TimeStampedModel
+from core.models import ChangeLoggedModel, TimeStampedModel
+from core.search import search_key
+
+
+def new_feed_token() -> str:
+    return secrets.token_urlsafe(24)
 
 
 class TrainerRuleType(models.TextChoices):
@@ -10,8 +19,10 @@ class TrainerRuleType(models.TextChoices):
     PREFERRED_WEEKDAYS = "preferred_weekdays", "Preferred weekdays"
 
 
-class Trainer(TimeStampedModel):
+class Trainer(ChangeLoggedModel, TimeStampedModel):
     name = models.CharField(max_length=200)
+    # search_key(name), for the index-backed name search of the trainer list.
+    search_name = models.CharField(max_length=200, db_index=True, editable=False, default="")
     email = models.EmailField(blank=True)
     phone = models.CharField(max_length=50, blank=True)
     home_address = models.CharField(max_length=255)
@@ -24,15 +35,27 @@ class Trainer(TimeStampedModel):
         "travel rate (CZK/km)", max_digits=10, decimal_places=2, null=True, blank=True
     )
     notes = models.TextField(blank=True)
+    # Secret path component of the trainer's subscribable iCalendar feed.
+    feed_token = models.CharField(
+        max_length=64, unique=True, default=new_feed_token, editable=False
+    )
 
     class Meta:
         ordering = ["name"]
+        indexes = [models.Index(fields=["name", "id"])]
+
+    def save(self, *args, **kwargs) -> None:
+        self.search_name = search_key(self.name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "search_name"}
+        super().save(*args, **kwargs)
 
     def __str__(self) -> str:
         return self.name
 
 
-class TrainerSkill(models.Model):
+class TrainerSkill(ChangeLoggedModel):
     trainer = models.ForeignKey(
         "trainers.Trainer", on_delete=models.CASCADE, related_name="skills"
     )
@@ -51,15 +74,50 @@ class TrainerSkill(models.Model):
         return f"{self.trainer} - {self.training_type}"
 
 
-class TrainerRule(models.Model):
-    trainer = models.ForeignKey(
-        "trainers.Trainer", on_delete=models.CASCADE, related_name="rules"
+def validate_weekdays(value) -> None:
+    if not isinstance(value, list) or any(
+        type(day) is not int or not 0 <= day <= 6 for day in value
+    ):
+        raise ValidationError("Enter a list of weekday numbers from 0 (Monday) to 6 (Sunday).")
+
+
+class TrainerConstraints(ChangeLoggedModel):
+    """A trainer's scheduling constraints; an empty field (or no row) sets no constraint."""
+
+    trainer = models.OneToOneField(
+        "trainers.Trainer",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="constraints",
+    )
+    max_distance_km = models.PositiveIntegerField(null=True, blank=True)
+    # None: not set, which allows weekends.
+    weekend_allowed = models.BooleanField(null=True, blank=True)
+    max_long_trips_per_month = models.PositiveIntegerField(null=True, blank=True)
+    preferred_weekdays = models.JSONField(
+        default=list, blank=True, validators=[validate_weekdays]
     )
-    rule_type = models.CharField(max_length=50, choices=TrainerRuleType.choices)
-    rule_value = models.JSONField(default=dict, blank=True)
 
-    class Meta:
-        indexes = [models.Index(fields=["trainer", "rule_type"])]
+    def as_rules(self) -> dict[str, Any]:
+        """The constraints that are set, by ``TrainerRuleType`` in its order."""
+        values = {
+            TrainerRuleType.MAX_DISTANCE_KM: self.max_distance_km,
+            TrainerRuleType.WEEKEND_ALLOWED: self.weekend_allowed,
+            TrainerRuleType.MAX_LONG_TRIPS_PER_MONTH: self.max_long_trips_per_month,
+            TrainerRuleType.PREFERRED_WEEKDAYS: self.preferred_weekdays,
+        }
+        return {rule_type: value for rule_type, value in values.items() if value not in (None, [])}
 
     def __str__(self) -> str:
-        return f"{self.trainer} - {self.rule_type}"
+        return f"{self.trainer} - constraints"
+
+
+def constraints_for(trainer: Trainer) -> TrainerConstraints:
+    """The trainer's constraints, or empty ones.
+
+    Load trainers with ``select_related("constraints")`` to avoid a query per trainer.
+    """
+    try:
+        return trainer.constraints
+    except TrainerConstraints.DoesNotExist:
+        return TrainerConstraints(trainer_id=trainer.pk)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Iterator, Optional
+
+from django.db.models import (
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    FilteredRelation,
+    Q,
+    Sum,
+)
+
+from matching.services import LONG_TRIP_THRESHOLD_KM, haversine_km_expression
+from trainings.models import TrainingStatus
+from trainings.services import month_bounds
+
+from .models import Trainer
+
+
+ACTIVE_STATUSES = [status for status in TrainingStatus.values if status != TrainingStatus.CANCELED]
+
+
+@dataclass(frozen=True)
+class TrainerUtilization:
+    trainer_id: int
+    name: str
+    workload: int
+    long_trips: int
+    hours: float
+    distance_km: float
+    estimated_cost: Optional[float]
+
+
+def trainer_utilization(
+    year: int, month: int, trainer_ids: Optional[list[int]] = None
+) -> Iterator[TrainerUtilization]:
+    """Yield month utilization for every trainer from a single aggregate query.
+
+    Distances are computed in SQL with the same haversine formula the matching
+    service uses; cost follows ``matching.services._estimated_cost`` summed over
+    the month (hourly rate * hours + travel rate * km).
+    """
+    month_trainings = FilteredRelation(
+        "assigned_trainings",
+        condition=Q(
+            assigned_trainings__start_date__range=month_bounds(year, month),
+            assigned_trainings__status__in=ACTIVE_STATUSES,
+        ),
+    )
+    distance = haversine_km_expression(
+        "month_trainings__lat", "month_trainings__lng", "home_lat", "home_lng"
+    )
+    duration = ExpressionWrapper(
+        F("month_trainings__end_datetime") - F("month_trainings__start_datetime"),
+        output_field=DurationField(),
+    )
+    trainers = Trainer.objects.all()
+    if trainer_ids is not None:
+        trainers = trainers.filter(id__in=trainer_ids)
+    rows = (
+        trainers.alias(month_trainings=month_trainings, distance_km=distance)
+        .annotate(
+            workload=Count("month_trainings"),
+            long_trips=Count("month_trainings", filter=Q(distance_km__gt=LONG_TRIP_THRESHOLD_KM)),
+            duration=Sum(duration),
+            total_distance=Sum("distance_km"),
+        )
+        .order_by("name", "id")
+        .values(
+            "id",
+            "name",
+            "hourly_rate",
+            "travel_rate_km",
+            "workload",
+            "long_trips",
+            "duration",
+            "total_distance",
+        )
+    )
+    for row in rows.iterator(chunk_size=500):
+        hours = (row["duration"] or timedelta()).total_seconds() / 3600.0
+        distance_km = row["total_distance"] or 0.0
+        estimated_cost = None
+        if row["hourly_rate"] is not None or row["travel_rate_km"] is not None:
+            estimated_cost = 0.0
+            if row["hourly_rate"] is not None:
+                estimated_cost += float(row["hourly_rate"]) * hours
+            if row["travel_rate_km"] is not None:
+                estimated_cost += float(row["travel_rate_km"]) * distance_km
+        yield TrainerUtilization(
+            trainer_id=row["id"],
+            name=row["name"],
+            workload=row["workload"],
+            long_trips=row["long_trips"],
+            hours=round(hours, 2),
+            distance_km=round(distance_km, 1),
+            estimated_cost=round(estimated_cost, 2) if estimated_cost is not None else None,
+        )
@@ -5,21 +5,24 @@ from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 
+from core.querybudget import query_budget
 from geocoding.services import geocode_address
-from matching.services import LONG_TRIP_THRESHOLD_KM, haversine_km
-from trainings.models import Training, TrainingStatus
+from trainings.models import Training
 
 from .forms import TrainerForm, WEEKDAY_CHOICES
-from .models import Trainer, TrainerRuleType
+from .models import Trainer, TrainerRuleType, constraints_for
+from .reports import trainer_utilization
 
 
 @login_required
+@query_budget(1)
 def trainer_list(request):
     trainers = Trainer.objects.all()
     return render(request, "trainers/index.html", {"trainers": trainers})
 
 
 @login_required
+@query_budget(1, POST=17)
 def trainer_create(request):
     if request.method == "POST":
         form = TrainerForm(request.POST)
@@ -42,55 +45,29 @@ def trainer_create(request):
 
 
 @login_required
+@query_budget(5)
 def trainer_detail(request, pk: int):
-    trainer = get_object_or_404(Trainer, pk=pk)
-    trainings = Training.objects.filter(assigned_trainer=trainer).order_by("-start_datetime")
+    trainer = get_object_or_404(
+        Trainer.objects.select_related("constraints").prefetch_related("skills__training_type"),
+        pk=pk,
+    )
+    trainings = (
+        Training.objects.filter(assigned_trainer=trainer)
+        .select_related("training_type")
+        .order_by("-start_datetime")
+    )
     weekday_choices = [
         {"value": int(value), "label": label} for value, label in WEEKDAY_CHOICES
     ]
-    preferred_weekdays = []
-    weekend_allowed = None
-    rules = []
-    for rule in trainer.rules.all():
-        value = rule.rule_value.get("value")
-        if rule.rule_type == TrainerRuleType.PREFERRED_WEEKDAYS:
-            if isinstance(value, list):
-                normalized = []
-                for day in value:
-                    try:
-                        day_num = int(day)
-                    except (TypeError, ValueError):
-                        continue
-                    if 0 <= day_num <= 6:
-                        normalized.append(day_num)
-                preferred_weekdays = sorted(set(normalized))
-            continue
-        if rule.rule_type == TrainerRuleType.WEEKEND_ALLOWED:
-            weekend_allowed = value
-            continue
-        rules.append(
-            {"type": rule.rule_type, "label": rule.get_rule_type_display(), "value": value}
-        )
+    constraints = constraints_for(trainer)
+    rules = [
+        {"type": rule_type, "label": TrainerRuleType(rule_type).label, "value": value}
+        for rule_type, value in constraints.as_rules().items()
+        if rule_type
+        not in (TrainerRuleType.PREFERRED_WEEKDAYS, TrainerRuleType.WEEKEND_ALLOWED)
+    ]
     today = date.today()
-    month_trainings = (
-        Training.objects.filter(
-            assigned_trainer=trainer,
-            start_datetime__year=today.year,
-            start_datetime__month=today.month,
-        )
-        .exclude(status=TrainingStatus.CANCELED)
-        .only("start_datetime", "lat", "lng")
-    )
-    month_long_trips = 0
-    if trainer.home_lat is not None and trainer.home_lng is not None:
-        for item in month_trainings:
-            if item.lat is None or item.lng is None:
-                continue
-            distance = haversine_km(
-                item.lat, item.lng, trainer.home_lat, trainer.home_lng
-            )
-            if distance > LONG_TRIP_THRESHOLD_KM:
-                month_long_trips += 1
+    month_stats = next(trainer_utilization(today.year, today.month, trainer_ids=[trainer.id]))
     return render(
         request,
         "trainers/detail.html",
@@ -99,15 +76,16 @@ def trainer_detail(request, pk: int):
             "trainings": trainings,
             "rules": rules,
             "weekday_choices": weekday_choices,
-            "preferred_weekdays": preferred_weekdays,
-            "weekend_allowed": weekend_allowed,
-            "month_workload": month_trainings.count(),
-            "month_long_trips": month_long_trips,
+            "preferred_weekdays": constraints.preferred_weekdays,
+            "weekend_allowed": constraints.weekend_allowed,
+            "month_workload": month_stats.workload,
+            "month_long_trips": month_stats.long_trips,
         },
     )
 
 
 @login_required
+@query_budget(4, POST=22)
 def trainer_edit(request, pk: int):
     trainer = get_object_or_404(Trainer, pk=pk)
     if request.method == "POST":
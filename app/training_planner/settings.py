@@ -69,6 +69,22 @@ USE_TZ = True
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///db.sqlite3")
 DATABASES = {"default": _database_from_url(DATABASE_URL)}
 
+# Calendar payloads are cached per period; use a shared backend (e.g. Redis)
+# when running several processes so invalidations reach all of them.
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", "training-planner"),
+    }
+}
+
+# Fan-out of /api/events/ invalidations. LocalBackend reaches streams served by
+# the same process; with several workers use core.events.CacheBackend together
+# with a shared cache backend.
+REALTIME_BACKEND = os.environ.get("REALTIME_BACKEND", "core.events.LocalBackend")
+
 INSTALLED_APPS = [
     "django.contrib.admin",
     "django.contrib.auth",
@@ -81,9 +97,11 @@ INSTALLED_APPS = [
     "trainings",
     "matching",
     "geocoding",
+    "calendar_sync",
 ]
 
 MIDDLEWARE = [
+    "core.timing.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -93,6 +111,28 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Per-request query count, DB, view, serialization and geocoding time, as a
+# Server-Timing header and a JSON line on the core.timing logger. A share of the
+# requests keeps its SQL, logged as a warning when the request is slow.
+SERVER_TIMING = _bool_env("SERVER_TIMING", default=DEBUG)
+SERVER_TIMING_SLOW_MS = float(os.environ.get("SERVER_TIMING_SLOW_MS", "500"))
+SERVER_TIMING_SAMPLE_RATE = float(os.environ.get("SERVER_TIMING_SAMPLE_RATE", "0"))
+
+# Views declare the most queries they may make (core.querybudget). Over budget,
+# "raise" fails the request, for development and checks; "log" logs a warning
+# naming the code that made the extra queries; "off" does not count.
+QUERY_BUDGET = os.environ.get("QUERY_BUDGET", "raise" if DEBUG else "log")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "core.timing": {"handlers": ["console"], "level": "INFO", "propagate": False},
+        "core.querybudget": {"handlers": ["console"], "level": "WARNING", "propagate": False},
+    },
+}
+
 ROOT_URLCONF = "training_planner.urls"
 
 TEMPLATES = [
@@ -135,6 +175,21 @@ STATICFILES_DIRS = [BASE_DIR / "static"]
 
 VITE_DEV_SERVER = os.environ.get("VITE_DEV_SERVER", "")
 
+GEOCODING_GAZETTEER_PATH = os.environ.get("GEOCODING_GAZETTEER_PATH", "")
+
+# Google Calendar sync is off unless a calendar id is set. The API and token
+# URLs can point at `manage.py fake_calendar_server` for local testing.
+GOOGLE_CALENDAR_ID = os.environ.get("GOOGLE_CALENDAR_ID", "")
+GOOGLE_CALENDAR_API_URL = os.environ.get(
+    "GOOGLE_CALENDAR_API_URL", "https://www.googleapis.com"
+)
+GOOGLE_CALENDAR_TOKEN_URL = os.environ.get(
+    "GOOGLE_CALENDAR_TOKEN_URL", "https://oauth2.googleapis.com/token"
+)
+GOOGLE_CALENDAR_CLIENT_ID = os.environ.get("GOOGLE_CALENDAR_CLIENT_ID", "")
+GOOGLE_CALENDAR_CLIENT_SECRET = os.environ.get("GOOGLE_CALENDAR_CLIENT_SECRET", "")
+GOOGLE_CALENDAR_REFRESH_TOKEN = os.environ.get("GOOGLE_CALENDAR_REFRESH_TOKEN", "")
+
 CSRF_TRUSTED_ORIGINS = []
 if VITE_DEV_SERVER:
     server = VITE_DEV_SERVER.rstrip("/")
@@ -2,9 +2,13 @@ from django.contrib import admin
 from django.urls import include, path, re_path
 
 from frontend import views as frontend_views
+from trainings import views as training_views
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("api.urls")),
+    path(
+        "feeds/trainer/<str:token>.ics", training_views.trainer_feed, name="trainer_feed"
+    ),
     re_path(r"^.*$", frontend_views.spa),
 ]
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class TrainingsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "trainings"
+
+    def ready(self) -> None:
+        from core import changelog
+
+        from . import signals  # noqa: F401
+        from .models import Training, TrainingType
+
+        changelog.register(Training, "training")
+        changelog.register(TrainingType, "training_type")
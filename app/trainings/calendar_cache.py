@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import time
+from datetime import date, timedelta
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
+
+from django.core.cache import cache
+
+
+MONTH = "month"
+WEEK = "week"
+SCOPES = (MONTH, WEEK)
+# Each period is cached once per consumer: the JSON API (as an encoded body)
+# and the template views.
+VARIANTS = ("api-json", "template")
+CACHE_TIMEOUT = 60 * 60
+
+_GENERATION_KEY = "calendar:generation"
+
+T = TypeVar("T")
+
+
+def month_period(year: int, month: int) -> str:
+    return f"{year:04d}-{month:02d}"
+
+
+def week_period(week_start: date) -> str:
+    return week_start.isoformat()
+
+
+def _periods_for(day: date) -> list[tuple[str, str]]:
+    week_start = day - timedelta(days=day.weekday())
+    return [(MONTH, month_period(day.year, day.month)), (WEEK, week_period(week_start))]
+
+
+def _version_key(scope: str, period: str) -> str:
+    return f"calendar:version:{scope}:{period}"
+
+
+def _fresh_counter() -> int:
+    # A counter that was evicted restarts from the clock, never at a value it
+    # had before, so payloads stored under an old value are not served again.
+    return time.time_ns()
+
+
+def _counters(keys: list[str]) -> list[int]:
+    """Current values of version counters; missing ones start from the clock."""
+    values = cache.get_many(keys)
+    missing = {key: _fresh_counter() for key in keys if key not in values}
+    if missing:
+        for key, value in missing.items():
+            cache.add(key, value, timeout=None)
+        stored = cache.get_many(list(missing))
+        values.update({key: stored.get(key, value) for key, value in missing.items()})
+    return [values[key] for key in keys]
+
+
+def _versions(scope: str, period: str) -> tuple[int, int]:
+    generation, version = _counters([_GENERATION_KEY, _version_key(scope, period)])
+    return generation, version
+
+
+async def aversions(scope: str, period: str) -> tuple[int, int]:
+    """The versions a period's payloads are cached under now; part of its ETag."""
+    keys = [_GENERATION_KEY, _version_key(scope, period)]
+    values = await cache.aget_many(keys)
+    missing = {key: _fresh_counter() for key in keys if key not in values}
+    if missing:
+        for key, value in missing.items():
+            await cache.aadd(key, value, timeout=None)
+        stored = await cache.aget_many(list(missing))
+        values.update({key: stored.get(key, value) for key, value in missing.items()})
+    return values[keys[0]], values[keys[1]]
+
+
+def _key(versions: tuple[int, int], scope: str, period: str, variant: str) -> str:
+    generation, version = versions
+    return f"calendar:{generation}:{version}:{scope}:{period}:{variant}"
+
+
+def _bump(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _fresh_counter(), timeout=None)
+
+
+def _count(scope: str, outcome: str) -> None:
+    key = f"calendar:stats:{scope}:{outcome}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+async def _acount(scope: str, outcome: str) -> None:
+    key = f"calendar:stats:{scope}:{outcome}"
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        if not await cache.aadd(key, 1, timeout=None):
+            await cache.aincr(key)
+
+
+def cached_payload(scope: str, period: str, variant: str, build: Callable[[], T]) -> T:
+    """Return the cached payload for a calendar period, building it on a miss."""
+    key = _key(_versions(scope, period), scope, period, variant)
+    payload = cache.get(key)
+    if payload is not None:
+        _count(scope, "hits")
+        return payload
+    _count(scope, "misses")
+    payload = build()
+    # Stored under the versions read before the build. If a write invalidated
+    # the period meanwhile, readers have moved to the new version, and this
+    # payload, which may predate the write, is never served.
+    cache.set(key, payload, CACHE_TIMEOUT)
+    return payload
+
+
+async def acached_payload(
+    scope: str, period: str, variant: str, build: Callable[[], Awaitable[T]]
+) -> T:
+    """Async version of ``cached_payload`` for async views."""
+    key = _key(await aversions(scope, period), scope, period, variant)
+    payload = await cache.aget(key)
+    if payload is not None:
+        await _acount(scope, "hits")
+        return payload
+    await _acount(scope, "misses")
+    payload = await build()
+    await cache.aset(key, payload, CACHE_TIMEOUT)
+    return payload
+
+
+def invalidate_dates(days: Iterable[date]) -> None:
+    """Stop serving the cached month and week payloads that contain any of ``days``."""
+    periods = {period for day in days if day is not None for period in _periods_for(day)}
+    for scope, period in periods:
+        _bump(_version_key(scope, period))
+
+
+def invalidate_all() -> None:
+    """Invalidate every cached period, e.g. after a training type is renamed."""
+    _bump(_GENERATION_KEY)
+
+
+def cache_stats() -> dict[str, dict[str, Any]]:
+    keys = [
+        f"calendar:stats:{scope}:{outcome}" for scope in SCOPES for outcome in ("hits", "misses")
+    ]
+    values = cache.get_many(keys)
+    stats: dict[str, dict[str, Any]] = {}
+    for scope in SCOPES:
+        hits = values.get(f"calendar:stats:{scope}:hits", 0)
+        misses = values.get(f"calendar:stats:{scope}:misses", 0)
+        total = hits + misses
+        stats[scope] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else None,
+        }
+    return stats
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from trainers.models import Trainer
+
+from . import ical
+from .calendar_cache import _bump, _counters
+from .models import Training
+
+
+# Past assignments kept in the feed; everything upcoming is always included.
+FEED_PAST_DAYS = 90
+FEED_TIMEOUT = 24 * 60 * 60
+# How long calendar clients may reuse a feed without revalidating it.
+FEED_MAX_AGE = 5 * 60
+
+_GENERATION_KEY = "trainer_feed:generation"
+
+
+@dataclass(frozen=True)
+class TrainerFeed:
+    body: str
+    etag: str
+    last_modified: datetime
+
+
+def _version_key(token: str) -> str:
+    return f"trainer_feed:version:{token}"
+
+
+def _key(token: str) -> str:
+    generation, version = _counters([_GENERATION_KEY, _version_key(token)])
+    return f"trainer_feed:{generation}:{version}:{token}"
+
+
+def _build(trainer_id: int, name: str) -> TrainerFeed:
+    since = timezone.localdate() - timedelta(days=FEED_PAST_DAYS)
+    rows = (
+        Training.objects.filter(assigned_trainer_id=trainer_id, start_date__gte=since)
+        .order_by("start_datetime", "id")
+        .values(*ical.EVENT_FIELDS)
+    )
+    body = "".join(ical.iter_calendar(iter(rows), name=name))
+    return TrainerFeed(
+        body=body,
+        etag=hashlib.sha1(body.encode("utf-8")).hexdigest(),
+        # The feed only changes when it is rebuilt, so build time is its Last-Modified.
+        last_modified=timezone.now().replace(microsecond=0),
+    )
+
+
+def trainer_feed(token: str) -> Optional[TrainerFeed]:
+    """Return the cached feed for a feed token, building it only after an invalidation."""
+    key = _key(token)
+    feed = cache.get(key)
+    if feed is not None:
+        return feed
+    trainer = Trainer.objects.filter(feed_token=token).values_list("id", "name").first()
+    if trainer is None:
+        return None
+    feed = _build(*trainer)
+    # Stored under the versions read before the build: a feed invalidated
+    # meanwhile is kept under a version no reader asks for any more.
+    cache.set(key, feed, FEED_TIMEOUT)
+    return feed
+
+
+def invalidate_trainers(trainer_ids: Iterable[Optional[int]]) -> None:
+    """Drop the feeds of the given trainers; every other trainer's feed stays cached."""
+    ids = {trainer_id for trainer_id in trainer_ids if trainer_id is not None}
+    if not ids:
+        return
+    invalidate_tokens(Trainer.objects.filter(id__in=ids).values_list("feed_token", flat=True))
+
+
+def invalidate_tokens(tokens: Iterable[str]) -> None:
+    for token in tokens:
+        _bump(_version_key(token))
+
+
+def invalidate_all() -> None:
+    _bump(_GENERATION_KEY)
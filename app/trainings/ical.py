@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Iterator, Optional
+
+from .models import TrainingStatus
+
+
+PRODID = "-//training_planner//trainings//CS"
+CONTENT_TYPE = "text/calendar; charset=utf-8"
+
+_STATUSES = {
+    TrainingStatus.CONFIRMED: "CONFIRMED",
+    TrainingStatus.CANCELED: "CANCELLED",
+}
+
+# Fields an event is built from, for ``values()`` querysets.
+EVENT_FIELDS = (
+    "id",
+    "training_type__name",
+    "customer_name",
+    "address",
+    "lat",
+    "lng",
+    "start_datetime",
+    "end_datetime",
+    "status",
+    "assigned_trainer__name",
+    "notes",
+    "updated_at",
+)
+
+
+def escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line: str) -> str:
+    """Fold a content line to 75 octets as RFC 5545 requires, without splitting characters."""
+    if len(line.encode("utf-8")) <= 75:
+        return line + "\r\n"
+    parts = []
+    current = ""
+    limit = 75
+    for char in line:
+        if len((current + char).encode("utf-8")) > limit:
+            parts.append(current)
+            current = ""
+            limit = 74  # continuation lines start with a space
+        current += char
+    parts.append(current)
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _utc(value: datetime) -> str:
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def calendar_start(name: Optional[str] = None) -> str:
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN"]
+    if name:
+        lines.append(f"X-WR-CALNAME:{escape_text(name)}")
+    return "".join(fold(line) for line in lines)
+
+
+def calendar_end() -> str:
+    return "END:VCALENDAR\r\n"
+
+
+def event(row: dict[str, Any]) -> str:
+    """Render one VEVENT from a ``values(*EVENT_FIELDS)`` row."""
+    summary = row["training_type__name"]
+    if row["customer_name"]:
+        summary = f"{summary} – {row['customer_name']}"
+    description = []
+    if row["assigned_trainer__name"]:
+        description.append(f"Trainer: {row['assigned_trainer__name']}")
+    if row["notes"]:
+        description.append(row["notes"])
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:training-{row['id']}@training-planner",
+        f"DTSTAMP:{_utc(row['updated_at'])}",
+        f"LAST-MODIFIED:{_utc(row['updated_at'])}",
+        f"DTSTART:{_utc(row['start_datetime'])}",
+        f"DTEND:{_utc(row['end_datetime'])}",
+        f"SUMMARY:{escape_text(summary)}",
+        f"LOCATION:{escape_text(row['address'])}",
+        f"STATUS:{_STATUSES.get(row['status'], 'TENTATIVE')}",
+    ]
+    if row["lat"] is not None and row["lng"] is not None:
+        lines.append(f"GEO:{row['lat']:.6f};{row['lng']:.6f}")
+    if description:
+        lines.append(f"DESCRIPTION:{escape_text(chr(10).join(description))}")
+    lines.append("END:VEVENT")
+    return "".join(fold(line) for line in lines)
+
+
+def iter_calendar(rows: Iterator[dict[str, Any]], name: Optional[str] = None) -> Iterator[str]:
+    yield calendar_start(name)
+    for row in rows:
+        yield event(row)
+    yield calendar_end()
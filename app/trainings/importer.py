@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Optional, TextIO
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from calendar_sync import tracking as calendar_tracking
+from core import changelog
+from geocoding.services import geocode_address
+from trainers.models import Trainer
+
+from . import calendar_cache, feeds
+from .models import Training, TrainingStatus, TrainingType, local_start_date
+from .services import publish_training_change
+
+
+FORMATS = ("csv", "json", "ndjson")
+DEFAULT_BATCH_SIZE = 1000
+_JSON_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    # Imported trainings still lacking coordinates, grouped by address.
+    pending: dict[str, list[int]] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class MalformedRow:
+    """Placeholder for an NDJSON line that failed to parse, reported as a row error."""
+
+    message: str
+
+
+@dataclass(frozen=True)
+class GeocodingPassResult:
+    resolved: int
+    unresolved: list[str]
+
+
+def iter_records(stream: TextIO, fmt: str) -> Iterator[dict[str, Any]]:
+    """Yield raw row dicts from a CSV, JSON array or NDJSON text stream."""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    elif fmt == "ndjson":
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield MalformedRow(f"Invalid JSON: {exc}")
+    elif fmt == "json":
+        yield from _iter_json_array(stream)
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def _iter_json_array(stream: TextIO) -> Iterator[Any]:
+    """Decode the items of a top-level JSON array without loading the whole document."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+    exhausted = False
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if not started and position < len(buffer):
+            if buffer[position] != "[":
+                raise ValueError("Expected a JSON array of objects.")
+            started = True
+            position += 1
+            continue
+        if started and position < len(buffer) and buffer[position] == "]":
+            return
+        try:
+            if position >= len(buffer):
+                raise json.JSONDecodeError("Need more data", buffer, position)
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if exhausted:
+                raise ValueError("Invalid JSON payload.") from None
+            chunk = stream.read(_JSON_CHUNK_SIZE)
+            buffer = buffer[position:] + chunk
+            position = 0
+            exhausted = not chunk
+            continue
+        yield item
+        position = end
+
+
+class _RowValidator:
+    """Validate import rows against lookups loaded once per import, not per row."""
+
+    def __init__(self) -> None:
+        types = TrainingType.objects.values_list("id", "name")
+        self.type_ids = {type_id for type_id, _ in types}
+        self.type_names = {name.casefold(): type_id for type_id, name in types}
+        self.trainer_ids = set(Trainer.objects.values_list("id", flat=True))
+        self.statuses = set(TrainingStatus.values)
+
+    def build(self, record: Any) -> tuple[Optional[Training], dict[str, list[str]]]:
+        errors: dict[str, list[str]] = {}
+        if isinstance(record, MalformedRow):
+            return None, {"__all__": [record.message]}
+        if not isinstance(record, dict):
+            return None, {"__all__": ["Row must be an object."]}
+
+        def text(name: str, max_length: int, required: bool = False) -> str:
+            value = record.get(name)
+            value = "" if value is None else str(value).strip()
+            if required and not value:
+                errors.setdefault(name, []).append("This field is required.")
+            elif len(value) > max_length:
+                errors.setdefault(name, []).append(
+                    f"Ensure this value has at most {max_length} characters."
+                )
+            return value
+
+        def number(name: str) -> Optional[float]:
+            value = record.get(name)
+            if value in (None, ""):
+                return None
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                errors.setdefault(name, []).append("Enter a number.")
+                return None
+
+        def moment(name: str) -> Optional[datetime]:
+            value = record.get(name)
+            parsed = None
+            if value not in (None, ""):
+                try:
+                    parsed = parse_datetime(str(value).strip())
+                except ValueError:
+                    parsed = None
+            if parsed is None:
+                errors.setdefault(name, []).append("Enter a valid date/time.")
+                return None
+            if timezone.is_naive(parsed):
+                parsed = timezone.make_aware(parsed)
+            return parsed
+
+        training_type_id = self._training_type_id(record.get("training_type"))
+        if training_type_id is None:
+            errors.setdefault("training_type", []).append("Unknown training type.")
+        trainer_id = record.get("assigned_trainer")
+        if trainer_id in (None, ""):
+            trainer_id = None
+        else:
+            try:
+                trainer_id = int(trainer_id)
+            except (TypeError, ValueError):
+                trainer_id = -1
+            if trainer_id not in self.trainer_ids:
+                errors.setdefault("assigned_trainer", []).append("Unknown trainer.")
+        status = text("status", 20) or TrainingStatus.WAITING
+        if status not in self.statuses:
+            errors.setdefault("status", []).append(f"Invalid status: {status}.")
+        start = moment("start_datetime")
+        end = moment("end_datetime")
+        if start and end and end <= start:
+            errors.setdefault("end_datetime", []).append("End must be after start.")
+        training = Training(
+            training_type_id=training_type_id,
+            customer_name=text("customer_name", 200),
+            address=text("address", 255, required=True),
+            lat=number("lat"),
+            lng=number("lng"),
+            start_datetime=start,
+            end_datetime=end,
+            status=status,
+            assigned_trainer_id=trainer_id,
+            assignment_reason=text("assignment_reason", 10_000),
+            notes=text("notes", 10_000),
+        )
+        if errors:
+            return None, errors
+        training.start_date = local_start_date(start)
+        return training, {}
+
+    def _training_type_id(self, value: Any) -> Optional[int]:
+        if value in (None, ""):
+            return None
+        try:
+            type_id = int(value)
+        except (TypeError, ValueError):
+            return self.type_names.get(str(value).strip().casefold())
+        return type_id if type_id in self.type_ids else None
+
+
+def import_trainings(
+    records: Iterable[Any], batch_size: int = DEFAULT_BATCH_SIZE
+) -> ImportResult:
+    """Validate and insert trainings in chunks, each chunk in its own transaction.
+
+    Invalid rows are reported (1-based row numbers) and skipped; valid rows
+    are inserted with ``bulk_create``. Geocoding is left to a single pass over
+    the distinct addresses afterwards (see ``geocode_pending``).
+    """
+    validator = _RowValidator()
+    result = ImportResult()
+    batch: list[Training] = []
+    row_number = 0
+    try:
+        for row_number, record in enumerate(records, start=1):
+            training, errors = validator.build(record)
+            if errors:
+                result.errors.append({"row": row_number, "errors": errors})
+                continue
+            batch.append(training)
+            if len(batch) >= batch_size:
+                _insert(batch, result)
+    except (ValueError, csv.Error) as exc:
+        result.errors.append({"row": row_number + 1, "errors": {"__all__": [str(exc)]}})
+    _insert(batch, result)
+    return result
+
+
+def _insert(batch: list[Training], result: ImportResult) -> None:
+    if not batch:
+        return
+    with transaction.atomic():
+        Training.objects.bulk_create(batch)
+        changelog.record("training", [training.pk for training in batch])
+    # bulk_create skips model signals, so drop the affected calendar periods and feeds here.
+    calendar_cache.invalidate_dates({training.start_date for training in batch})
+    feeds.invalidate_trainers({training.assigned_trainer_id for training in batch})
+    publish_training_change(
+        None,
+        {training.start_date for training in batch},
+        {training.assigned_trainer_id for training in batch},
+    )
+    calendar_tracking.mark_dirty(
+        training.pk for training in batch if training.status in calendar_tracking.SYNCED_STATUSES
+    )
+    result.created += len(batch)
+    for training in batch:
+        if training.lat is None or training.lng is None:
+            result.pending.setdefault(training.address, []).append(training.pk)
+    batch.clear()
+
+
+def pending_geocoding() -> dict[str, list[int]]:
+    """Group every training without coordinates by address."""
+    pending: dict[str, list[int]] = {}
+    rows = Training.objects.filter(lat__isnull=True).values_list("address", "id")
+    for address, training_id in rows.iterator(chunk_size=2000):
+        pending.setdefault(address, []).append(training_id)
+    return pending
+
+
+def geocode_pending(pending: dict[str, list[int]], online: bool = True) -> GeocodingPassResult:
+    """Geocode each distinct address once and fill every training that uses it."""
+    resolved = 0
+    unresolved: list[str] = []
+    for address in sorted(pending):
+        geo = geocode_address(address, online=online)
+        if geo is None:
+            unresolved.append(address)
+            continue
+        ids = pending[address]
+        for start in range(0, len(ids), DEFAULT_BATCH_SIZE):
+            chunk = ids[start : start + DEFAULT_BATCH_SIZE]
+            with transaction.atomic():
+                updated = list(
+                    Training.objects.select_for_update()
+                    .filter(id__in=chunk, lat__isnull=True)
+                    .values_list("id", flat=True)
+                )
+                resolved += Training.objects.filter(id__in=updated).update(
+                    lat=geo.lat, lng=geo.lng, updated_at=timezone.now(), version=F("version") + 1
+                )
+                changelog.record("training", updated)
+    return GeocodingPassResult(resolved=resolved, unresolved=unresolved)
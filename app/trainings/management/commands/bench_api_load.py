@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import json
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Callable, Optional
+
+import httpx
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.utils import timezone
+
+from core import changelog
+from trainers.models import Trainer
+from trainings import calendar_cache
+from trainings.models import Training, TrainingType
+from trainings.seeding import seed
+
+ENDPOINTS = ("trainings", "training_detail", "calendar_month", "calendar_week", "trainer_detail")
+DEFAULT_MIX = "trainings=35,training_detail=20,calendar_month=15,calendar_week=15,trainer_detail=15"
+# Fixed, so runs against the same dataset options request the same pages.
+FIRST_DAY = date(2031, 3, 3)
+
+
+def _parse_mix(value: str) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise CommandError(f"Unknown endpoint {name!r}; use {', '.join(ENDPOINTS)}.")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise CommandError(f"Weight of {name} must be a number.") from None
+    if not mix or sum(mix.values()) <= 0:
+        raise CommandError("The mix needs at least one endpoint with a positive weight.")
+    return mix
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted ``values``."""
+    return values[max(0, math.ceil(len(values) * percent / 100) - 1)]
+
+
+def _change(new: float, old: float) -> str:
+    if not old:
+        return ""
+    return f"{(new - old) / old * 100:+.0f}%"
+
+
+class _Dataset:
+    def __init__(self, marker: str, months: int) -> None:
+        self.marker = marker
+        self.months = months
+        self.training_ids = list(
+            Training.objects.filter(customer_name__startswith=f"{marker} ").values_list(
+                "id", flat=True
+            )
+        )
+        self.trainer_ids = list(
+            Trainer.objects.filter(name__startswith=f"{marker} ").values_list("id", flat=True)
+        )
+        self.type_ids = list(
+            TrainingType.objects.filter(name__startswith=f"{marker} ").values_list(
+                "id", flat=True
+            )
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.training_ids and self.trainer_ids)
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the planner's API on a seeded dataset: a weighted mix of the training "
+        "list, training detail (with recommendations), month and week calendars and "
+        "trainer detail. Reports p50/p95/p99 latency and throughput per endpoint; "
+        "--output and --compare keep runs comparable across releases."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--trainers", type=int, default=50)
+        parser.add_argument(
+            "--trainings", type=int, default=None, help="Default: 12 per trainer."
+        )
+        parser.add_argument("--months", type=int, default=3)
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument(
+            "--warmup", type=int, default=100, help="Requests sent first and not measured."
+        )
+        parser.add_argument("--concurrency", type=int, default=4, help="Client threads.")
+        parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint=weight, comma separated.")
+        parser.add_argument(
+            "--url",
+            default="",
+            help="Base URL of a running server on the same database; default: in-process "
+            "test client.",
+        )
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the dataset; later runs with the same dataset options reuse it.",
+        )
+        parser.add_argument("--label", default="", help="Name of the run, e.g. the release.")
+        parser.add_argument("--output", default="", help="Write the results to this JSON file.")
+        parser.add_argument("--compare", default="", help="Results JSON of an earlier run.")
+
+    def handle(self, *args, **options) -> None:
+        mix = _parse_mix(options["mix"])
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"]) as handle:
+                baseline = json.load(handle)
+        trainings = options["trainings"] or options["trainers"] * 12
+        marker = (
+            f"bench-load-{options['trainers']}-{trainings}-{options['months']}-{options['seed']}"
+        )
+        dataset = _Dataset(marker, options["months"])
+        created = not dataset
+        if created:
+            started = time.perf_counter()
+            with transaction.atomic():
+                seed(
+                    options["trainers"],
+                    trainings,
+                    FIRST_DAY,
+                    months=options["months"],
+                    marker=marker,
+                    random_seed=options["seed"],
+                )
+            # Seeding skips the signals; drop calendars cached before it.
+            calendar_cache.invalidate_all()
+            dataset = _Dataset(marker, options["months"])
+            self.stdout.write(
+                f"Seeded {marker} in {time.perf_counter() - started:.1f}s: "
+                f"{len(dataset.trainer_ids)} trainers, {len(dataset.training_ids)} trainings."
+            )
+        else:
+            self.stdout.write(f"Reusing {marker}.")
+
+        try:
+            rng = random.Random(options["seed"])
+            warmup = [self._request(rng, mix, dataset) for _ in range(options["warmup"])]
+            plan = [self._request(rng, mix, dataset) for _ in range(options["requests"])]
+            user, _ = get_user_model().objects.get_or_create(username="bench-load")
+            login = Client(HTTP_HOST="localhost")
+            login.force_login(user)
+            session = login.cookies[settings.SESSION_COOKIE_NAME].value
+            call = self._http_call if options["url"] else self._client_call
+            send = call(options["url"], session)
+            self._run(send, warmup, options["concurrency"])
+            elapsed, results = self._run(send, plan, options["concurrency"])
+        finally:
+            if created and not options["keep"]:
+                self._delete(marker)
+
+        report = self._summary(elapsed, results, options, trainings)
+        self._print(report, baseline)
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(f"Wrote {options['output']}.")
+
+    def _request(self, rng: random.Random, mix: dict[str, float], dataset: _Dataset):
+        name = rng.choices(list(mix), list(mix.values()))[0]
+        day = FIRST_DAY + timedelta(days=rng.randrange(dataset.months * 30))
+        if name == "trainings":
+            query = rng.choice(
+                [
+                    "",
+                    "&status=assigned",
+                    "&no_trainer=1",
+                    f"&start_date={day.isoformat()}&end_date={day + timedelta(days=14)}",
+                    f"&training_type={rng.choice(dataset.type_ids)}",
+                ]
+            )
+            return name, f"/api/trainings/?page_size=50{query}"
+        if name == "training_detail":
+            return name, f"/api/trainings/{rng.choice(dataset.training_ids)}/"
+        if name == "calendar_month":
+            return name, f"/api/calendar/month/?year={day.year}&month={day.month}"
+        if name == "calendar_week":
+            return name, f"/api/calendar/week/?date={day.isoformat()}"
+        return name, f"/api/trainers/{rng.choice(dataset.trainer_ids)}/"
+
+    def _client_call(self, url: str, session: str) -> Callable[[str], int]:
+        local = threading.local()
+
+        def send(path: str) -> int:
+            if not hasattr(local, "client"):
+                local.client = Client(HTTP_HOST="localhost")
+                local.client.cookies[settings.SESSION_COOKIE_NAME] = session
+            return local.client.get(path).status_code
+
+        return send
+
+    def _http_call(self, url: str, session: str) -> Callable[[str], int]:
+        local = threading.local()
+
+        def send(path: str) -> int:
+            if not hasattr(local, "client"):
+                local.client = httpx.Client(
+                    base_url=url, cookies={settings.SESSION_COOKIE_NAME: session}, timeout=60
+                )
+            return local.client.get(path).status_code
+
+        return send
+
+    def _run(
+        self, send: Callable[[str], int], plan: list[tuple[str, str]], concurrency: int
+    ) -> tuple[float, list[tuple[str, float, bool]]]:
+        def call(item: tuple[str, str]) -> tuple[str, float, bool]:
+            name, path = item
+            started = time.perf_counter()
+            status = send(path)
+            return name, time.perf_counter() - started, status < 400
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(call, plan))
+        return time.perf_counter() - started, results
+
+    def _summary(self, elapsed: float, results, options, trainings: int) -> dict[str, Any]:
+        latencies: dict[str, list[float]] = {}
+        errors: dict[str, int] = {}
+        for name, seconds, ok in results:
+            latencies.setdefault(name, []).append(seconds * 1000)
+            errors[name] = errors.get(name, 0) + (not ok)
+        endpoints = {}
+        for name in ENDPOINTS:
+            values = sorted(latencies.get(name, []))
+            if not values:
+                continue
+            endpoints[name] = {
+                "requests": len(values),
+                "errors": errors[name],
+                "p50_ms": round(_percentile(values, 50), 2),
+                "p95_ms": round(_percentile(values, 95), 2),
+                "p99_ms": round(_percentile(values, 99), 2),
+                "max_ms": round(values[-1], 2),
+                "throughput": round(len(values) / elapsed, 2),
+            }
+        return {
+            "label": options["label"],
+            "finished_at": timezone.now().isoformat(),
+            "target": options["url"] or "test client",
+            "database": connection.vendor,
+            "debug": settings.DEBUG,
+            "dataset": {
+                "trainers": options["trainers"],
+                "trainings": trainings,
+                "months": options["months"],
+                "seed": options["seed"],
+            },
+            "concurrency": options["concurrency"],
+            "mix": options["mix"],
+            "requests": len(results),
+            "elapsed_s": round(elapsed, 3),
+            "throughput": round(len(results) / elapsed, 2),
+            "endpoints": endpoints,
+        }
+
+    def _print(self, report: dict[str, Any], baseline: Optional[dict[str, Any]]) -> None:
+        self.stdout.write(
+            f"{report['requests']} requests in {report['elapsed_s']:.2f}s = "
+            f"{report['throughput']:.1f} req/s ({report['target']}, {report['database']}, "
+            f"{report['concurrency']} threads)"
+            + (f"  vs {_change(report['throughput'], baseline['throughput'])}" if baseline else "")
+        )
+        self.stdout.write(
+            f"  {'endpoint':<16} {'n':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} "
+            f"{'p99 ms':>9} {'req/s':>8}"
+        )
+        for name, stats in report["endpoints"].items():
+            self.stdout.write(
+                f"  {name:<16} {stats['requests']:>6} {stats['errors']:>4} "
+                f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} "
+                f"{stats['throughput']:>8.1f}"
+            )
+            old = (baseline or {}).get("endpoints", {}).get(name)
+            if old:
+                self.stdout.write(
+                    f"  {'':<16} {'':>6} {'':>4} {_change(stats['p50_ms'], old['p50_ms']):>9} "
+                    f"{_change(stats['p95_ms'], old['p95_ms']):>9} "
+                    f"{_change(stats['p99_ms'], old['p99_ms']):>9} "
+                    f"{_change(stats['throughput'], old['throughput']):>8}"
+                )
+        if baseline and baseline.get("dataset") != report["dataset"]:
+            self.stdout.write(self.style.WARNING("The baseline used another dataset."))
+
+    def _delete(self, marker: str) -> None:
+        # Through the ORM, so caches, feeds and the change log hear of it.
+        with transaction.atomic(), changelog.batch():
+            Training.objects.filter(customer_name__startswith=f"{marker} ").delete()
+            Trainer.objects.filter(name__startswith=f"{marker} ").delete()
+            TrainingType.objects.filter(name__startswith=f"{marker} ").delete()
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import calendar
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.http import JsonResponse
+from django.utils import timezone
+
+from api import serializers
+from api.views import _calendar_month_payload, _calendar_rows
+from trainers.models import Trainer
+from trainings.models import Training, TrainingStatus, TrainingType, local_start_date
+from trainings.services import TRAINING_LIST_ORDERING, month_bounds
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _legacy_list_item(training: Training) -> dict[str, Any]:
+    assigned_trainer = (
+        {"id": training.assigned_trainer.id, "name": training.assigned_trainer.name}
+        if training.assigned_trainer_id
+        else None
+    )
+    return {
+        "id": training.id,
+        "training_type": {"id": training.training_type.id, "name": training.training_type.name},
+        "customer_name": training.customer_name,
+        "address": training.address,
+        "start_datetime": training.start_datetime.isoformat(),
+        "end_datetime": training.end_datetime.isoformat(),
+        "status": training.status,
+        "status_label": training.get_status_display(),
+        "assigned_trainer": assigned_trainer,
+    }
+
+
+def _legacy_month_payload(year: int, month: int) -> dict[str, Any]:
+    month_days = list(calendar.Calendar(firstweekday=0).itermonthdates(year, month))
+    trainings = (
+        Training.objects.filter(start_date__range=month_bounds(year, month))
+        .select_related("training_type", "assigned_trainer")
+        .order_by("start_datetime", "id")
+    )
+    trainings_by_day: dict[date, list[Training]] = {}
+    for training in trainings:
+        trainings_by_day.setdefault(training.start_date, []).append(training)
+    weeks = []
+    for i in range(0, len(month_days), 7):
+        weeks.append(
+            [
+                {
+                    "date": day.isoformat(),
+                    "in_month": day.month == month,
+                    "trainings": [
+                        {
+                            "id": item.id,
+                            "label": item.training_type.name,
+                            "customer_name": item.customer_name,
+                            "status": item.status,
+                            "status_label": item.get_status_display(),
+                            "start_time": item.start_datetime.strftime("%H:%M"),
+                            "address": item.address,
+                        }
+                        for item in trainings_by_day.get(day, [])
+                    ],
+                }
+                for day in month_days[i : i + 7]
+            ]
+        )
+    prev_year, prev_month = (year, month - 1) if month > 1 else (year - 1, 12)
+    next_year, next_month = (year, month + 1) if month < 12 else (year + 1, 1)
+    return {
+        "month": month,
+        "year": year,
+        "month_name": calendar.month_name[month],
+        "weeks": weeks,
+        "prev_month": prev_month,
+        "prev_year": prev_year,
+        "next_month": next_month,
+        "next_year": next_year,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare API payloads built from model instances and encoded by JsonResponse "
+        "against the values()-based serializers. Seeds data in a transaction that is "
+        "rolled back."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--rows", type=int, default=24_000)
+        parser.add_argument("--trainers", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options) -> None:
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _run(self, options) -> None:
+        rng = random.Random(options["seed"])
+        training_types = TrainingType.objects.bulk_create(
+            [TrainingType(name=f"bench-{time.time_ns()}-{i}") for i in range(5)]
+        )
+        trainers = Trainer.objects.bulk_create(
+            [Trainer(name=f"Bench {i}", home_address="Praha") for i in range(options["trainers"])]
+        )
+        origin = timezone.make_aware(datetime(2031, 1, 1, 6, 0))
+        batch = []
+        for i in range(options["rows"]):
+            start = origin + timedelta(minutes=15 * rng.randrange(365 * 96))
+            batch.append(
+                Training(
+                    training_type=rng.choice(training_types),
+                    customer_name=f"Customer {i}",
+                    address=f"Street {i}, Brno",
+                    start_datetime=start,
+                    end_datetime=start + timedelta(hours=2),
+                    start_date=local_start_date(start),
+                    status=rng.choice(TrainingStatus.values),
+                    assigned_trainer=rng.choice([*trainers, None]),
+                )
+            )
+        Training.objects.bulk_create(batch, batch_size=5000)
+
+        year, month = 2031, 6
+        today = date(year, month, 15).isoformat()
+        trainings = Training.objects.order_by(*TRAINING_LIST_ORDERING)
+        cached_payload = _calendar_month_payload(
+            year, month, list(_calendar_rows(*month_bounds(year, month)))
+        )
+        cached_body = serializers.encode(cached_payload)
+        cases: list[tuple[str, Callable[[], bytes], Callable[[], bytes]]] = [
+            (
+                "list 100 items",
+                lambda: JsonResponse(
+                    {
+                        "items": [
+                            _legacy_list_item(item)
+                            for item in trainings.select_related(
+                                "training_type", "assigned_trainer"
+                            )[:100]
+                        ]
+                    }
+                ).content,
+                lambda: serializers.ApiJsonResponse(
+                    {
+                        "items": [
+                            serializers.training_list_item(row)
+                            for row in serializers.training_rows(trainings)[:100]
+                        ]
+                    }
+                ).content,
+            ),
+            (
+                "calendar month",
+                lambda: JsonResponse(
+                    {**_legacy_month_payload(year, month), "today": today}
+                ).content,
+                lambda: serializers.ApiJsonResponse(
+                    encoded=serializers.with_member(
+                        serializers.encode(
+                            _calendar_month_payload(
+                                year, month, list(_calendar_rows(*month_bounds(year, month)))
+                            )
+                        ),
+                        "today",
+                        today,
+                    )
+                ).content,
+            ),
+            (
+                "calendar month hit",
+                lambda: JsonResponse({**cached_payload, "today": today}).content,
+                lambda: serializers.ApiJsonResponse(
+                    encoded=serializers.with_member(cached_body, "today", today)
+                ).content,
+            ),
+        ]
+        for label, legacy, fast in cases:
+            if legacy() != fast():
+                self.stderr.write(f"{label}: response bodies differ")
+            legacy_ms = self._time(legacy, options["repeat"])
+            fast_ms = self._time(fast, options["repeat"])
+            self.stdout.write(
+                f"{label:<20} instances+JsonResponse {legacy_ms:8.2f} ms   "
+                f"serializers {fast_ms:8.2f} ms   x{legacy_ms / fast_ms:.1f}"
+            )
+
+    def _time(self, build: Callable[[], bytes], repeat: int) -> float:
+        build()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            build()
+        return (time.perf_counter() - started) * 1000 / repeat
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+import httpx
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.utils import timezone
+
+from trainers.models import Trainer
+from trainings.models import Training, TrainingType
+
+
+CUSTOMER_MARKER = "bench-asgi-concurrency"
+
+
+def _slow_geocoder(delay: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            time.sleep(delay)
+            body = json.dumps([{"lat": "49.1951", "lon": "16.6068"}]).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class _ThreadSampler:
+    """Track the peak number of live threads while a run is in progress."""
+
+    def __init__(self) -> None:
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def __enter__(self) -> "_ThreadSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(0.01):
+            self.peak = max(self.peak, threading.active_count())
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the read API and training creation with a slow geocoding service, "
+        "in one process: a thread-per-request worker (like WSGI with a fixed thread "
+        "pool) against the ASGI application. Trainings it creates are deleted afterwards."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--requests", type=int, default=400)
+        parser.add_argument("--concurrency", type=int, default=64)
+        parser.add_argument(
+            "--threads", type=int, default=8, help="Worker threads of the WSGI-style run."
+        )
+        parser.add_argument(
+            "--geocode-delay", type=float, default=0.5, help="Geocoder latency in seconds."
+        )
+        parser.add_argument(
+            "--write-ratio", type=float, default=0.1, help="Share of geocoded creates."
+        )
+        parser.add_argument("--mode", choices=("both", "threads", "asgi"), default="both")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options) -> None:
+        training_type = TrainingType.objects.order_by("id").first()
+        trainer = Trainer.objects.order_by("id").first()
+        sample = Training.objects.order_by("-start_date").first()
+        if training_type is None or trainer is None or sample is None:
+            raise CommandError("Needs at least one training type, trainer and training.")
+        user, _ = get_user_model().objects.get_or_create(username="bench-asgi")
+        geocoder = _slow_geocoder(options["geocode_delay"])
+        previous_url = os.environ.get("GEOCODING_URL")
+        os.environ["GEOCODING_URL"] = f"http://127.0.0.1:{geocoder.server_address[1]}/search"
+        try:
+            plan = self._plan(options, training_type, trainer, sample)
+            if options["mode"] in ("both", "threads"):
+                self._report("threads", options, *self._run_threads(plan, user, options))
+            if options["mode"] in ("both", "asgi"):
+                login = Client(HTTP_HOST="localhost")
+                login.force_login(user)
+                session = login.cookies[settings.SESSION_COOKIE_NAME].value
+                self._report("asgi", options, *asyncio.run(self._run_asgi(plan, session, options)))
+        finally:
+            geocoder.shutdown()
+            if previous_url is None:
+                os.environ.pop("GEOCODING_URL", None)
+            else:
+                os.environ["GEOCODING_URL"] = previous_url
+            Training.objects.filter(customer_name=CUSTOMER_MARKER).delete()
+
+    def _plan(
+        self, options, training_type: TrainingType, trainer: Trainer, sample: Training
+    ) -> list[tuple[str, str, Optional[dict[str, Any]]]]:
+        rng = random.Random(options["seed"])
+        day = sample.start_date
+        reads = [
+            ("meta", "/api/meta/"),
+            ("trainings", "/api/trainings/?page_size=50"),
+            ("calendar_month", f"/api/calendar/month/?year={day.year}&month={day.month}"),
+            ("calendar_week", f"/api/calendar/week/?date={day.isoformat()}"),
+            ("trainer_detail", f"/api/trainers/{trainer.pk}/"),
+        ]
+        start = timezone.localtime() + timedelta(days=400)
+        plan: list[tuple[str, str, Optional[dict[str, Any]]]] = []
+        for number in range(options["requests"]):
+            if rng.random() < options["write_ratio"]:
+                body = {
+                    "training_type": training_type.pk,
+                    "customer_name": CUSTOMER_MARKER,
+                    # A new address every time, so every create waits for the geocoder.
+                    "address": f"Load test street {time.time_ns()}-{number}",
+                    "start_datetime": start.strftime("%Y-%m-%dT%H:%M"),
+                    "end_datetime": (start + timedelta(hours=2)).strftime("%Y-%m-%dT%H:%M"),
+                }
+                plan.append(("create", "/api/trainings/", body))
+            else:
+                plan.append((*rng.choice(reads), None))
+        return plan
+
+    def _run_threads(self, plan, user, options) -> tuple[float, dict[str, list[float]], int, int]:
+        local = threading.local()
+
+        def call(item) -> tuple[str, float, bool]:
+            if not hasattr(local, "client"):
+                local.client = Client(HTTP_HOST="localhost")
+                local.client.force_login(user)
+            name, url, body = item
+            started = time.perf_counter()
+            if body is None:
+                response = local.client.get(url)
+            else:
+                response = local.client.post(
+                    url, json.dumps(body), content_type="application/json"
+                )
+            return name, time.perf_counter() - started, response.status_code < 400
+
+        with _ThreadSampler() as sampler:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options["threads"]) as pool:
+                results = list(pool.map(call, plan))
+            elapsed = time.perf_counter() - started
+        return elapsed, *self._collect(results), sampler.peak
+
+    async def _run_asgi(
+        self, plan, session: str, options
+    ) -> tuple[float, dict[str, list[float]], int, int]:
+        transport = httpx.ASGITransport(app=get_asgi_application())
+        limit = asyncio.Semaphore(options["concurrency"])
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://localhost",
+            cookies={settings.SESSION_COOKIE_NAME: session},
+        ) as client:
+            await client.get("/api/csrf/")
+            headers = {"X-CSRFToken": client.cookies.get(settings.CSRF_COOKIE_NAME, "")}
+
+            async def call(item) -> tuple[str, float, bool]:
+                name, url, body = item
+                async with limit:
+                    started = time.perf_counter()
+                    if body is None:
+                        response = await client.get(url)
+                    else:
+                        response = await client.post(url, json=body, headers=headers)
+                    return name, time.perf_counter() - started, response.status_code < 400
+
+            with _ThreadSampler() as sampler:
+                started = time.perf_counter()
+                results = await asyncio.gather(*(call(item) for item in plan))
+                elapsed = time.perf_counter() - started
+        return elapsed, *self._collect(results), sampler.peak
+
+    def _collect(self, results) -> tuple[dict[str, list[float]], int]:
+        latencies: dict[str, list[float]] = {}
+        failures = 0
+        for name, seconds, ok in results:
+            latencies.setdefault(name, []).append(seconds * 1000)
+            failures += not ok
+        return latencies, failures
+
+    def _report(
+        self,
+        mode: str,
+        options,
+        elapsed: float,
+        latencies: dict[str, list[float]],
+        failures: int,
+        peak_threads: int,
+    ) -> None:
+        total = sum(len(values) for values in latencies.values())
+        width = f"{options['threads']} threads" if mode == "threads" else "event loop"
+        self.stdout.write(
+            f"{mode} ({width}): {total} requests in {elapsed:.2f}s = {total / elapsed:.1f} req/s, "
+            f"{failures} failed, peak threads {peak_threads}"
+        )
+        for name in sorted(latencies):
+            values = sorted(latencies[name])
+            p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+            self.stdout.write(
+                f"  {name:<16} n={len(values):<5} p50 {statistics.median(values):8.1f} ms"
+                f"   p95 {p95:8.1f} ms"
+            )
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import time
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from trainers.models import Trainer, TrainerSkill
+from trainings.models import Training, TrainingStatus, TrainingType
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Time POST /api/assignments/bulk/ against one PATCH per training. Seeds data in a "
+        "transaction that is rolled back, so commit hooks (cache, feeds, events) do not run."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--assignments", type=int, default=1000)
+        parser.add_argument("--trainers", type=int, default=100)
+        parser.add_argument(
+            "--patch-sample", type=int, default=100, help="PATCH requests to time."
+        )
+
+    def handle(self, *args, **options) -> None:
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _run(self, options) -> None:
+        count, sample = options["assignments"], options["patch_sample"]
+        training_type = TrainingType.objects.create(name=f"bench-{time.time_ns()}")
+        trainers = Trainer.objects.bulk_create(
+            [
+                Trainer(name=f"Bench {i}", home_address="Brno", home_lat=49.19, home_lng=16.6)
+                for i in range(options["trainers"])
+            ]
+        )
+        TrainerSkill.objects.bulk_create(
+            [TrainerSkill(trainer=trainer, training_type=training_type) for trainer in trainers]
+        )
+        origin = timezone.make_aware(datetime(2031, 3, 2, 9, 0))
+        batch = []
+        for i in range(count + sample):
+            # Every trainer gets one training a day, so the set has no conflicts.
+            start = origin + timedelta(days=i // len(trainers) % 27)
+            batch.append(
+                Training(
+                    training_type=training_type,
+                    address="Brno",
+                    lat=49.2,
+                    lng=16.61,
+                    start_datetime=start,
+                    end_datetime=start + timedelta(hours=2),
+                    status=TrainingStatus.WAITING,
+                )
+            )
+        for training in batch:
+            training.start_date = training.start_datetime.date()
+        trainings = Training.objects.bulk_create(batch)
+
+        client = Client(HTTP_HOST="localhost")
+        user, _ = get_user_model().objects.get_or_create(username="bench-bulk")
+        client.force_login(user)
+        proposals = [
+            {"training": training.id, "trainer": trainers[i % len(trainers)].id, "version": 1}
+            for i, training in enumerate(trainings[:count])
+        ]
+        body = json.dumps({"assignments": proposals})
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = client.post("/api/assignments/bulk/", body, content_type="application/json")
+            bulk_ms = (time.perf_counter() - started) * 1000
+        self.stdout.write(
+            f"bulk: {count} assignments -> {response.status_code} in {bulk_ms:.0f} ms, "
+            f"{len(queries)} queries"
+        )
+        response = client.post("/api/assignments/bulk/", body, content_type="application/json")
+        self.stdout.write(
+            f"bulk again with the old versions -> {response.status_code}, "
+            f"{len(response.json().get('errors', []))} refused"
+        )
+
+        started = time.perf_counter()
+        for i, training in enumerate(trainings[count:]):
+            client.patch(
+                f"/api/trainings/{training.id}/",
+                json.dumps({"assigned_trainer": trainers[i % len(trainers)].id}),
+                content_type="application/json",
+            )
+        patch_ms = (time.perf_counter() - started) * 1000 / max(sample, 1)
+        self.stdout.write(
+            f"PATCH: {patch_ms:.1f} ms per training, ~{patch_ms * count:.0f} ms for {count}"
+        )
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from trainers.models import Trainer
+from trainings.models import Training, TrainingStatus, TrainingType, local_start_date
+from trainings.services import month_bounds
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare calendar/list/workload date filters on start_datetime lookups against "
+        "the stored start_date column. Seeds data in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--trainers", type=int, default=200)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options) -> None:
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _run(self, options) -> None:
+        rng = random.Random(options["seed"])
+        training_type = TrainingType.objects.create(name=f"bench-{time.time_ns()}")
+        trainers = Trainer.objects.bulk_create(
+            [Trainer(name=f"Bench {i}", home_address="Praha") for i in range(options["trainers"])]
+        )
+        origin = timezone.make_aware(datetime(2020, 1, 1, 6, 0))
+        batch: list[Training] = []
+        started = time.perf_counter()
+        for _ in range(options["rows"]):
+            start = origin + timedelta(minutes=15 * rng.randrange(6 * 365 * 96))
+            batch.append(
+                Training(
+                    training_type=training_type,
+                    address="Bench",
+                    start_datetime=start,
+                    end_datetime=start + timedelta(hours=2),
+                    start_date=local_start_date(start),
+                    status=TrainingStatus.ASSIGNED,
+                    assigned_trainer=rng.choice(trainers),
+                )
+            )
+            if len(batch) >= 5000:
+                Training.objects.bulk_create(batch)
+                batch.clear()
+        Training.objects.bulk_create(batch)
+        self.stdout.write(
+            f"Seeded {options['rows']} trainings in {time.perf_counter() - started:.1f}s"
+        )
+
+        year, month = 2023, 6
+        first, last = month_bounds(year, month)
+        week_start = first + timedelta(days=7)
+        week_end = week_start + timedelta(days=6)
+        trainer = trainers[0]
+        cases: list[tuple[str, Callable[[], QuerySet], Callable[[], QuerySet]]] = [
+            (
+                "calendar month",
+                lambda: Training.objects.filter(
+                    start_datetime__year=year, start_datetime__month=month
+                ),
+                lambda: Training.objects.filter(start_date__range=(first, last)),
+            ),
+            (
+                "calendar week",
+                lambda: Training.objects.filter(
+                    start_datetime__date__range=[week_start, week_end]
+                ),
+                lambda: Training.objects.filter(start_date__range=[week_start, week_end]),
+            ),
+            (
+                "list date range",
+                lambda: Training.objects.filter(
+                    start_datetime__date__gte=first, start_datetime__date__lte=last
+                ).order_by("-start_datetime", "-id")[:50],
+                lambda: Training.objects.filter(
+                    start_date__gte=first, start_date__lte=last
+                ).order_by("-start_datetime", "-id")[:50],
+            ),
+            (
+                "trainer workload",
+                lambda: Training.objects.filter(
+                    assigned_trainer=trainer, start_datetime__year=year, start_datetime__month=month
+                ),
+                lambda: Training.objects.filter(
+                    assigned_trainer=trainer, start_date__range=(first, last)
+                ),
+            ),
+        ]
+        for label, legacy, indexed in cases:
+            legacy_ms = self._time(legacy, options["repeat"])
+            indexed_ms = self._time(indexed, options["repeat"])
+            self.stdout.write(
+                f"{label:<18} start_datetime lookups {legacy_ms:8.2f} ms   "
+                f"start_date range {indexed_ms:8.2f} ms   x{legacy_ms / indexed_ms:.1f}"
+            )
+
+    def _time(self, build: Callable[[], QuerySet], repeat: int) -> float:
+        list(build().values_list("id", flat=True))
+        started = time.perf_counter()
+        for _ in range(repeat):
+            list(build().values_list("id", flat=True))
+        return (time.perf_counter() - started) * 1000 / repeat
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+from typing import Any, Optional
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from core import changelog
+from core.querybudget import RAISE, QueryBudgetExceeded
+from trainers.models import Trainer, TrainerConstraints, TrainerSkill
+from trainings import calendar_cache
+from trainings.models import TrainingStatus
+from trainings.seeding import SeededData, seed
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _log_seeded(data: SeededData) -> None:
+    """Log the seeded records as changed, so ``changes`` fetches every entity type."""
+    trainer_ids = [trainer.pk for trainer in data.trainers]
+    # Seeding skips the signals. The big entity comes last, so all of them fit a page.
+    with changelog.batch():
+        changelog.record("training_type", [item.pk for item in data.training_types])
+        changelog.record("trainer", trainer_ids)
+        changelog.record(
+            "trainer_skill",
+            TrainerSkill.objects.filter(trainer_id__in=trainer_ids).values_list("id", flat=True),
+        )
+        changelog.record(
+            "trainer_constraints",
+            TrainerConstraints.objects.filter(trainer_id__in=trainer_ids).values_list(
+                "pk", flat=True
+            ),
+        )
+        changelog.record("training", [training.pk for training in data.trainings])
+
+
+def _calls(data: SeededData, since: int) -> list[tuple[str, str, str, Optional[dict[str, Any]]]]:
+    day = data.first_day
+    assigned = [training for training in data.trainings if training.assigned_trainer_id]
+    waiting = [
+        training for training in data.trainings if training.status == TrainingStatus.WAITING
+    ]
+    busiest = max(
+        data.trainers,
+        key=lambda trainer: sum(t.assigned_trainer_id == trainer.pk for t in assigned),
+    )
+    training_type = data.training_types[0].pk
+    # Teaches everything, has no constraints and nothing assigned: the assignment
+    # passes, and editing it changes the same records at every scale.
+    free = Trainer.objects.create(
+        name=f"{data.marker} free trainer", home_address="Brno", home_lat=49.19, home_lng=16.61
+    )
+    TrainerSkill.objects.bulk_create(
+        [TrainerSkill(trainer=free, training_type=item) for item in data.training_types]
+    )
+    new_training = {
+        "training_type": training_type,
+        "address": f"{data.marker} venue",
+        "lat": 49.19,
+        "lng": 16.61,
+        "start_datetime": f"{day.isoformat()}T09:00",
+        "end_datetime": f"{day.isoformat()}T11:00",
+    }
+    trainer = {
+        "name": free.name,
+        "home_address": free.home_address,
+        "home_lat": free.home_lat,
+        "home_lng": free.home_lng,
+        "training_types": [training_type],
+        "max_distance_km": 300,
+        "preferred_weekdays": ["1", "3"],
+    }
+    return [
+        ("changes", "GET", f"/api/changes/?since={since}", None),
+        ("meta", "GET", "/api/meta/", None),
+        ("trainings", "GET", "/api/trainings/?page_size=100", None),
+        ("trainings filtered", "GET", "/api/trainings/?page_size=100&status=assigned", None),
+        ("training", "GET", f"/api/trainings/{assigned[0].pk}/", None),
+        ("training waiting", "GET", f"/api/trainings/{waiting[0].pk}/", None),
+        ("trainers", "GET", "/api/trainers/?page_size=100", None),
+        ("trainer", "GET", f"/api/trainers/{busiest.pk}/", None),
+        (
+            "trainer all sections",
+            "GET",
+            f"/api/trainers/{busiest.pk}/?include=item,assigned_trainings,stats",
+            None,
+        ),
+        ("training types", "GET", "/api/training-types/", None),
+        ("calendar month", "GET", f"/api/calendar/month/?year={day.year}&month={day.month}", None),
+        ("calendar week", "GET", f"/api/calendar/week/?date={day.isoformat()}", None),
+        ("calendar overview", "GET", f"/api/calendar/overview/?year={day.year}", None),
+        (
+            "utilization",
+            "GET",
+            f"/api/reports/utilization/?year={day.year}&month={day.month}",
+            None,
+        ),
+        ("create training", "POST", "/api/trainings/", new_training),
+        ("edit training", "PATCH", f"/api/trainings/{waiting[1].pk}/", {"notes": "checked"}),
+        (
+            "assign",
+            "POST",
+            f"/api/trainings/{waiting[0].pk}/assign/",
+            {"trainer": free.pk, "version": waiting[0].version},
+        ),
+        ("edit trainer", "PUT", f"/api/trainers/{free.pk}/", trainer),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Call the API views that declare a query budget on seeded data of growing size, "
+        "with budgets enforced. Fails when a view goes over its budget or makes more "
+        "queries on more data. The data is seeded in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--scales",
+            default="5,50",
+            help="Comma separated trainer counts; each trainer comes with 12 trainings.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        scales = sorted({int(scale) for scale in options["scales"].split(",")})
+        user, _ = get_user_model().objects.get_or_create(username="check-query-budgets")
+        counts: dict[str, list[int]] = {}
+        failures: list[str] = []
+        try:
+            with override_settings(QUERY_BUDGET=RAISE):
+                for scale in scales:
+                    self._run(scale, user, counts, failures)
+        finally:
+            # Calendar payloads of the rolled back data must not be served.
+            calendar_cache.invalidate_all()
+
+        for name, values in counts.items():
+            if any(later > earlier for earlier, later in zip(values, values[1:])):
+                failures.append(f"{name}: the query count grows with the data: {values}")
+        self.stdout.write(f"{'':24}" + "".join(f"{scale:>8}" for scale in scales))
+        for name, values in counts.items():
+            self.stdout.write(f"{name:24}" + "".join(f"{value:>8}" for value in values))
+        if failures:
+            raise CommandError("\n\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("All views kept to their query budgets."))
+
+    def _run(self, scale: int, user, counts: dict[str, list[int]], failures: list[str]) -> None:
+        calendar_cache.invalidate_all()
+        try:
+            with transaction.atomic():
+                changelog.stamp()
+                since = changelog.latest_sequence()
+                data = seed(
+                    scale, scale * 12, date(2031, 3, 3), marker=f"check-budgets-{scale}"
+                )
+                _log_seeded(data)
+                client = Client(HTTP_HOST="localhost")
+                client.force_login(user)
+                for name, method, url, body in _calls(data, since or 0):
+                    kwargs = {}
+                    if body is not None:
+                        kwargs = {"data": json.dumps(body), "content_type": "application/json"}
+                    # The count includes the session and user lookups.
+                    with CaptureQueriesContext(connection) as queries:
+                        try:
+                            response = getattr(client, method.lower())(url, **kwargs)
+                        except QueryBudgetExceeded as exc:
+                            failures.append(f"{name} ({scale} trainers): {exc}")
+                            response = None
+                    counts.setdefault(name, []).append(len(queries))
+                    if response is not None and response.status_code >= 400:
+                        failures.append(
+                            f"{name} ({scale} trainers): {method} {url} answered "
+                            f"{response.status_code}"
+                        )
+                raise _Rollback
+        except _Rollback:
+            pass
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from trainings import importer
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import trainings from a CSV, JSON array or NDJSON file, then geocode the "
+        "distinct addresses of the imported rows in one pass."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("path", nargs="?", help="File to import.")
+        parser.add_argument(
+            "--format", choices=importer.FORMATS, help="Input format (defaults to extension)."
+        )
+        parser.add_argument("--batch-size", type=int, default=importer.DEFAULT_BATCH_SIZE)
+        parser.add_argument("--encoding", default="utf-8-sig")
+        parser.add_argument(
+            "--no-geocode", action="store_true", help="Skip the geocoding pass."
+        )
+        parser.add_argument(
+            "--geocode-pending",
+            action="store_true",
+            help="Geocode every training still missing coordinates (e.g. API imports).",
+        )
+
+    def handle(self, *args, **options) -> None:
+        pending: dict[str, list[int]] = {}
+        if options["path"]:
+            pending = self._import(Path(options["path"]), options)
+        elif not options["geocode_pending"]:
+            raise CommandError("Pass a file to import or --geocode-pending.")
+        if options["geocode_pending"]:
+            pending = importer.pending_geocoding()
+        if options["no_geocode"] or not pending:
+            return
+        result = importer.geocode_pending(pending)
+        self.stdout.write(
+            f"Geocoded {result.resolved} trainings; {len(result.unresolved)} addresses unresolved."
+        )
+        for address in result.unresolved:
+            self.stdout.write(f"  unresolved: {address}")
+
+    def _import(self, path: Path, options) -> dict[str, list[int]]:
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+        fmt = options["format"] or path.suffix.lstrip(".").lower()
+        if fmt not in importer.FORMATS:
+            raise CommandError(f"Pass --format ({', '.join(importer.FORMATS)}).")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        with path.open(encoding=options["encoding"], newline="") as stream:
+            result = importer.import_trainings(
+                importer.iter_records(stream, fmt), batch_size=options["batch_size"]
+            )
+        for error in result.errors:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'])}")
+        summary = f"Imported {result.created} trainings; {len(result.errors)} rows failed."
+        self.stdout.write(self.style.SUCCESS(summary))
+        return result.pending
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainings', '0002_training_customer_name'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='training',
+            name='trainings_t_start_d_01c571_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='training',
+            name='trainings_t_status_8ebfec_idx',
+        ),
+        migrations.AddIndex(
+            model_name='training',
+            index=models.Index(fields=['start_datetime', 'id'], name='trainings_t_start_d_6587d4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='training',
+            index=models.Index(fields=['status', 'start_datetime', 'id'], name='trainings_t_status_dd12a1_idx'),
+        ),
+    ]
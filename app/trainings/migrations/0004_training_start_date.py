@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:10
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_start_dates(apps, schema_editor):
+    Training = apps.get_model('trainings', 'Training')
+    batch = []
+    for training in Training.objects.only('id', 'start_datetime').iterator(chunk_size=2000):
+        value = training.start_datetime
+        training.start_date = timezone.localdate(value) if timezone.is_aware(value) else value.date()
+        batch.append(training)
+        if len(batch) >= 2000:
+            Training.objects.bulk_update(batch, ['start_date'])
+            batch = []
+    if batch:
+        Training.objects.bulk_update(batch, ['start_date'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainings', '0003_training_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='training',
+            name='trainings_t_assigne_6cd623_idx',
+        ),
+        migrations.AddField(
+            model_name='training',
+            name='start_date',
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_start_dates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='training',
+            name='start_date',
+            field=models.DateField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='training',
+            index=models.Index(fields=['start_date'], name='trainings_t_start_d_1d6954_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='training',
+            index=models.Index(fields=['assigned_trainer', 'start_date'], name='trainings_t_assigne_6cb2ae_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainings', '0004_training_start_date'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='training',
+            index=models.Index(fields=['assigned_trainer', 'start_datetime', 'id'], name='trainings_t_assigne_869c56_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainings', '0005_training_trainer_history_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='training',
+            name='google_event_id',
+            field=models.CharField(blank=True, db_index=True, max_length=255),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainings', '0006_training_google_event_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='training',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -1,6 +1,9 @@
+from datetime import date, datetime
+
 from django.db import models
+from django.utils import timezone
 
-from core.models import TimeStampedModel
+from core.models import ChangeLoggedModel, TimeStampedModel
 
 
 class TrainingStatus(models.TextChoices):
@@ -11,7 +14,14 @@ class TrainingStatus(models.TextChoices):
     CANCELED = "canceled", "Canceled"
 
 
-class TrainingType(TimeStampedModel):
+def local_start_date(value: datetime) -> date:
+    """Return the calendar date of ``value`` in the configured time zone."""
+    if timezone.is_aware(value):
+        return timezone.localdate(value)
+    return value.date()
+
+
+class TrainingType(ChangeLoggedModel, TimeStampedModel):
     name = models.CharField(max_length=120, unique=True)
 
     class Meta:
@@ -21,7 +31,7 @@ class TrainingType(TimeStampedModel):
         return self.name
 
 
-class Training(TimeStampedModel):
+class Training(ChangeLoggedModel, TimeStampedModel):
     training_type = models.ForeignKey(
         "trainings.TrainingType",
         on_delete=models.PROTECT,
@@ -32,6 +42,9 @@ class Training(TimeStampedModel):
     lat = models.FloatField(null=True, blank=True)
     lng = models.FloatField(null=True, blank=True)
     start_datetime = models.DateTimeField()
+    # Local calendar date of start_datetime, stored so date filters are plain
+    # index range scans instead of per-row time zone conversions.
+    start_date = models.DateField(editable=False)
     end_datetime = models.DateTimeField()
     status = models.CharField(
         max_length=20,
@@ -46,15 +59,19 @@ class Training(TimeStampedModel):
         related_name="assigned_trainings",
     )
     assignment_reason = models.TextField(blank=True)
-    google_event_id = models.CharField(max_length=255, blank=True)
+    google_event_id = models.CharField(max_length=255, blank=True, db_index=True)
     notes = models.TextField(blank=True)
+    # Bumped on every save, so clients can tell whether their copy is still current.
+    version = models.PositiveIntegerField(default=1, editable=False)
 
     class Meta:
         ordering = ["-start_datetime"]
         indexes = [
-            models.Index(fields=["start_datetime"]),
-            models.Index(fields=["status"]),
-            models.Index(fields=["assigned_trainer"]),
+            models.Index(fields=["start_datetime", "id"]),
+            models.Index(fields=["status", "start_datetime", "id"]),
+            models.Index(fields=["start_date"]),
+            models.Index(fields=["assigned_trainer", "start_date"]),
+            models.Index(fields=["assigned_trainer", "start_datetime", "id"]),
         ]
         constraints = [
             models.CheckConstraint(
@@ -63,5 +80,19 @@ class Training(TimeStampedModel):
             )
         ]
 
+    def save(self, *args, **kwargs) -> None:
+        self.start_date = local_start_date(self.start_datetime)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not update_fields:
+            return
+        if not self._state.adding:
+            self.version += 1
+        if update_fields is not None:
+            extra = {"version"}
+            if "start_datetime" in update_fields:
+                extra.add("start_date")
+            kwargs["update_fields"] = {*update_fields, *extra}
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         return f"{self.training_type} @ {self.start_datetime:%Y-%m-%d %H:%M}"
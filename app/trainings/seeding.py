@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from core.search import search_key
+from trainers.models import Trainer, TrainerConstraints, TrainerSkill
+
+from .models import Training, TrainingStatus, TrainingType, local_start_date
+
+# Roughly the Czech Republic, where the planner's trainers work.
+_LAT_RANGE = (48.6, 51.0)
+_LNG_RANGE = (12.1, 18.8)
+_STATUSES = [
+    (TrainingStatus.ASSIGNED, 45),
+    (TrainingStatus.CONFIRMED, 15),
+    (TrainingStatus.WAITING, 25),
+    (TrainingStatus.DRAFT, 10),
+    (TrainingStatus.CANCELED, 5),
+]
+
+
+@dataclass(frozen=True)
+class SeededData:
+    marker: str
+    training_types: list[TrainingType]
+    trainers: list[Trainer]
+    trainings: list[Training]
+    first_day: date
+
+
+def seed(
+    trainers: int,
+    trainings: int,
+    first_day: date,
+    months: int = 3,
+    marker: str = "seed",
+    random_seed: int = 1,
+) -> SeededData:
+    """Create a planning dataset: trainers with skills and constraints, and trainings.
+
+    The trainings fall on weekdays of ``months`` months from ``first_day``; about
+    half have a trainer. Rows are written with ``bulk_create``, so no signals run:
+    nothing is logged for /api/changes/ and no cache is invalidated. Names and
+    customers start with ``marker``.
+    """
+    rng = random.Random(random_seed)
+    training_types = TrainingType.objects.bulk_create(
+        [
+            TrainingType(name=f"{marker} type {number}")
+            for number in range(min(20, max(3, trainers // 10)))
+        ]
+    )
+    created_trainers = Trainer.objects.bulk_create(
+        [
+            Trainer(
+                name=f"{marker} trainer {number}",
+                search_name=search_key(f"{marker} trainer {number}"),
+                email=f"trainer{number}@example.com",
+                home_address=f"{marker} street {number}",
+                home_lat=rng.uniform(*_LAT_RANGE),
+                home_lng=rng.uniform(*_LNG_RANGE),
+                hourly_rate=Decimal(rng.randrange(400, 1500, 50)),
+                travel_rate_km=Decimal(rng.choice(["5.00", "7.50", "9.00"])),
+            )
+            for number in range(trainers)
+        ]
+    )
+    skills = []
+    for trainer in created_trainers:
+        for training_type in rng.sample(training_types, rng.randint(1, 3)):
+            skills.append(TrainerSkill(trainer=trainer, training_type=training_type))
+    TrainerSkill.objects.bulk_create(skills)
+    TrainerConstraints.objects.bulk_create(
+        [
+            TrainerConstraints(
+                trainer=trainer,
+                max_distance_km=rng.choice([None, 150, 250, 400]),
+                weekend_allowed=rng.choice([None, True, False]),
+                max_long_trips_per_month=rng.choice([None, 2, 4]),
+                preferred_weekdays=sorted(rng.sample(range(5), rng.randint(0, 3))),
+            )
+            for trainer in created_trainers
+            if rng.random() < 0.6
+        ]
+    )
+
+    skilled: dict[int, list[Trainer]] = {}
+    for skill in skills:
+        skilled.setdefault(skill.training_type.pk, []).append(skill.trainer)
+    statuses, weights = zip(*_STATUSES)
+    days = [
+        first_day + timedelta(days=offset)
+        for offset in range(months * 30)
+        if (first_day + timedelta(days=offset)).weekday() < 5
+    ]
+    batch = []
+    for number in range(trainings):
+        training_type = rng.choice(training_types)
+        start = timezone.make_aware(
+            datetime.combine(rng.choice(days), time(rng.randint(7, 13), rng.choice((0, 30))))
+        )
+        status = rng.choices(statuses, weights)[0]
+        assigned = status in (TrainingStatus.ASSIGNED, TrainingStatus.CONFIRMED)
+        training = Training(
+            training_type=training_type,
+            customer_name=f"{marker} customer {number % 50}",
+            address=f"{marker} venue {number}",
+            lat=rng.uniform(*_LAT_RANGE),
+            lng=rng.uniform(*_LNG_RANGE),
+            start_datetime=start,
+            end_datetime=start + timedelta(hours=rng.choice((2, 4, 6, 8))),
+            status=status,
+            assigned_trainer=(
+                rng.choice(skilled.get(training_type.pk) or created_trainers) if assigned else None
+            ),
+        )
+        training.start_date = local_start_date(training.start_datetime)
+        batch.append(training)
+    created_trainings = Training.objects.bulk_create(batch, batch_size=500)
+    return SeededData(
+        marker=marker,
+        training_types=training_types,
+        trainers=created_trainers,
+        trainings=created_trainings,
+        first_day=first_day,
+    )
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import calendar
+from datetime import date
+from typing import Iterable, Optional
+
+from django.db.models import QuerySet
+
+from core import events
+
+from .models import TrainingStatus
+
+
+TRAINING_LIST_ORDERING = ("-start_datetime", "-id")
+
+
+def month_bounds(year: int, month: int) -> tuple[date, date]:
+    """Return the first and last day of a month, for ``start_date__range`` filters."""
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def publish_training_change(
+    training_id: Optional[int],
+    days: Iterable[Optional[date]],
+    trainer_ids: Iterable[Optional[int]],
+) -> None:
+    """Tell /api/events/ clients which training, months and trainers changed."""
+    events.publish(
+        "invalidate",
+        {
+            "entity": "training",
+            "id": training_id,
+            "months": sorted({f"{day:%Y-%m}" for day in days if day is not None}),
+            "trainer_ids": sorted({pk for pk in trainer_ids if pk is not None}),
+        },
+    )
+
+
+def filter_trainings(
+    trainings: QuerySet,
+    status: Optional[str] = None,
+    training_type_id: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    no_trainer: bool = False,
+) -> QuerySet:
+    """Apply the shared list filters used by the API and the template views."""
+    if status:
+        trainings = trainings.filter(status=status)
+    if training_type_id:
+        trainings = trainings.filter(training_type_id=training_type_id)
+    if start_date:
+        trainings = trainings.filter(start_date__gte=start_date)
+    if end_date:
+        trainings = trainings.filter(start_date__lte=end_date)
+    if no_trainer:
+        trainings = trainings.filter(
+            assigned_trainer__isnull=True,
+            status__in=[TrainingStatus.DRAFT, TrainingStatus.WAITING],
+        )
+    return trainings
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from trainers.models import Trainer
+
+from core import changelog, events
+
+from . import calendar_cache, feeds
+from .models import Training, TrainingType
+from .services import publish_training_change
+
+
+@receiver(pre_save, sender=Training)
+def remember_previous_state(sender, instance: Training, **kwargs) -> None:
+    previous = None
+    if instance.pk:
+        previous = (
+            Training.objects.filter(pk=instance.pk)
+            .values_list("start_date", "assigned_trainer_id", "status")
+            .first()
+        )
+    (
+        instance._previous_start_date,
+        instance._previous_trainer_id,
+        instance._previous_status,
+    ) = previous or (None, None, None)
+
+
+@receiver(post_save, sender=Training)
+def invalidate_saved_training(sender, instance: Training, **kwargs) -> None:
+    days = [instance.start_date, getattr(instance, "_previous_start_date", None)]
+    trainer_ids = [instance.assigned_trainer_id, getattr(instance, "_previous_trainer_id", None)]
+    transaction.on_commit(lambda: calendar_cache.invalidate_dates(days))
+    transaction.on_commit(lambda: feeds.invalidate_trainers(trainer_ids))
+    transaction.on_commit(lambda: publish_training_change(instance.pk, days, trainer_ids))
+
+
+@receiver(post_delete, sender=Training)
+def invalidate_deleted_training(sender, instance: Training, **kwargs) -> None:
+    days = [instance.start_date]
+    trainer_ids = [instance.assigned_trainer_id]
+    training_id = instance.pk
+    transaction.on_commit(lambda: calendar_cache.invalidate_dates(days))
+    transaction.on_commit(lambda: feeds.invalidate_trainers(trainer_ids))
+    transaction.on_commit(lambda: publish_training_change(training_id, days, trainer_ids))
+
+
+@receiver(post_save, sender=TrainingType)
+@receiver(post_delete, sender=TrainingType)
+def invalidate_training_type(sender, instance: TrainingType, **kwargs) -> None:
+    event = {"entity": "training_type", "id": instance.pk}
+    transaction.on_commit(calendar_cache.invalidate_all)
+    transaction.on_commit(feeds.invalidate_all)
+    transaction.on_commit(lambda: events.publish("invalidate", event))
+
+
+@receiver(post_save, sender=Trainer)
+def invalidate_trainer_feed(sender, instance: Trainer, **kwargs) -> None:
+    # The trainer's name is the feed's calendar name.
+    trainer_ids = [instance.pk]
+    event = {"entity": "trainer", "id": instance.pk}
+    transaction.on_commit(lambda: feeds.invalidate_trainers(trainer_ids))
+    transaction.on_commit(lambda: events.publish("invalidate", event))
+
+
+@receiver(post_delete, sender=Trainer)
+def invalidate_deleted_trainer_feed(sender, instance: Trainer, **kwargs) -> None:
+    tokens = [instance.feed_token]
+    event = {"entity": "trainer", "id": instance.pk}
+    transaction.on_commit(lambda: feeds.invalidate_tokens(tokens))
+    transaction.on_commit(lambda: events.publish("invalidate", event))
+
+
+@receiver(pre_delete, sender=Trainer)
+def log_unassigned_trainings(sender, instance: Trainer, **kwargs) -> None:
+    # The SET_NULL update bypasses Training signals; log those trainings as changed.
+    changelog.record(
+        "training",
+        Training.objects.filter(assigned_trainer=instance).values_list("id", flat=True),
+    )
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+from django.utils import timezone
+
+from core.models import ChangeLog
+from trainings.assignment import (
+    CANCELED,
+    STALE_VERSION,
+    AssignmentConflict,
+    ProposedAssignment,
+    assign_many,
+    assign_trainer,
+)
+from trainings.models import Training, TrainingStatus
+
+
+def test_assign_trainer_bumps_the_version(db, make_training, make_trainer):
+    training = make_training()
+    trainer = make_trainer()
+
+    assigned = assign_trainer(training.pk, trainer.pk, training.version, reason="Closest")
+
+    assert assigned.version == training.version + 1
+    training.refresh_from_db()
+    assert training.version == assigned.version
+    assert training.assigned_trainer_id == trainer.pk
+    assert training.status == TrainingStatus.ASSIGNED
+    assert training.assignment_reason == "Closest"
+    assert ChangeLog.objects.filter(entity="training", object_id=training.pk).exists()
+
+
+def test_assign_trainer_refuses_a_stale_version(db, make_training, make_trainer):
+    training = make_training()
+    first, second = make_trainer(), make_trainer(name="Petr Svoboda")
+    seen = training.version
+    assign_trainer(training.pk, first.pk, seen)
+
+    # A second planner picked a trainer from the same, now outdated, view.
+    with pytest.raises(AssignmentConflict) as conflict:
+        assign_trainer(training.pk, second.pk, seen)
+
+    assert conflict.value.reasons == [STALE_VERSION]
+    training.refresh_from_db()
+    assert training.assigned_trainer_id == first.pk
+    assert training.version == seen + 1
+
+
+def test_overlapping_assignments_of_one_trainer_conflict(db, make_training, make_trainer):
+    trainer = make_trainer()
+    morning = make_training()
+    overlapping = make_training(start=timezone.make_aware(datetime(2031, 3, 4, 10)))
+    assign_trainer(morning.pk, trainer.pk, morning.version)
+
+    with pytest.raises(AssignmentConflict) as conflict:
+        assign_trainer(overlapping.pk, trainer.pk, overlapping.version)
+
+    assert "Time conflict" in conflict.value.reasons
+    overlapping.refresh_from_db()
+    assert overlapping.assigned_trainer_id is None
+    assert overlapping.version == 1
+
+
+def test_assign_trainer_refuses_a_canceled_training(db, make_training, make_trainer):
+    training = make_training(status=TrainingStatus.CANCELED)
+
+    with pytest.raises(AssignmentConflict) as conflict:
+        assign_trainer(training.pk, make_trainer().pk, training.version)
+
+    assert conflict.value.reasons == [CANCELED]
+
+
+def test_assign_many_bumps_every_version(db, make_training, make_trainer):
+    first, second = make_trainer(), make_trainer(name="Petr Svoboda")
+    trainings = [make_training(), make_training()]
+
+    assigned = assign_many(
+        [
+            ProposedAssignment(trainings[0].pk, first.pk, trainings[0].version),
+            ProposedAssignment(trainings[1].pk, second.pk),
+        ]
+    )
+
+    assert [training.version for training in assigned] == [2, 2]
+    stored = Training.objects.in_bulk([training.pk for training in trainings])
+    assert stored[trainings[0].pk].assigned_trainer_id == first.pk
+    assert stored[trainings[1].pk].assigned_trainer_id == second.pk
+    assert {training.version for training in stored.values()} == {2}
+
+
+def test_assign_many_refuses_the_whole_set_for_one_refusal(db, make_training, make_trainer):
+    trainer = make_trainer()
+    morning = make_training()
+    overlapping = make_training(start=timezone.make_aware(datetime(2031, 3, 4, 10)))
+    stale = make_training(start=timezone.make_aware(datetime(2031, 3, 5, 9)))
+    stale.notes = "Edited by someone else."
+    stale.save()
+    logged = ChangeLog.objects.count()
+
+    with pytest.raises(AssignmentConflict) as conflict:
+        assign_many(
+            [
+                ProposedAssignment(morning.pk, trainer.pk, morning.version),
+                # Checked against the proposal before it, not only the database.
+                ProposedAssignment(overlapping.pk, trainer.pk, overlapping.version),
+                ProposedAssignment(stale.pk, trainer.pk, 1),
+            ]
+        )
+
+    assert [(error["index"], error["reasons"]) for error in conflict.value.errors] == [
+        (1, ["Time conflict"]),
+        (2, [STALE_VERSION]),
+    ]
+    stored = Training.objects.in_bulk([morning.pk, overlapping.pk, stale.pk])
+    assert [
+        (row.assigned_trainer_id, row.status, row.version)
+        for row in (stored[training.pk] for training in (morning, overlapping, stale))
+    ] == [
+        (None, TrainingStatus.WAITING, 1),
+        (None, TrainingStatus.WAITING, 1),
+        (None, TrainingStatus.WAITING, 2),
+    ]
+    assert ChangeLog.objects.count() == logged
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pytest
+from django.core.cache import cache
+
+from trainings import feeds
+from trainings.models import TrainingStatus
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_a_feed_invalidated_while_it_is_built_is_not_served(
+    db, monkeypatch, make_training, make_trainer
+):
+    trainer = make_trainer()
+    training = make_training(status=TrainingStatus.ASSIGNED, assigned_trainer=trainer)
+    build = feeds._build
+
+    def build_then_save(trainer_id: int, name: str) -> feeds.TrainerFeed:
+        feed = build(trainer_id, name)
+        # A save commits after the rows were read but before the feed is cached.
+        training.customer_name = "Moved customer"
+        training.save()
+        feeds.invalidate_trainers([trainer.pk])
+        return feed
+
+    monkeypatch.setattr(feeds, "_build", build_then_save)
+    stale = feeds.trainer_feed(trainer.feed_token)
+    monkeypatch.setattr(feeds, "_build", build)
+
+    fresh = feeds.trainer_feed(trainer.feed_token)
+
+    assert "Moved customer" not in stale.body
+    assert "Moved customer" in fresh.body
+    assert fresh.etag != stale.etag
+    assert feeds.trainer_feed(trainer.feed_token) == fresh
+
+
+def test_an_evicted_generation_does_not_bring_back_old_feeds(db, make_training, make_trainer):
+    trainer = make_trainer()
+    training = make_training(status=TrainingStatus.ASSIGNED, assigned_trainer=trainer)
+    feeds.trainer_feed(trainer.feed_token)
+    feeds.invalidate_all()
+    training.customer_name = "Moved customer"
+    training.save()
+
+    cache.delete(feeds._GENERATION_KEY)
+
+    assert "Moved customer" in feeds.trainer_feed(trainer.feed_token).body
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from geocoding.models import GeocodingCache
+from trainings.importer import geocode_pending, pending_geocoding
+from trainings.models import Training
+
+
+def test_geocoding_pending_trainings_bumps_their_version(db, make_training):
+    GeocodingCache.objects.create(address="Ostrava", lat=49.84, lng=18.29, provider="test")
+    training = make_training(address="Ostrava", lat=None, lng=None)
+
+    result = geocode_pending(pending_geocoding(), online=False)
+
+    assert result.resolved == 1
+    stored = Training.objects.get(pk=training.pk)
+    assert (stored.lat, stored.lng) == (49.84, 18.29)
+    assert stored.version == training.version + 1
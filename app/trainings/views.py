@@ -1,18 +1,25 @@
 import calendar
 from datetime import date, timedelta
-from typing import Optional
+from typing import Any, Optional
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_http_methods
 
+from core.pagination import InvalidCursor, keyset_page
+from core.querybudget import query_budget
 from geocoding.services import geocode_address
 from matching.services import recommend_trainers
 from trainers.models import Trainer
 
+from . import calendar_cache, feeds, ical
 from .forms import TrainingForm, TrainingTypeForm, TrainingUpdateForm
 from .models import Training, TrainingStatus, TrainingType
+from .services import TRAINING_LIST_ORDERING, filter_trainings, month_bounds
 
 
 def _parse_date(value: Optional[str]) -> Optional[date]:
@@ -24,34 +31,72 @@ def _parse_date(value: Optional[str]) -> Optional[date]:
         return None
 
 
+def _page_url(request, cursor: Optional[str]) -> Optional[str]:
+    if not cursor:
+        return None
+    query = request.GET.copy()
+    query["cursor"] = cursor
+    return f"?{query.urlencode()}"
+
+
+def _trainer_feed(request, token: str) -> Optional[feeds.TrainerFeed]:
+    # condition() asks for the ETag and Last-Modified separately; look the feed up once.
+    if not hasattr(request, "_trainer_feed"):
+        request._trainer_feed = feeds.trainer_feed(token)
+    return request._trainer_feed
+
+
+def _trainer_feed_etag(request, token: str) -> Optional[str]:
+    feed = _trainer_feed(request, token)
+    return feed.etag if feed else None
+
+
+def _trainer_feed_last_modified(request, token: str):
+    feed = _trainer_feed(request, token)
+    return feed.last_modified if feed else None
+
+
+@require_http_methods(["GET", "HEAD"])
+@cache_control(private=True, max_age=feeds.FEED_MAX_AGE)
+@condition(etag_func=_trainer_feed_etag, last_modified_func=_trainer_feed_last_modified)
+def trainer_feed(request, token: str):
+    """Subscribable iCalendar feed of one trainer's assignments; the token is the credential."""
+    feed = _trainer_feed(request, token)
+    if feed is None:
+        raise Http404
+    return HttpResponse(feed.body, content_type=ical.CONTENT_TYPE)
+
+
 @login_required
+@query_budget(2)
 def training_list(request):
-    trainings = Training.objects.select_related("training_type", "assigned_trainer")
     status = request.GET.get("status")
     training_type_id = request.GET.get("training_type")
     start_date = _parse_date(request.GET.get("start_date"))
     end_date = _parse_date(request.GET.get("end_date"))
     no_trainer = request.GET.get("no_trainer")
-    if status:
-        trainings = trainings.filter(status=status)
-    if training_type_id:
-        trainings = trainings.filter(training_type_id=training_type_id)
-    if start_date:
-        trainings = trainings.filter(start_datetime__date__gte=start_date)
-    if end_date:
-        trainings = trainings.filter(start_datetime__date__lte=end_date)
-    if no_trainer:
-        trainings = trainings.filter(
-            assigned_trainer__isnull=True,
-            status__in=[TrainingStatus.DRAFT, TrainingStatus.WAITING],
+    trainings = filter_trainings(
+        Training.objects.select_related("training_type", "assigned_trainer"),
+        status=status,
+        training_type_id=training_type_id,
+        start_date=start_date,
+        end_date=end_date,
+        no_trainer=bool(no_trainer),
+    )
+    try:
+        page = keyset_page(
+            trainings, TRAINING_LIST_ORDERING, cursor=request.GET.get("cursor"), page_size=100
         )
-    trainings = trainings[:100]
+    except InvalidCursor:
+        page = keyset_page(trainings, TRAINING_LIST_ORDERING, page_size=100)
     training_types = TrainingType.objects.all()
     return render(
         request,
         "trainings/index.html",
         {
-            "trainings": trainings,
+            "trainings": page.items,
+            "next_url": _page_url(request, page.next_cursor),
+            "prev_url": _page_url(request, page.prev_cursor),
             "training_types": training_types,
             "status_choices": TrainingStatus.choices,
             "selected_status": status or "",
@@ -64,6 +109,7 @@ def training_list(request):
 
 
 @login_required
+@query_budget(2, POST=10)
 def training_create(request):
     if request.method == "POST":
         form = TrainingForm(request.POST)
@@ -86,6 +132,7 @@ def training_create(request):
 
 
 @login_required
+@query_budget(8, POST=10)
 def training_detail(request, pk: int):
     training = get_object_or_404(Training, pk=pk)
     if request.method == "POST":
@@ -96,7 +143,9 @@ def training_detail(request, pk: int):
     else:
         form = TrainingUpdateForm(instance=training)
 
-    trainers = Trainer.objects.prefetch_related("skills__training_type", "rules")
+    trainers = Trainer.objects.select_related("constraints").prefetch_related(
+        "skills__training_type"
+    )
     existing_trainings = Training.objects.filter(
         assigned_trainer__isnull=False
     ).exclude(status=TrainingStatus.CANCELED)
@@ -115,6 +164,7 @@ def training_detail(request, pk: int):
 
 
 @login_required
+@query_budget(4, POST=12)
 def training_edit(request, pk: int):
     training = get_object_or_404(Training, pk=pk)
     if request.method == "POST":
@@ -138,6 +188,7 @@ def training_edit(request, pk: int):
 
 
 @login_required
+@query_budget(1, POST=6)
 def training_type_list(request):
     if request.method == "POST":
         form = TrainingTypeForm(request.POST)
@@ -154,21 +205,35 @@ def training_type_list(request):
     )
 
 
-@login_required
-def training_calendar(request):
-    today = date.today()
-    year = int(request.GET.get("year", today.year))
-    month = int(request.GET.get("month", today.month))
-    cal = calendar.Calendar(firstweekday=0)
-    month_days = list(cal.itermonthdates(year, month))
+def _calendar_entry(training: Training) -> dict[str, Any]:
+    # Plain dicts keep cached grids small and picklable; the keys mirror the
+    # model attributes the calendar templates read.
+    return {
+        "pk": training.pk,
+        "training_type": training.training_type.name,
+        "customer_name": training.customer_name,
+        "start_datetime": training.start_datetime,
+        "get_status_display": training.get_status_display(),
+        "address": training.address,
+    }
+
+
+def _trainings_by_day(first: date, last: date) -> dict[date, list[dict[str, Any]]]:
     trainings = (
-        Training.objects.filter(start_datetime__year=year, start_datetime__month=month)
-        .select_related("training_type", "assigned_trainer")
+        Training.objects.filter(start_date__range=[first, last])
+        .select_related("training_type")
         .order_by("start_datetime")
     )
-    trainings_by_day: dict[date, list[Training]] = {}
+    trainings_by_day: dict[date, list[dict[str, Any]]] = {}
     for training in trainings:
-        trainings_by_day.setdefault(training.start_datetime.date(), []).append(training)
+        trainings_by_day.setdefault(training.start_date, []).append(_calendar_entry(training))
+    return trainings_by_day
+
+
+def _month_weeks(year: int, month: int) -> list[list[dict[str, Any]]]:
+    cal = calendar.Calendar(firstweekday=0)
+    month_days = list(cal.itermonthdates(year, month))
+    trainings_by_day = _trainings_by_day(*month_bounds(year, month))
     weeks = []
     for i in range(0, len(month_days), 7):
         week = []
@@ -181,6 +246,30 @@ def training_calendar(request):
                 }
             )
         weeks.append(week)
+    return weeks
+
+
+def _week_days(week_start: date) -> list[dict[str, Any]]:
+    trainings_by_day = _trainings_by_day(week_start, week_start + timedelta(days=6))
+    days = []
+    for offset in range(7):
+        day = week_start + timedelta(days=offset)
+        days.append({"date": day, "trainings": trainings_by_day.get(day, [])})
+    return days
+
+
+@login_required
+@query_budget(1)
+def training_calendar(request):
+    today = date.today()
+    year = int(request.GET.get("year", today.year))
+    month = int(request.GET.get("month", today.month))
+    weeks = calendar_cache.cached_payload(
+        calendar_cache.MONTH,
+        calendar_cache.month_period(year, month),
+        "template",
+        lambda: _month_weeks(year, month),
+    )
     prev_month = month - 1
     prev_year = year
     next_month = month + 1
@@ -209,25 +298,18 @@ def training_calendar(request):
 
 
 @login_required
+@query_budget(1)
 def training_calendar_week(request):
     today = date.today()
     base_date = _parse_date(request.GET.get("date")) or today
     week_start = base_date - timedelta(days=base_date.weekday())
     week_end = week_start + timedelta(days=6)
-    trainings = (
-        Training.objects.filter(
-            start_datetime__date__gte=week_start, start_datetime__date__lte=week_end
-        )
-        .select_related("training_type", "assigned_trainer")
-        .order_by("start_datetime")
+    days = calendar_cache.cached_payload(
+        calendar_cache.WEEK,
+        calendar_cache.week_period(week_start),
+        "template",
+        lambda: _week_days(week_start),
     )
-    trainings_by_day: dict[date, list[Training]] = {}
-    for training in trainings:
-        trainings_by_day.setdefault(training.start_datetime.date(), []).append(training)
-    days = []
-    for offset in range(7):
-        day = week_start + timedelta(days=offset)
-        days.append({"date": day, "trainings": trainings_by_day.get(day, [])})
     return render(
         request,
         "trainings/week.html",
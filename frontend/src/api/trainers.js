@@ -14,6 +14,11 @@ export const fetchTrainers = (params = {}) => {
 
 export const fetchTrainer = (id) => requestJson(`/trainers/${id}/`);
 
+export const fetchTrainerAssignments = (id, cursor) =>
+  requestJson(
+    `/trainers/${id}/?include=assigned_trainings&cursor=${encodeURIComponent(cursor)}`
+  );
+
 export const createTrainer = (payload) =>
   requestJson("/trainers/", { method: "POST", body: payload });
 
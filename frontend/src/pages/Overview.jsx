@@ -43,9 +43,9 @@ const Overview = () => {
       next30.setDate(today.getDate() + 30);
 
       const [openData, assignedData, confirmedData, trainersData, typesData] = await Promise.all([
-        fetchTrainings({ status: "open", limit: 100 }),
-        fetchTrainings({ status: "assigned", limit: 100 }),
-        fetchTrainings({ status: "confirmed", limit: 100 }),
+        fetchTrainings({ status: "open", page_size: 100 }),
+        fetchTrainings({ status: "assigned", page_size: 100 }),
+        fetchTrainings({ status: "confirmed", page_size: 100 }),
         fetchTrainers({ limit: 1 }),
         fetchTrainingTypes(),
       ]);
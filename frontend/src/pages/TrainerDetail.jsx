@@ -1,7 +1,7 @@
 import { useCallback, useEffect, useState } from "react";
 import { Link, useParams } from "react-router-dom";
 
-import { fetchTrainer } from "../api/trainers.js";
+import { fetchTrainer, fetchTrainerAssignments } from "../api/trainers.js";
 import PageHeader from "../components/PageHeader.jsx";
 import useRealtimeInvalidate from "../hooks/useRealtimeInvalidate.js";
 
@@ -24,6 +24,8 @@ const TrainerDetail = () => {
   const { id } = useParams();
   const [trainer, setTrainer] = useState(null);
   const [assignedTrainings, setAssignedTrainings] = useState([]);
+  const [assignmentsCursor, setAssignmentsCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [fairness, setFairness] = useState({
     offered_days: 0,
     delivered_days: 0,
@@ -42,6 +44,7 @@ const TrainerDetail = () => {
       const data = await fetchTrainer(id);
       setTrainer(data.item);
       setAssignedTrainings(data.assigned_trainings || []);
+      setAssignmentsCursor(data.assigned_trainings_next || null);
       setFairness(data.fairness_current_month || {});
     } catch (err) {
       setError(err.message);
@@ -54,6 +57,22 @@ const TrainerDetail = () => {
     loadTrainer();
   }, [loadTrainer]);
 
+  const onLoadMore = async () => {
+    if (!assignmentsCursor || loadingMore) {
+      return;
+    }
+    setLoadingMore(true);
+    try {
+      const data = await fetchTrainerAssignments(id, assignmentsCursor);
+      setAssignedTrainings((prev) => [...prev, ...(data.assigned_trainings || [])]);
+      setAssignmentsCursor(data.assigned_trainings_next || null);
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useRealtimeInvalidate(
     useCallback(() => {
       loadTrainer();
@@ -243,6 +262,13 @@ const TrainerDetail = () => {
             ) : (
               <p className="muted">Zatím žádné přiřazené poptávky.</p>
             )}
+            {assignmentsCursor ? (
+              <div className="inline-actions">
+                <button className="btn btn-ghost" type="button" onClick={onLoadMore} disabled={loadingMore}>
+                  {loadingMore ? "Načítám..." : "Načíst další"}
+                </button>
+              </div>
+            ) : null}
           </div>
         </div>
       </div>
@@ -37,14 +37,14 @@ const TrainersList = () => {
     }
 
     try {
-      const data = await fetchTrainers({ limit: PAGE_LIMIT, cursor });
+      const data = await fetchTrainers({ page_size: PAGE_LIMIT, cursor });
       const incoming = data.items || [];
       if (append) {
         setTrainers((prev) => [...prev, ...incoming]);
       } else {
         setTrainers(incoming);
       }
-      setNextCursor(data.next_cursor || null);
+      setNextCursor(data.next || null);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -60,7 +60,7 @@ const TrainingsList = () => {
       const payload = {
         ...activeFilters,
         no_trainer: activeFilters.no_trainer ? "1" : "",
-        limit: PAGE_LIMIT,
+        page_size: PAGE_LIMIT,
         cursor,
       };
       const data = await fetchTrainings(payload);
@@ -71,7 +71,7 @@ const TrainingsList = () => {
       } else {
         setTrainings(incoming);
       }
-      setNextCursor(data.next_cursor || null);
+      setNextCursor(data.next || null);
     } catch (err) {
       setError(err.message);
     } finally {